@@ -0,0 +1,272 @@
+# Description: An asyncio front-end for the LRUCache that loads missing values from a slow backend. get_or_load and
+#              get_many_or_load return cached values at once and call the backend only for the keys that are missing.
+#              Loads are single-flight: the first coroutine to miss a key starts one load task and registers its
+#              future in a HashMap of loads in flight, and every coroutine that misses the same key while it runs
+#              waits on that future instead of calling the backend again. A batch load registers a future for every
+#              key it fetches, so single lookups coalesce with batches too. A load that finds nothing can be cached
+#              as a negative entry for negative_ttl seconds, so repeated lookups of a missing key don't reach the
+#              backend either. Errors are passed to every waiter and never cached.
+
+
+import asyncio
+
+from cache import LRUCache
+from hash_map_chaining import HashMap
+
+
+# Value stored in the cache for a key the backend doesn't have
+NEGATIVE = object()
+
+
+class AsyncCache:
+    """
+    Cache in front of an async backend, with single-flight loads
+    Supported methods are: get_or_load, get_many_or_load, invalidate, clear
+    and stats. Every method must be called from the same event loop.
+    """
+
+    def __init__(self, capacity: int, function, max_entries: int = None, max_bytes: int = None,
+                 ttl: float = None, negative_ttl: float = None, **options) -> None:
+        """
+        Takes the initial capacity and hash function of the cache, its
+        limits as in LRUCache, the time to live of a loaded value and the
+        time to live of a negative entry, and any other LRUCache options.
+        With negative_ttl None, keys the backend doesn't have aren't cached.
+        """
+        if negative_ttl is not None and negative_ttl <= 0:
+            raise ValueError("negative_ttl must be positive")
+        self.cache = LRUCache(capacity, function, max_entries, max_bytes, ttl, **options)
+        self.negative_ttl = negative_ttl
+        # Future of every key being loaded
+        self._in_flight = HashMap(capacity, function, max_load=1.0)
+        # Load tasks still running, kept so they aren't garbage collected
+        self._tasks = set()
+        self.loads = 0
+        self.keys_loaded = 0
+        self.coalesced = 0
+        self.negative_hits = 0
+
+    def _cached(self, key: str) -> tuple:
+        """
+        Takes a key string and returns the tuple (found, value) for it from
+        the cache. A negative entry is found with the value None.
+        """
+        value = self.cache.get(key)
+        if value is None:
+            return False, None
+        if value is NEGATIVE:
+            self.negative_hits += 1
+            return True, None
+        return True, value
+
+    def _store(self, key: str, value: object) -> None:
+        """
+        Takes a key string and the value the backend returned for it and
+        caches it, or caches a negative entry if the value is None
+        """
+        if value is not None:
+            self.cache.put(key, value)
+        elif self.negative_ttl is not None:
+            self.cache.put(key, NEGATIVE, ttl=self.negative_ttl)
+
+    def _start(self, keys: list, coroutine) -> dict:
+        """
+        Takes keys that aren't cached or in flight and a coroutine that
+        loads them and returns a dict of their new futures, registered as in
+        flight. The coroutine runs as a task that sets the futures.
+        """
+        loop = asyncio.get_running_loop()
+        futures = {}
+        for key in keys:
+            futures[key] = loop.create_future()
+            self._in_flight.put(key, futures[key])
+        task = loop.create_task(self._run(futures, coroutine))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        self.loads += 1
+        self.keys_loaded += len(keys)
+        return futures
+
+    async def _run(self, futures: dict, coroutine) -> None:
+        """
+        Takes the futures of a load and the coroutine doing it, awaits the
+        coroutine's dict of values and caches them, then resolves every
+        future with its key's value (None for a key missing from the dict)
+        or with the error the coroutine raised
+        """
+        try:
+            values = await coroutine
+        except BaseException as error:
+            for key, future in futures.items():
+                self._in_flight.remove(key)
+                if future.done():
+                    continue
+                if isinstance(error, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(error)
+            if not isinstance(error, Exception):
+                raise
+            return
+        for key, future in futures.items():
+            value = values.get(key)
+            self._store(key, value)
+            self._in_flight.remove(key)
+            if not future.done():
+                future.set_result(value)
+
+    async def get_or_load(self, key: str, loader) -> object:
+        """
+        Takes a key string and an async function that loads the value of a
+        key from the backend, returning None if it has none. Returns the
+        cached value of the key, or joins the load of the key in flight, or
+        starts a load. Returns None if the backend has no value. If the load
+        raises, the error is raised in every coroutine waiting on it.
+        """
+        found, value = self._cached(key)
+        if found is True:
+            return value
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = self._start([key], self._load_one(key, loader))[key]
+        # Shielded so a waiter that is cancelled doesn't cancel the load for the others
+        return await asyncio.shield(future)
+
+    @staticmethod
+    async def _load_one(key: str, loader) -> dict:
+        return {key: await loader(key)}
+
+    async def get_many_or_load(self, keys, batch_loader) -> list:
+        """
+        Takes an iterable of key strings and an async function that takes a
+        list of keys and returns a dict of the values the backend has for
+        them. Returns a list of the keys' values in input order, None for a
+        key the backend has no value for. Cached keys and keys already in
+        flight aren't loaded again, and the rest are loaded in one call.
+        """
+        keys = list(keys)
+        results = {}
+        waiting = {}
+        missing = []
+        for key in keys:
+            if key in results or key in waiting:
+                continue
+            found, value = self._cached(key)
+            if found is True:
+                results[key] = value
+                continue
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                waiting[key] = future
+            else:
+                # Placeholder so a key repeated in the input is only loaded once
+                waiting[key] = None
+                missing.append(key)
+        if missing:
+            waiting.update(self._start(missing, batch_loader(missing)))
+        if waiting:
+            values = await asyncio.shield(asyncio.gather(*waiting.values()))
+            results.update(zip(waiting, values))
+        return [results[key] for key in keys]
+
+    def invalidate(self, key: str) -> None:
+        """
+        Takes a key string and drops its cached value or negative entry. A
+        load in flight isn't stopped and caches its result when it ends.
+        """
+        self.cache.remove(key)
+
+    def clear(self) -> None:
+        """
+        Takes no parameters and drops every cached value. Loads in flight
+        aren't stopped.
+        """
+        self.cache.clear()
+
+    def stats(self) -> dict:
+        """
+        Takes no parameters and returns the cache's stats with the number
+        of backend loads, keys loaded, lookups that joined a load in flight,
+        hits on negative entries and loads in flight
+        """
+        stats = self.cache.stats()
+        stats.update({
+            'loads': self.loads,
+            'keys_loaded': self.keys_loaded,
+            'coalesced': self.coalesced,
+            'negative_hits': self.negative_hits,
+            'in_flight': self._in_flight.size,
+        })
+        return stats
+
+
+if __name__ == "__main__":
+    from hash_functions import murmur
+
+    class FakeBackend:
+        """
+        In-process backend that takes delay seconds per call, counts its
+        calls and has a value for every key except those starting 'missing'
+        """
+
+        def __init__(self, delay: float = 0.01) -> None:
+            self.delay = delay
+            self.calls = 0
+            self.keys_requested = 0
+            self.fail = False
+
+        async def load(self, key: str) -> object:
+            return (await self.load_many([key])).get(key)
+
+        async def load_many(self, keys: list) -> dict:
+            self.calls += 1
+            self.keys_requested += len(keys)
+            await asyncio.sleep(self.delay)
+            if self.fail is True:
+                raise ConnectionError("backend down")
+            return {key: key.upper() for key in keys if not key.startswith('missing')}
+
+    async def main() -> None:
+        print("\nsingle-flight example 1")
+        print("-----------------------------")
+        backend = FakeBackend()
+        c = AsyncCache(16, murmur, max_entries=100)
+        values = await asyncio.gather(*(c.get_or_load('key' + str(i % 5), backend.load) for i in range(100)))
+        print(backend.calls, values[:5], c.stats()['coalesced'], c.stats()['in_flight'])
+        await c.get_or_load('key0', backend.load)
+        print(backend.calls, c.stats()['hits'])
+
+        print("\nbatch example 1")
+        print("---------------------")
+        backend = FakeBackend()
+        c = AsyncCache(16, murmur)
+        batch = c.get_many_or_load(['key' + str(i) for i in range(20)] + ['key3'], backend.load_many)
+        singles = [c.get_or_load('key' + str(i), backend.load) for i in range(10, 30)]
+        results = await asyncio.gather(batch, *singles)
+        print(backend.calls, backend.keys_requested, results[0][3], results[0][-1], results[-1])
+        print(await c.get_many_or_load(['key1', 'key25', 'key40'], backend.load_many), backend.calls)
+
+        print("\nnegative caching example 1")
+        print("--------------------------------")
+        for negative_ttl in None, 60:
+            backend = FakeBackend()
+            c = AsyncCache(16, murmur, negative_ttl=negative_ttl)
+            for _ in range(3):
+                await asyncio.gather(*(c.get_or_load('missing', backend.load) for _ in range(10)))
+            print(negative_ttl, backend.calls, c.stats()['negative_hits'])
+
+        print("\nerror example 1")
+        print("---------------------")
+        backend = FakeBackend()
+        backend.fail = True
+        c = AsyncCache(16, murmur)
+        results = await asyncio.gather(*(c.get_or_load('key', backend.load) for _ in range(10)),
+                                       return_exceptions=True)
+        print(backend.calls, all(isinstance(result, ConnectionError) for result in results), c.cache.size)
+        backend.fail = False
+        print(await c.get_or_load('key', backend.load), backend.calls)
+
+    asyncio.run(main())
@@ -0,0 +1,2 @@
+# Description: Benchmarks for the HashMap implementations. Run a benchmark module from the project root, for example
+#              python -m benchmarks.bulk_ops
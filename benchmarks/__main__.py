@@ -0,0 +1,62 @@
+# Description: Command line entry point for the benchmark suite.
+#              Run with: python -m benchmarks [--size N] [--operations N] [--access zipf] [--json results.json]
+
+
+import argparse
+import json
+
+from benchmarks.runner import HEADER, MAPS, run, write_json
+from benchmarks.workloads import WORKLOADS
+from hash_functions import HASH_FUNCTIONS
+
+
+def compare(results: dict, baseline_path: str) -> None:
+    """
+    Takes the results of this run and the path of an earlier JSON result
+    file and prints each map and workload's throughput relative to it
+    """
+    with open(baseline_path) as file:
+        baseline = json.load(file)
+    before = {(r['map'], r['workload']): r for r in baseline['results']}
+    print(f"\n{'workload':<14}{'map':<17}{'ops/s vs baseline':>19}{'p99 vs baseline':>17}")
+    for result in results['results']:
+        old = before.get((result['map'], result['workload']))
+        if old is None or old['ops_per_sec'] == 0 or old['p99_ns'] == 0:
+            continue
+        print(f"{result['workload']:<14}{result['map']:<17}"
+              f"{result['ops_per_sec'] / old['ops_per_sec']:>18.2f}x"
+              f"{result['p99_ns'] / old['p99_ns']:>16.2f}x")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description='Benchmark the HashMap implementations against dict.')
+    parser.add_argument('--maps', nargs='+', choices=list(MAPS), default=list(MAPS))
+    parser.add_argument('--workloads', nargs='+', choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument('--size', type=int, default=10_000, help='number of keys loaded before timing')
+    parser.add_argument('--operations', type=int, default=50_000, help='timed operations per workload')
+    parser.add_argument('--keys', choices=['sequential', 'random'], default='sequential',
+                        help="'key0', 'key1', ... or random strings")
+    parser.add_argument('--key-length', type=int, default=12, help='length of random keys')
+    parser.add_argument('--access', choices=['uniform', 'zipf'], default='uniform',
+                        help='how existing keys are picked')
+    parser.add_argument('--zipf-s', type=float, default=1.1, help='Zipf exponent')
+    parser.add_argument('--hash', choices=list(HASH_FUNCTIONS), default='builtin', dest='hash_name')
+    parser.add_argument('--repeat', type=int, default=3, help='throughput runs, the best is kept')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', metavar='PATH', help='write the results to this JSON file')
+    parser.add_argument('--compare', metavar='PATH', help='compare with an earlier JSON result file')
+    args = parser.parse_args(argv)
+
+    print(HEADER)
+    results = run(maps=args.maps, workloads=args.workloads, size=args.size, operations=args.operations,
+                  keys=args.keys, key_length=args.key_length, access=args.access, zipf_s=args.zipf_s,
+                  hash_name=args.hash_name, repeat=args.repeat, seed=args.seed)
+    if args.json:
+        write_json(results, args.json)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
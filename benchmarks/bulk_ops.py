@@ -0,0 +1,58 @@
+# Description: Compares put_many / get_many / remove_many against calling put / get / remove in a loop on the
+#              chaining HashMap. Run with: python -m benchmarks.bulk_ops [n]
+
+
+import sys
+
+from benchmarks.timing import best_of
+from hash_map_chaining import HashMap, hash_function_2
+
+
+def run(n: int = 100_000, capacity: int = 25_000) -> None:
+    keys = ['key' + str(i) for i in range(n)]
+    pairs = [(key, i) for i, key in enumerate(keys)]
+
+    def loop_put():
+        m = HashMap(capacity, hash_function_2)
+        for key, value in pairs:
+            m.put(key, value)
+        return m
+
+    def bulk_put():
+        m = HashMap(capacity, hash_function_2)
+        m.put_many(pairs)
+        return m
+
+    full = bulk_put()
+
+    def loop_get():
+        return [full.get(key) for key in keys]
+
+    def bulk_get():
+        return full.get_many(keys)
+
+    def loop_remove():
+        m = bulk_put()
+        for key in keys:
+            m.remove(key)
+
+    def bulk_remove():
+        m = bulk_put()
+        m.remove_many(keys)
+
+    # Remove timings include building the map, so subtract the bulk build
+    build = best_of(bulk_put)
+    results = [
+        ('put', best_of(loop_put), build),
+        ('get', best_of(loop_get), best_of(bulk_get)),
+        ('remove', best_of(loop_remove) - build, best_of(bulk_remove) - build),
+    ]
+
+    print(f"n={n} capacity={capacity} (load {n / capacity:.1f})")
+    print(f"{'op':<8}{'loop (s)':>12}{'bulk (s)':>12}{'speedup':>10}")
+    for name, loop_time, bulk_time in results:
+        print(f"{name:<8}{loop_time:>12.4f}{bulk_time:>12.4f}{loop_time / bulk_time:>9.2f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,47 @@
+# Description: Replays Zipf-distributed read-through traffic against an LRUCache bounded to a share of the key space
+#              and against an unbounded chaining HashMap. A miss stands for a slow lookup and is followed by a put.
+#              Reports the hit ratio, operations per second and entries held, so the cost of bounding the cache can
+#              be weighed against the memory it saves.
+#              Run with: python -m benchmarks.cache_zipf
+
+
+import random
+import time
+
+from benchmarks.workloads import ZipfSampler
+from cache import LRUCache
+from hash_functions import murmur
+from hash_map_chaining import HashMap
+
+
+def replay(m, keys: list) -> tuple:
+    """
+    Takes a cache or map and the keys to request and returns the hits and
+    the seconds taken. Every miss puts the key.
+    """
+    hits = 0
+    start = time.perf_counter()
+    for key in keys:
+        if m.get(key) is not None:
+            hits += 1
+        else:
+            m.put(key, key)
+    return hits, time.perf_counter() - start
+
+
+def run(universe: int = 100_000, requests: int = 500_000, skews=(0.8, 1.1), shares=(0.01, 0.05, 0.2)) -> None:
+    names = ['key' + str(i) for i in range(universe)]
+    print(f"{'s':>5}{'map':>20}{'entries':>10}{'hit ratio':>11}{'ops/s':>12}")
+    for s in skews:
+        keys = [names[rank] for rank in ZipfSampler(universe, s, random.Random(1)).sample(requests)]
+        maps = [('unbounded', HashMap(1024, murmur, max_load=1.0))]
+        for share in shares:
+            max_entries = int(universe * share)
+            maps.append((f"lru {share:.0%}", LRUCache(1024, murmur, max_entries=max_entries)))
+        for name, m in maps:
+            hits, seconds = replay(m, keys)
+            print(f"{s:>5}{name:>20}{m.size:>10}{hits / requests:>11.3f}{requests / seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,54 @@
+# Description: Compares the capacity policies of the open addressing HashMap. Each policy starts from the same
+#              awkward capacity and is filled with the same keys. strided_id is the hash of keys that are ids spaced
+#              8 apart, like aligned addresses, which only reach one bucket in 8 when the capacity is a multiple of 8.
+#              The benchmark reports the final capacity, how many resizes the fills took, the mean and longest probe
+#              of a lookup, and put / get throughput.
+#              Run with: python -m benchmarks.capacity_policies
+
+
+import time
+
+from capacity import DoublingCapacity, PowerOfTwoCapacity, PrimeCapacity
+from hash_functions import builtin_hash, fnv1a
+from hash_map_open_addressing import HashMap
+
+
+def strided_id(key: str) -> int:
+    """
+    Hash of 'key<i>' as the id 8 * i, the way Python hashes an integer
+    """
+    return hash(8 * int(key[3:]))
+
+
+def run(count: int = 50_000, capacity: int = 1_000) -> None:
+    keys = ['key' + str(i) for i in range(count)]
+    misses = ['key' + str(i) for i in range(count, 2 * count)]
+    policies = {
+        'doubling': DoublingCapacity,
+        'prime': PrimeCapacity,
+        'power of two': PowerOfTwoCapacity,
+    }
+    print(f"{'hash':<10}{'policy':<14}{'capacity':>10}{'resizes':>9}{'mean probe':>12}{'max probe':>11}"
+          f"{'miss probe':>12}{'put ops/s':>12}{'get ops/s':>12}")
+    for hash_name, function in ('builtin', builtin_hash), ('fnv1a', fnv1a), ('strided', strided_id):
+        for policy_name, policy in policies.items():
+            start = time.perf_counter()
+            m = HashMap(capacity, function, capacity_policy=policy())
+            for i, key in enumerate(keys):
+                m.put(key, i)
+            put_rate = count / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for key in keys:
+                m.get(key)
+            get_rate = count / (time.perf_counter() - start)
+
+            probes = [m.probe_length(key) for key in keys]
+            miss_probes = [m.probe_length(key) for key in misses]
+            print(f"{hash_name:<10}{policy_name:<14}{m.capacity:>10}{m.resizes:>9}"
+                  f"{sum(probes) / count:>12.2f}{max(probes):>11}{sum(miss_probes) / count:>12.2f}"
+                  f"{put_rate:>12,.0f}{get_rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    run()
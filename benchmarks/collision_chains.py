@@ -0,0 +1,47 @@
+# Description: Worst case bucket lookups in the chaining HashMap. Every key is a rearrangement of the same characters,
+#              so hash_function_1 puts them all in one bucket. For growing numbers of colliding keys the benchmark
+#              reports the mean and worst get latency with linked list buckets (treeify_threshold=None) and with
+#              buckets that turn into SortedChains once they are longer than 8.
+#              Run with: python -m benchmarks.collision_chains
+
+
+import itertools
+import time
+
+from benchmarks.timing import percentile
+from hash_map_chaining import HashMap, hash_function_1
+
+
+def get_latencies(m, keys: list) -> list:
+    """
+    Takes a map and a list of keys and returns the time of a get of each
+    key in nanoseconds
+    """
+    clock = time.perf_counter_ns
+    latencies = []
+    for key in keys:
+        start = clock()
+        m.get(key)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def run(counts=(8, 64, 512, 4_096)) -> None:
+    anagrams = [''.join(p) for p in itertools.permutations('abcdefgh')]
+    print(f"{'keys':>6}{'buckets':>14}{'mean ns':>10}{'p99 ns':>10}{'worst ns':>10}{'put all ms':>12}")
+    for count in counts:
+        keys = anagrams[:count]
+        for name, threshold in ('linked list', None), ('sorted chain', 8):
+            start = time.perf_counter()
+            m = HashMap(64, hash_function_1, treeify_threshold=threshold)
+            for i, key in enumerate(keys):
+                m.put(key, i)
+            put_ms = (time.perf_counter() - start) * 1000
+            # Hit every key a few times, the worst sits at the far end of the chain
+            latencies = get_latencies(m, keys * max(1, 4_096 // count))
+            print(f"{count:>6}{name:>14}{sum(latencies) / len(latencies):>10.0f}"
+                  f"{percentile(latencies, 0.99):>10}{max(latencies):>10}{put_ms:>12.1f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,117 @@
+# Description: Measures how ConcurrentHashMap throughput scales with threads, next to the chaining HashMap behind
+#              one global lock. Each thread runs the same number of operations, read-mostly (95% get, 5% put) or
+#              mixed (50% get, 25% put, 25% remove), on a table preloaded with the keys. With the GIL only one
+#              thread runs Python code at a time, so neither map can scale. On a free-threaded build (python3.13t
+#              and later) the striped map should keep gaining throughput while the global lock stays flat.
+#              Run with: python -m benchmarks.concurrent_scaling
+
+
+import random
+import sys
+import threading
+import time
+
+from hash_functions import builtin_hash
+from hash_map_chaining import HashMap
+from hash_map_concurrent import ConcurrentHashMap
+
+
+class GlobalLockHashMap:
+    """
+    The chaining HashMap with every call wrapped in one lock
+    """
+
+    def __init__(self, capacity: int, function) -> None:
+        self.map = HashMap(capacity, function, max_load=1.0)
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> object:
+        with self.lock:
+            return self.map.get(key)
+
+    def put(self, key: str, value: object) -> None:
+        with self.lock:
+            self.map.put(key, value)
+
+    def remove(self, key: str) -> None:
+        with self.lock:
+            self.map.remove(key)
+
+
+def make_operations(keys: list, count: int, put_share: float, remove_share: float, seed: int) -> list:
+    """
+    Takes the keys, an operation count, the share of puts and removes and a
+    seed and returns a list of (operation, key) pairs, the rest being gets
+    """
+    rng = random.Random(seed)
+    operations = []
+    for key in rng.choices(keys, k=count):
+        roll = rng.random()
+        if roll < put_share:
+            operations.append(('put', key))
+        elif roll < put_share + remove_share:
+            operations.append(('remove', key))
+        else:
+            operations.append(('get', key))
+    return operations
+
+
+def run_threads(m, per_thread: list) -> float:
+    """
+    Takes a map and one operation list per thread, runs the threads from a
+    common start and returns the total operations per second
+    """
+    barrier = threading.Barrier(len(per_thread) + 1)
+
+    def worker(operations: list) -> None:
+        get, put, remove = m.get, m.put, m.remove
+        barrier.wait()
+        for operation, key in operations:
+            if operation == 'get':
+                get(key)
+            elif operation == 'put':
+                put(key, 1)
+            else:
+                remove(key)
+
+    threads = [threading.Thread(target=worker, args=(operations,)) for operations in per_thread]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return sum(len(operations) for operations in per_thread) / elapsed
+
+
+def run(thread_counts=(1, 2, 4, 8), operations: int = 100_000, size: int = 50_000) -> None:
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+    keys = ['key' + str(i) for i in range(size)]
+    workloads = {
+        'read-mostly': (0.05, 0.0),
+        'mixed': (0.25, 0.25),
+    }
+    maps = {
+        'global lock': lambda: GlobalLockHashMap(size, builtin_hash),
+        'striped (16)': lambda: ConcurrentHashMap(size, builtin_hash, stripes=16),
+        'striped (64)': lambda: ConcurrentHashMap(size, builtin_hash, stripes=64),
+    }
+
+    print(f"{'workload':<13}{'map':<14}" + ''.join(f"{str(n) + ' threads':>14}" for n in thread_counts))
+    for workload, (put_share, remove_share) in workloads.items():
+        for map_name, make in maps.items():
+            row = f"{workload:<13}{map_name:<14}"
+            for count in thread_counts:
+                m = make()
+                for key in keys:
+                    m.put(key, 0)
+                per_thread = [make_operations(keys, operations // count, put_share, remove_share, seed)
+                              for seed in range(count)]
+                row += f"{run_threads(m, per_thread):>14,.0f}"
+            print(row)
+
+
+if __name__ == "__main__":
+    run()
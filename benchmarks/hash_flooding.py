@@ -0,0 +1,83 @@
+# Description: Shows what a hash flooding attack does to both HashMaps. An attacker who knows the hash function can
+#              send keys that all land in one bucket: for hash_function_1 any rearrangement of the same characters
+#              collides, and for hash_function_2 characters can be traded between positions so the weighted sum
+#              stays the same. The benchmark puts and then gets every key and reports throughput for these keys and
+#              for ordinary keys of the same count, with the public hash function and with a SeededHash.
+#              Run with: python -m benchmarks.hash_flooding
+
+
+import itertools
+import time
+
+from hash_functions import SeededHash
+from hash_map_chaining import HashMap as ChainingHashMap, hash_function_1, hash_function_2
+from hash_map_open_addressing import HashMap as OpenAddressingHashMap
+
+
+def anagram_keys(count: int) -> list:
+    """
+    Takes a count and returns that many distinct keys with the same
+    hash_function_1 value: rearrangements of the same characters
+    """
+    return [''.join(p) for p in itertools.islice(itertools.permutations('abcdefghij'), count)]
+
+
+def weighted_sum_keys(count: int) -> list:
+    """
+    Takes a count and returns up to that many distinct keys with the same
+    hash_function_2 value. Position p has weight p (counting from 1), so
+    adding 2k to the character at position p and taking k from the
+    character at position 2p keeps the sum the same.
+    """
+    base = [ord('m')] * 16
+    pairs = [(1, 2), (3, 6), (4, 8), (5, 10), (7, 14)]
+    keys = []
+    for shifts in itertools.product(range(5), repeat=len(pairs)):
+        codes = list(base)
+        for (p, q), k in zip(pairs, shifts):
+            codes[p - 1] += 2 * k
+            codes[q - 1] -= k
+        keys.append(''.join(map(chr, codes)))
+        if len(keys) == count:
+            break
+    return keys
+
+
+def throughput(factory, keys: list) -> float:
+    """
+    Takes a map factory and a list of keys, puts every key in a new map
+    and gets every key back. Returns operations per second.
+    """
+    start = time.perf_counter()
+    m = factory()
+    for i, key in enumerate(keys):
+        m.put(key, i)
+    for key in keys:
+        m.get(key)
+    return 2 * len(keys) / (time.perf_counter() - start)
+
+
+def run(count: int = 2_000) -> None:
+    key_sets = {
+        'anagrams': (hash_function_1, anagram_keys(count)),
+        'weighted sums': (hash_function_2, weighted_sum_keys(count)),
+    }
+    seeded = SeededHash()
+    maps = {
+        'chaining': lambda function: lambda: ChainingHashMap(64, function, max_load=1.0, min_load=0.25),
+        'open addressing': lambda function: lambda: OpenAddressingHashMap(64, function),
+    }
+
+    print(f"{'map':<17}{'attack':<15}{'keys':>6}{'hash':>17}{'attack ops/s':>14}{'normal ops/s':>14}")
+    for map_name, make in maps.items():
+        for attack, (public, keys) in key_sets.items():
+            normal = ['key' + str(i) for i in range(len(keys))]
+            assert len({public(key) for key in keys}) == 1
+            for hash_name, function in (public.__name__, public), ('SeededHash', seeded):
+                print(f"{map_name:<17}{attack:<15}{len(keys):>6}{hash_name:>17}"
+                      f"{throughput(make(function), keys):>14,.0f}"
+                      f"{throughput(make(function), normal):>14,.0f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,68 @@
+# Description: Measures what instrumentation costs. Runs the same puts and gets on a chaining and an open addressing
+#              HashMap that was never instrumented, one that is instrumented, one with a hook on every lookup and
+#              one that was instrumented and then disabled again, and prints the operations per second of each.
+#              Also prints the instrumented map's stats snapshot.
+#              Run with: python -m benchmarks.instrumentation_overhead
+
+
+import gc
+import time
+
+import instrumentation
+from hash_functions import murmur
+from hash_map_chaining import HashMap as ChainingHashMap
+from hash_map_open_addressing import HashMap as OpenAddressingHashMap
+
+
+def workload(m, keys: list) -> float:
+    """
+    Takes a map and a list of keys, puts every key, gets every key twice
+    and returns the operations per second
+    """
+    start = time.perf_counter()
+    for key in keys:
+        m.put(key, key)
+    for _ in range(2):
+        for key in keys:
+            m.get(key)
+    return 3 * len(keys) / (time.perf_counter() - start)
+
+
+def run(count: int = 100_000) -> None:
+    keys = ['key' + str(i) for i in range(count)]
+    classes = {
+        'chaining': lambda: ChainingHashMap(16, murmur, max_load=1.0),
+        'open addressing': lambda: OpenAddressingHashMap(16, murmur),
+    }
+    print(f"{'map':<17}{'plain':>12}{'enabled':>12}{'with hook':>12}{'disabled':>12}")
+    for name, make in classes.items():
+        plain = workload(make(), keys)
+
+        m = make()
+        stats = instrumentation.enable(m)
+        enabled = workload(m, keys)
+        snapshot = stats.snapshot()
+        del m
+        gc.collect()
+
+        m = make()
+        lengths = []
+        instrumentation.enable(m).add_hook('lookup', lengths.append)
+        with_hook = workload(m, keys)
+        del m, lengths
+        gc.collect()
+
+        m = make()
+        instrumentation.enable(m)
+        instrumentation.disable(m)
+        disabled = workload(m, keys)
+        del m
+        gc.collect()
+
+        print(f"{name:<17}{plain:>12,.0f}{enabled:>12,.0f}{with_hook:>12,.0f}{disabled:>12,.0f}")
+        del snapshot['resize_events']
+        del snapshot['lookups']['counts']
+        print(' ', snapshot)
+
+if __name__ == "__main__":
+    run()
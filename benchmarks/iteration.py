@@ -0,0 +1,72 @@
+# Description: Compares scanning every key of a large HashMap through get_keys, which copies the keys into a new
+#              DynamicArray first, with the lazy keys() generator and chunks(), which read the buckets in place.
+#              Reports the time of a full scan and the peak memory traced while scanning.
+#              Run with: python -m benchmarks.iteration
+
+
+import time
+import tracemalloc
+
+from hash_functions import murmur
+from hash_map_chaining import HashMap as ChainingHashMap
+from hash_map_compact import HashMap as CompactHashMap
+from hash_map_open_addressing import HashMap as OpenAddressingHashMap
+
+
+def scan_get_keys(m) -> int:
+    keys = m.get_keys()
+    count = 0
+    for i in range(keys.length()):
+        count += len(keys.get_at_index(i))
+    return count
+
+
+def scan_keys(m) -> int:
+    count = 0
+    for key in m.keys():
+        count += len(key)
+    return count
+
+
+def scan_chunks(m) -> int:
+    count = 0
+    for chunk in m.chunks(1000):
+        for key, _ in chunk:
+            count += len(key)
+    return count
+
+
+def measure(scan, m) -> tuple:
+    """
+    Takes a scan function and a map and returns a tuple (seconds, peak
+    bytes traced) for one scan, timed without tracing
+    """
+    start = time.perf_counter()
+    scan(m)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    scan(m)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def run(count: int = 200_000) -> None:
+    maps = {
+        'chaining': ChainingHashMap(count, murmur),
+        'open addressing': OpenAddressingHashMap(2 * count, murmur),
+        'compact': CompactHashMap(2 * count, murmur),
+    }
+    scans = {'get_keys': scan_get_keys, 'keys()': scan_keys, 'chunks(1000)': scan_chunks}
+    print(f"{count} keys")
+    print(f"{'map':<17}{'scan':<14}{'seconds':>9}{'peak KB':>10}")
+    for map_name, m in maps.items():
+        for i in range(count):
+            m.put('key' + str(i), i)
+        for scan_name, scan in scans.items():
+            seconds, peak = measure(scan, m)
+            print(f"{map_name:<17}{scan_name:<14}{seconds:>9.3f}{peak / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,48 @@
+# Description: Shows that lookups in the open addressing HashMap cost the same no matter how large the table is.
+#              Each table is filled to a load factor of 0.25 and the mean latency of get / contains_key hits and
+#              misses is reported. Run with: python -m benchmarks.lookup_scaling
+
+
+import time
+
+from hash_map_open_addressing import HashMap
+
+
+def spread_hash(key: str) -> int:
+    """
+    The sample hash functions map 'key0'..'keyN' into a few thousand values,
+    which would cluster every table regardless of capacity. Python's string
+    hash spreads the keys so the benchmark measures the probing itself.
+    """
+    return hash(key) & 0x7FFFFFFFFFFFFFFF
+
+
+def mean_latency_ns(function, keys: list) -> float:
+    """
+    Takes a function of one key and a list of keys and returns the mean
+    time per call in nanoseconds
+    """
+    start = time.perf_counter_ns()
+    for key in keys:
+        function(key)
+    return (time.perf_counter_ns() - start) / len(keys)
+
+
+def run(capacities=(1_000, 10_000, 100_000, 1_000_000), samples: int = 20_000) -> None:
+    print(f"{'capacity':>10}{'size':>10}{'get hit':>12}{'get miss':>12}{'contains':>12}  (ns/op)")
+    for capacity in capacities:
+        m = HashMap(capacity, spread_hash)
+        size = capacity // 4
+        for i in range(size):
+            m.put('key' + str(i), i)
+
+        hits = ['key' + str(i % size) for i in range(samples)]
+        misses = ['miss' + str(i) for i in range(samples)]
+        print(f"{capacity:>10}{m.size:>10}"
+              f"{mean_latency_ns(m.get, hits):>12.0f}"
+              f"{mean_latency_ns(m.get, misses):>12.0f}"
+              f"{mean_latency_ns(m.contains_key, hits):>12.0f}")
+
+
+if __name__ == "__main__":
+    run()
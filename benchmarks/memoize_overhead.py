@@ -0,0 +1,61 @@
+# Description: Times calls of memoized functions that always hit the cache, with functools.lru_cache and with the
+#              memoize decorator's LRU and LFU policies, for a single string argument, a single integer argument and
+#              two positional arguments with a keyword argument. The functions do no work, so the time is the
+#              overhead of the cache lookup itself. memoize hashes a single string argument with its hash function,
+#              murmur by default, which runs in Python, so it is also run with builtin_hash, which is implemented in C.
+#              Run with: python -m benchmarks.memoize_overhead
+
+
+import functools
+import time
+
+from hash_functions import builtin_hash
+from memoize import memoize
+
+
+def timed(function, calls: list, repeat: int = 5) -> float:
+    """
+    Takes a function and a list of (args, kwargs) calls and returns the
+    best mean time of one call in nanoseconds over repeat runs
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for args, kwargs in calls:
+            function(*args, **kwargs)
+        best = min(best, (time.perf_counter() - start) / len(calls))
+    return best * 1e9
+
+
+def identity(*args, **kwargs):
+    return args
+
+
+def run(distinct: int = 1000, calls: int = 200_000) -> None:
+    shapes = {
+        'one str': [(('key' + str(i % distinct),), {}) for i in range(calls)],
+        'one int': [((i % distinct,), {}) for i in range(calls)],
+        'two args + kwarg': [((i % distinct, 'x'), {'flag': True}) for i in range(calls)],
+    }
+    caches = {
+        'lru_cache': lambda: functools.lru_cache(maxsize=2 * distinct)(identity),
+        'memoize lru murmur': lambda: memoize(identity, maxsize=2 * distinct),
+        'memoize lfu murmur': lambda: memoize(identity, maxsize=2 * distinct, policy='lfu'),
+        'memoize lru builtin': lambda: memoize(identity, maxsize=2 * distinct, hash_function=builtin_hash),
+    }
+    print(f"{'cache':<22}" + ''.join(f"{shape:>18}" for shape in shapes) + "   (ns per hit)")
+    baseline = timed(identity, shapes['one int'])
+    print(f"{'no cache':<22}{baseline:>18.0f}")
+    for name, make in caches.items():
+        row = []
+        for shape, shape_calls in shapes.items():
+            function = make()
+            for args, kwargs in shape_calls[:distinct]:
+                function(*args, **kwargs)
+            row.append(timed(function, shape_calls))
+            assert function.cache_info().misses == distinct
+        print(f"{name:<22}" + ''.join(f"{ns:>18.0f}" for ns in row))
+
+
+if __name__ == "__main__":
+    run()
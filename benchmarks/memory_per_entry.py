@@ -0,0 +1,55 @@
+# Description: Memory used per entry by each HashMap storage engine, measured with tracemalloc. Keys and values are
+#              created before measuring, so only the memory of the table itself is counted.
+#              Run with: python -m benchmarks.memory_per_entry [n]
+
+
+import sys
+import tracemalloc
+
+import hash_map_chaining
+import hash_map_compact
+import hash_map_open_addressing
+
+
+def spread_hash(key: str) -> int:
+    return hash(key) & 0x7FFFFFFFFFFFFFFF
+
+
+def traced_bytes(build) -> tuple:
+    """
+    Takes a function that builds a hash map and returns a tuple of
+    (bytes still allocated by the map, peak bytes while building)
+    """
+    tracemalloc.start()
+    m = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del m
+    return current, peak
+
+
+def run(n: int = 200_000) -> None:
+    keys = ['key' + str(i) for i in range(n)]
+    values = list(range(n))
+    engines = [
+        ('chaining (SLNode)', lambda: hash_map_chaining.HashMap(n, spread_hash)),
+        ('open addressing (HashEntry)', lambda: hash_map_open_addressing.HashMap(n, spread_hash)),
+        ('compact (flat arrays)', lambda: hash_map_compact.HashMap(n, spread_hash)),
+    ]
+
+    print(f"n={n}")
+    print(f"{'engine':<30}{'capacity':>10}{'bytes/entry':>14}{'peak bytes/entry':>18}")
+    for name, factory in engines:
+        def build():
+            m = factory()
+            for key, value in zip(keys, values):
+                m.put(key, value)
+            build.capacity = m.capacity
+            return m
+
+        current, peak = traced_bytes(build)
+        print(f"{name:<30}{build.capacity:>10}{current / n:>14.1f}{peak / n:>18.1f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,54 @@
+# Description: Times empty_buckets() and stats() on large chaining and open addressing HashMaps, next to walking
+#              every bucket to count the empty ones, which is what empty_buckets used to do. The counts are kept
+#              up to date by put and remove, so the time of a poll doesn't grow with the capacity.
+#              Run with: python -m benchmarks.occupancy_stats
+
+
+import time
+
+from hash_functions import murmur
+from hash_map_chaining import HashMap as ChainingHashMap
+from hash_map_open_addressing import HashMap as OpenAddressingHashMap
+
+
+def walk_chaining(m) -> int:
+    return sum(1 for i in range(m.buckets.length()) if m.buckets.get_at_index(i).length() == 0)
+
+
+def walk_open_addressing(m) -> int:
+    count = 0
+    for i in range(m.buckets.length()):
+        hash_entry = m.buckets.get_at_index(i)
+        if hash_entry is None or hash_entry.is_tombstone is True:
+            count += 1
+    return count
+
+
+def timed(function, repeat: int) -> float:
+    """
+    Takes a function with no parameters and a repeat count and returns the
+    mean time of one call in microseconds
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def run(capacities=(10_000, 100_000, 1_000_000)) -> None:
+    print(f"{'map':<17}{'capacity':>10}{'walk us':>12}{'empty_buckets us':>18}{'stats us':>10}")
+    for capacity in capacities:
+        maps = {
+            'chaining': (ChainingHashMap(capacity, murmur), walk_chaining),
+            'open addressing': (OpenAddressingHashMap(capacity, murmur), walk_open_addressing),
+        }
+        for name, (m, walk) in maps.items():
+            for i in range(capacity // 4):
+                m.put('key' + str(i), i)
+            assert walk(m) == m.empty_buckets()
+            print(f"{name:<17}{m.capacity:>10}{timed(lambda: walk(m), 3):>12,.0f}"
+                  f"{timed(m.empty_buckets, 1000):>18.2f}{timed(m.stats, 1000):>10.2f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,64 @@
+# Description: Compares building a HashMap from a large list of pairs with put, put_many and the process-parallel
+#              builder at several worker counts, and reports each build's speedup over put. Worker processes only
+#              pay off with more than one CPU, and the pairs and finished buckets are pickled between processes,
+#              so the speedup stays well under the worker count.
+#              Run with: python -m benchmarks.parallel_build
+
+
+import os
+import time
+
+from hash_functions import murmur
+from hash_map_chaining import HashMap as ChainingHashMap
+from hash_map_open_addressing import HashMap as OpenAddressingHashMap
+from parallel_build import build_chaining_map, build_open_addressing_map
+
+
+def timed(build) -> float:
+    """
+    Takes a function with no parameters and returns how long it took in seconds
+    """
+    start = time.perf_counter()
+    build()
+    return time.perf_counter() - start
+
+
+def put_all(m, pairs: list):
+    """
+    Takes a map and a list of pairs, puts every pair and returns the map
+    """
+    for key, value in pairs:
+        m.put(key, value)
+    return m
+
+
+def run(count: int = 200_000, worker_counts=(1, 2, 4, 8)) -> None:
+    print(f"{count} pairs, {os.cpu_count()} CPUs")
+    pairs = [('key' + str(i), i) for i in range(count)]
+    builds = {
+        'chaining': (
+            lambda: put_all(ChainingHashMap(1024, murmur, max_load=1.0), pairs),
+            lambda: ChainingHashMap(1024, murmur, max_load=1.0).put_many(pairs),
+            lambda workers: build_chaining_map(pairs, 1024, murmur, workers=workers, max_load=1.0),
+        ),
+        'open addressing': (
+            lambda: put_all(OpenAddressingHashMap(1024, murmur), pairs),
+            None,
+            lambda workers: build_open_addressing_map(pairs, 1024, murmur, workers=workers),
+        ),
+    }
+
+    print(f"{'map':<17}{'build':<16}{'seconds':>9}{'speedup':>9}")
+    for map_name, (put, put_many, parallel) in builds.items():
+        baseline = timed(put)
+        print(f"{map_name:<17}{'put':<16}{baseline:>9.2f}{1:>9.2f}")
+        if put_many is not None:
+            seconds = timed(put_many)
+            print(f"{map_name:<17}{'put_many':<16}{seconds:>9.2f}{baseline / seconds:>9.2f}")
+        for workers in worker_counts:
+            seconds = timed(lambda: parallel(workers))
+            print(f"{map_name:<17}{str(workers) + ' workers':<16}{seconds:>9.2f}{baseline / seconds:>9.2f}")
+
+
+if __name__ == "__main__":
+    run()
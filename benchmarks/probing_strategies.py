@@ -0,0 +1,61 @@
+# Description: Compares the probing strategies of the open addressing HashMap at high load factors. Each table has
+#              a fixed capacity and is filled to the target load without resizing, then hit and miss latency and
+#              the mean and variance of probe lengths are reported.
+#              Run with: python -m benchmarks.probing_strategies [capacity]
+
+
+import random
+import sys
+import time
+
+from hash_map_open_addressing import HashMap
+from probing import DoubleHashing, LinearProbing, QuadraticProbing, RobinHood
+
+
+def spread_hash(key: str) -> int:
+    return hash(key) & 0x7FFFFFFFFFFFFFFF
+
+
+def mean_and_variance(values: list) -> tuple:
+    mean = sum(values) / len(values)
+    return mean, sum((value - mean) ** 2 for value in values) / len(values)
+
+
+def mean_latency_ns(function, keys: list) -> float:
+    start = time.perf_counter_ns()
+    for key in keys:
+        function(key)
+    return (time.perf_counter_ns() - start) / len(keys)
+
+
+def run(capacity: int = 20_011, loads=(0.5, 0.7, 0.8, 0.9), samples: int = 5_000) -> None:
+    strategies = [
+        ('quadratic', QuadraticProbing),
+        ('linear', LinearProbing),
+        ('double hashing', DoubleHashing),
+        ('robin hood', RobinHood),
+    ]
+    print(f"capacity={capacity} (probe lengths are buckets looked at, latency is ns/op)")
+    print(f"{'load':>5}  {'strategy':<16}{'hit ns':>8}{'miss ns':>9}{'hit mean':>10}{'hit var':>9}"
+          f"{'miss mean':>11}{'miss var':>10}")
+    for load in loads:
+        size = int(capacity * load)
+        keys = ['key' + str(i) for i in range(size)]
+        hits = random.sample(keys, min(samples, size))
+        misses = ['miss' + str(i) for i in range(samples)]
+        for name, factory in strategies:
+            m = HashMap(capacity, spread_hash, probing=factory(), max_load=0.95, max_occupancy=0.99)
+            for i, key in enumerate(keys):
+                m.put(key, i)
+            # Quadratic probing can fail to find an open bucket above 0.5 and grow instead
+            if m.capacity != capacity:
+                print(f"{load:>5}  {name:<16}  grew to {m.capacity}, can't hold this load")
+                continue
+            hit_mean, hit_variance = mean_and_variance([m.probe_length(key) for key in hits])
+            miss_mean, miss_variance = mean_and_variance([m.probe_length(key) for key in misses])
+            print(f"{load:>5}  {name:<16}{mean_latency_ns(m.get, hits):>8.0f}{mean_latency_ns(m.get, misses):>9.0f}"
+                  f"{hit_mean:>10.2f}{hit_variance:>9.2f}{miss_mean:>11.2f}{miss_variance:>10.2f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20_011)
@@ -0,0 +1,47 @@
+# Description: Resize cost with short and long keys. Hashes are cached on the entries, so a resize never calls the
+#              hash function and its cost depends on the number of entries, not on key length. The number of hash
+#              function calls made during the resize is reported next to its duration.
+#              Run with: python -m benchmarks.rehash_long_keys [n]
+
+
+import sys
+import time
+
+import hash_map_chaining
+import hash_map_open_addressing
+
+
+class CountingHash:
+    """
+    Wraps a hash function and counts how many times it is called
+    """
+
+    def __init__(self, function) -> None:
+        self.function = function
+        self.calls = 0
+
+    def __call__(self, key: str) -> int:
+        self.calls += 1
+        return self.function(key)
+
+
+def run(n: int = 20_000, lengths=(8, 128, 1024)) -> None:
+    print(f"n={n}")
+    print(f"{'map':<18}{'key length':>12}{'resize (ms)':>14}{'hash calls':>12}")
+    for module, name in ((hash_map_chaining, 'chaining'), (hash_map_open_addressing, 'open addressing')):
+        for length in lengths:
+            keys = [str(i).rjust(length, 'x') for i in range(n)]
+            counter = CountingHash(module.hash_function_2)
+            m = module.HashMap(4 * n, counter)
+            for i, key in enumerate(keys):
+                m.put(key, i)
+
+            counter.calls = 0
+            start = time.perf_counter()
+            m.resize_table(8 * n)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{name:<18}{length:>12}{elapsed:>14.2f}{counter.calls:>12}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,63 @@
+# Description: Per-operation put latency with stop-the-world and incremental resizing, for both HashMap
+#              implementations. Reports p50 / p99 / p99.9 / max latency in microseconds.
+#              The cyclic garbage collector is turned off while measuring so its own pauses don't hide the
+#              resize cost. Run with: python -m benchmarks.resize_latency [n]
+
+
+import gc
+import sys
+import time
+
+import hash_map_chaining
+import hash_map_open_addressing
+from benchmarks.timing import percentile
+
+
+def spread_hash(key: str) -> int:
+    """
+    Well spread hash so the measured latency comes from resizing and not
+    from clustering of the sample hash functions
+    """
+    return hash(key) & 0x7FFFFFFFFFFFFFFF
+
+
+def put_latencies_us(m, keys: list) -> list:
+    """
+    Takes a hash map and a list of keys, puts every key and returns the
+    latency of each put in microseconds
+    """
+    latencies = []
+    clock = time.perf_counter_ns
+    gc.collect()
+    gc.disable()
+    try:
+        for i, key in enumerate(keys):
+            start = clock()
+            m.put(key, i)
+            latencies.append((clock() - start) / 1000)
+    finally:
+        gc.enable()
+    return latencies
+
+
+def run(n: int = 200_000, step: int = 16) -> None:
+    keys = ['key' + str(i) for i in range(n)]
+    maps = [
+        ('chaining', lambda: hash_map_chaining.HashMap(16, spread_hash, max_load=1.0)),
+        ('chaining incremental', lambda: hash_map_chaining.HashMap(16, spread_hash, max_load=1.0,
+                                                                    incremental_step=step)),
+        ('open addressing', lambda: hash_map_open_addressing.HashMap(16, spread_hash)),
+        ('open addressing incremental', lambda: hash_map_open_addressing.HashMap(16, spread_hash,
+                                                                                  incremental_step=step)),
+    ]
+
+    print(f"n={n} incremental_step={step}  (put latency in us)")
+    print(f"{'map':<30}{'p50':>8}{'p99':>8}{'p99.9':>10}{'max':>12}{'total s':>10}")
+    for name, factory in maps:
+        latencies = put_latencies_us(factory(), keys)
+        print(f"{name:<30}{percentile(latencies, 0.5):>8.2f}{percentile(latencies, 0.99):>8.2f}"
+              f"{percentile(latencies, 0.999):>10.2f}{max(latencies):>12.1f}{sum(latencies) / 1e6:>10.3f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,214 @@
+# Description: Runs the benchmark workloads against the HashMap implementations and Python's dict. For each map and
+#              workload it reports throughput, per-operation latency percentiles and the peak memory traced while
+#              the workload ran, and can write the results as JSON so runs can be compared later.
+#              Run with: python -m benchmarks --help
+
+
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from benchmarks.timing import percentile
+from benchmarks.workloads import WORKLOADS, make_keys
+from hash_functions import get_hash_function
+import hash_map_chaining
+import hash_map_compact
+import hash_map_open_addressing
+
+
+class DictMap:
+    """
+    Python's dict behind the HashMap methods, as a baseline
+    """
+
+    def __init__(self, capacity: int, function) -> None:
+        self.data = {}
+
+    def put(self, key: str, value: object) -> None:
+        self.data[key] = value
+
+    def get(self, key: str) -> object:
+        return self.data.get(key)
+
+    def remove(self, key: str) -> None:
+        self.data.pop(key, None)
+
+    def contains_key(self, key: str) -> bool:
+        return key in self.data
+
+
+MAPS = {
+    # The chaining map only resizes with a load policy, so give it one
+    'chaining': lambda capacity, function: hash_map_chaining.HashMap(capacity, function,
+                                                                     max_load=1.0, min_load=0.25),
+    'open_addressing': hash_map_open_addressing.HashMap,
+    'compact': hash_map_compact.HashMap,
+    'dict': DictMap,
+}
+
+
+def execute(m, operations: list, latencies: list = None) -> float:
+    """
+    Takes a map and a list of (operation, key, value) tuples and applies
+    them in order. Each operation's time in nanoseconds is appended to
+    latencies if a list is given. Returns the total time in seconds.
+    """
+    methods = {
+        'put': m.put,
+        'get': m.get,
+        'remove': m.remove,
+        'contains_key': m.contains_key,
+    }
+    clock = time.perf_counter_ns
+    start = clock()
+    if latencies is None:
+        for operation, key, value in operations:
+            if operation == 'put':
+                methods[operation](key, value)
+            else:
+                methods[operation](key)
+    else:
+        record = latencies.append
+        for operation, key, value in operations:
+            method = methods[operation]
+            if operation == 'put':
+                before = clock()
+                method(key, value)
+            else:
+                before = clock()
+                method(key)
+            record(clock() - before)
+    return (clock() - start) / 1e9
+
+
+def build(factory, workload, function):
+    """
+    Takes a map factory, a workload and a hash function and returns a new
+    map with the workload's preload pairs put in it
+    """
+    m = factory(workload.capacity, function)
+    for key, value in workload.preload:
+        m.put(key, value)
+    return m
+
+
+def measure(factory, workload, function, repeat: int = 3) -> dict:
+    """
+    Takes a map factory, a workload and a hash function and runs the
+    workload repeat times on fresh maps. Returns a dict with the best
+    throughput, latency percentiles from the run with per-operation timing
+    and the peak memory traced while building the map and running the
+    workload. Garbage collection is off while timing.
+    """
+    count = len(workload.operations)
+    best = float('inf')
+    gc_was_enabled = gc.isenabled()
+    try:
+        for _ in range(repeat):
+            m = build(factory, workload, function)
+            gc.collect()
+            gc.disable()
+            best = min(best, execute(m, workload.operations))
+            gc.enable()
+
+        # Timing every operation slows the run, so it is a separate pass
+        latencies = []
+        m = build(factory, workload, function)
+        gc.collect()
+        gc.disable()
+        execute(m, workload.operations, latencies)
+        gc.enable()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    del m
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        m = build(factory, workload, function)
+        execute(m, workload.operations)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'operations': count,
+        'seconds': best,
+        'ops_per_sec': count / best if best > 0 else 0.0,
+        'p50_ns': percentile(latencies, 0.50),
+        'p90_ns': percentile(latencies, 0.90),
+        'p99_ns': percentile(latencies, 0.99),
+        'p999_ns': percentile(latencies, 0.999),
+        'max_ns': max(latencies) if latencies else 0,
+        'peak_memory_bytes': peak,
+    }
+
+
+def run(maps=tuple(MAPS), workloads=tuple(WORKLOADS), size: int = 10_000, operations: int = 50_000,
+        keys: str = 'sequential', key_length: int = 12, access: str = 'uniform', zipf_s: float = 1.1,
+        hash_name: str = 'builtin', repeat: int = 3, seed: int = 0, report=print) -> dict:
+    """
+    Takes the names of the maps and workloads to run and the workload
+    parameters, runs every workload on every map and returns the results
+    as a dict ready to be written as JSON. Each result is reported as it
+    finishes.
+    """
+    function = get_hash_function(hash_name)
+    key_list = make_keys(size + operations, keys, key_length, random.Random(seed))
+    results = []
+    for workload_name in workloads:
+        workload = WORKLOADS[workload_name](size, operations, key_list, access, random.Random(seed), zipf_s=zipf_s)
+        for map_name in maps:
+            result = {'map': map_name, 'workload': workload_name}
+            result.update(measure(MAPS[map_name], workload, function, repeat))
+            results.append(result)
+            report(format_result(result))
+
+    return {
+        'meta': {
+            'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'parameters': {
+            'size': size,
+            'operations': operations,
+            'keys': keys,
+            'key_length': key_length,
+            'access': access,
+            'zipf_s': zipf_s,
+            'hash': hash_name,
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+HEADER = (f"{'workload':<14}{'map':<17}{'ops/s':>12}{'p50 ns':>9}{'p99 ns':>9}"
+          f"{'p99.9 ns':>10}{'max ns':>11}{'peak KiB':>10}")
+
+
+def format_result(result: dict) -> str:
+    """
+    Takes one result dict and returns it as a table row matching HEADER
+    """
+    return (f"{result['workload']:<14}{result['map']:<17}{result['ops_per_sec']:>12,.0f}"
+            f"{result['p50_ns']:>9}{result['p99_ns']:>9}{result['p999_ns']:>10}"
+            f"{result['max_ns']:>11}{result['peak_memory_bytes'] / 1024:>10,.0f}")
+
+
+def write_json(results: dict, path: str) -> None:
+    """
+    Takes the dict returned by run and a file path and writes the results
+    there as JSON
+    """
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2)
+        file.write('\n')
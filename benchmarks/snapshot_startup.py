@@ -0,0 +1,60 @@
+# Description: Compares two ways of starting a process that needs a large HashMap: rebuilding it by putting every
+#              pair again, and opening a snapshot saved earlier and serving lookups from the mapped file. Reports
+#              how long the map takes to become usable, the time for a batch of lookups after that, the time to
+#              save the snapshot and the snapshot file size.
+#              Run with: python -m benchmarks.snapshot_startup
+
+
+import os
+import random
+import tempfile
+import time
+
+import snapshot
+from hash_functions import murmur
+from hash_map_chaining import HashMap
+
+
+def timed(function) -> tuple:
+    """
+    Takes a function with no parameters and returns a tuple (result,
+    seconds taken)
+    """
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def rebuild(pairs: list) -> HashMap:
+    """
+    Takes a list of pairs and returns a chaining HashMap holding them
+    """
+    m = HashMap(1024, murmur, max_load=1.0)
+    for key, value in pairs:
+        m.put(key, value)
+    return m
+
+
+def run(counts=(10_000, 100_000, 500_000), lookups: int = 10_000) -> None:
+    path = os.path.join(tempfile.mkdtemp(), 'map.snapshot')
+    print(f"{'entries':>9}{'rebuild s':>11}{'open s':>10}{'speedup':>9}{'rebuild gets s':>16}"
+          f"{'snapshot gets s':>17}{'save s':>9}{'file MB':>9}")
+    for count in counts:
+        pairs = [('key' + str(i), {'id': i, 'name': 'value' + str(i)}) for i in range(count)]
+        sample = random.Random(count).choices([key for key, _ in pairs], k=lookups)
+
+        m, rebuild_time = timed(lambda: rebuild(pairs))
+        _, rebuild_gets = timed(lambda: [m.get(key) for key in sample])
+        _, save_time = timed(lambda: m.save(path))
+
+        loaded, open_time = timed(lambda: snapshot.load(path, murmur))
+        _, snapshot_gets = timed(lambda: [loaded.get(key) for key in sample])
+        loaded.close()
+
+        print(f"{count:>9}{rebuild_time:>11.3f}{open_time:>10.5f}{rebuild_time / open_time:>8.0f}x"
+              f"{rebuild_gets:>16.4f}{snapshot_gets:>17.4f}{save_time:>9.3f}{os.path.getsize(path) / 2**20:>9.1f}")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,77 @@
+# Description: Compares loading a delimited key/value file into a HashMap three ways: putting every line while
+#              reading the file, HashMap.from_file (a sketch pass to size the table, then a load pass) and
+#              HashMap.from_iterable over a one-shot iterator of the lines. The file repeats keys, so it has more
+#              lines than distinct keys. Reports the resizes, peak traced memory and load time of each.
+#              Run with: python -m benchmarks.streaming_load
+
+
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from hash_functions import murmur
+from hash_map_chaining import HashMap as ChainingHashMap
+from hash_map_compact import HashMap as CompactHashMap
+from hash_map_open_addressing import HashMap as OpenAddressingHashMap
+from streaming import read_delimited
+
+
+def write_file(path: str, lines: int, distinct: int, seed: int = 0) -> None:
+    """
+    Takes a path, a number of lines and a number of distinct keys and writes
+    that many tab separated lines of random keys and their values
+    """
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as file:
+        for _ in range(lines):
+            i = rng.randrange(distinct)
+            file.write('key' + str(i) + '\t' + str(i) + '\n')
+
+
+def put_lines(cls, path: str, options: dict):
+    """
+    Takes a HashMap class, a file path and the class's options and returns
+    a map of that class with every line of the file put in it, along with
+    its load report
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    m = cls(16, murmur, **options)
+    for key, value in read_delimited(path, convert=int):
+        m.put(key, value)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    m.load_report = {'resizes': m.resizes, 'peak_memory': peak, 'seconds': seconds}
+    return m
+
+
+def run(lines: int = 200_000, distinct: int = 150_000) -> None:
+    path = os.path.join(tempfile.mkdtemp(), 'pairs.tsv')
+    write_file(path, lines, distinct)
+    print(f"{lines} lines, {distinct} distinct keys, {os.path.getsize(path) / 2**20:.1f} MB")
+    maps = {
+        'chaining': (ChainingHashMap, {'max_load': 1.0}),
+        'open addressing': (OpenAddressingHashMap, {}),
+        'compact': (CompactHashMap, {}),
+    }
+    loads = {
+        'put per line': put_lines,
+        'from_file': lambda cls, path, options: cls.from_file(path, murmur, convert=int, **options),
+        'from_iterable': lambda cls, path, options: cls.from_iterable(iter(read_delimited(path, convert=int)),
+                                                                      murmur, **options),
+    }
+    print(f"{'map':<17}{'load':<15}{'size':>8}{'capacity':>10}{'resizes':>9}{'peak MB':>9}{'seconds':>9}")
+    for map_name, (cls, options) in maps.items():
+        for load_name, load in loads.items():
+            m = load(cls, path, options)
+            report = m.load_report
+            print(f"{map_name:<17}{load_name:<15}{m.size:>8}{m.capacity:>10}{report['resizes']:>9}"
+                  f"{report['peak_memory'] / 2**20:>9.1f}{report['seconds']:>9.2f}")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    run()
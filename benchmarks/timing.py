@@ -0,0 +1,29 @@
+# Description: Small timing helpers shared by the benchmark modules.
+
+
+import time
+
+
+def best_of(function, repeat: int = 3) -> float:
+    """
+    Takes a function with no parameters and calls it repeat times.
+    Returns the fastest run time in seconds.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def percentile(samples: list, fraction: float) -> float:
+    """
+    Takes a list of samples and a fraction between 0 and 1 and returns the
+    sample at that percentile (nearest rank)
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[rank]
@@ -0,0 +1,46 @@
+# Description: Probe lengths of the open addressing HashMap under delete churn. The map is filled to a fixed size,
+#              then every round removes the oldest key and puts a brand new one, so the size never changes while
+#              tombstones pile up. Compares the default tombstone compaction with compaction turned off.
+#              Run with: python -m benchmarks.tombstone_churn [rounds]
+
+
+import random
+import sys
+import time
+
+from hash_map_open_addressing import HashMap
+
+
+def spread_hash(key: str) -> int:
+    return hash(key) & 0x7FFFFFFFFFFFFFFF
+
+
+def mean(values: list) -> float:
+    return sum(values) / len(values)
+
+
+def run(rounds: int = 200_000, size: int = 3_000, capacity: int = 8_192, samples: int = 2_000) -> None:
+    print(f"size={size} capacity={capacity} rounds={rounds}")
+    print(f"{'max_occupancy':<15}{'tombstones':>12}{'hit probes':>12}{'miss probes':>13}"
+          f"{'max miss':>10}{'compactions':>13}{'resizes':>9}{'ops/s':>10}")
+    for max_occupancy in (None, 0.5):
+        m = HashMap(capacity, spread_hash, max_occupancy=max_occupancy)
+        for i in range(size):
+            m.put('key' + str(i), i)
+
+        start = time.perf_counter()
+        for i in range(size, size + rounds):
+            m.remove('key' + str(i - size))
+            m.put('key' + str(i), i)
+        ops_per_second = 2 * rounds / (time.perf_counter() - start)
+
+        live = ['key' + str(i) for i in range(rounds, rounds + size)]
+        hits = [m.probe_length(key) for key in random.sample(live, samples)]
+        misses = [m.probe_length('miss' + str(i)) for i in range(samples)]
+        stats = m.stats()
+        print(f"{str(max_occupancy):<15}{stats['tombstones']:>12}{mean(hits):>12.2f}{mean(misses):>13.2f}"
+              f"{max(misses):>10}{stats['compactions']:>13}{stats['resizes']:>9}{ops_per_second:>10.0f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
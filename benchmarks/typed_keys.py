@@ -0,0 +1,74 @@
+# Description: Compares put and get throughput of the typed maps with the string path they replace. Integer IDs are
+#              either turned into strings with str() before every operation on a string-keyed map, or used as they
+#              are with IntHashMap / IntOpenAddressingHashMap. Bytes keys are either decoded to strings or used as
+#              they are with BytesHashMap / BytesOpenAddressingHashMap, also passed as memoryviews. Each string path
+#              is timed with murmur, which is as well mixed as int_hash and bytes_hash, and the chaining one with
+#              hash_function_2 too. hash_function_2 clusters numeric strings so badly under quadratic probing that
+#              the open addressing run would take minutes, so it is left out there.
+#              Run with: python -m benchmarks.typed_keys
+
+
+import random
+import time
+
+import hash_map_chaining
+import hash_map_open_addressing
+from hash_functions import murmur
+from typed_maps import BytesHashMap, BytesOpenAddressingHashMap, IntHashMap, IntOpenAddressingHashMap
+
+
+def run_path(make, keys: list, convert) -> tuple:
+    """
+    Takes a function making an empty map, the keys and a function applied
+    to every key before each operation, and returns the put and get
+    operations per second
+    """
+    m = make()
+    start = time.perf_counter()
+    for key in keys:
+        m.put(convert(key), 1)
+    put_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in keys:
+        m.get(convert(key))
+    get_seconds = time.perf_counter() - start
+    return len(keys) / put_seconds, len(keys) / get_seconds
+
+
+def run(count: int = 200_000) -> None:
+    rng = random.Random(6)
+    ids = rng.sample(range(10**12), count)
+    blobs = [rng.randbytes(16).hex().encode() for _ in range(count)]
+    views = [memoryview(blob) for blob in blobs]
+
+    def same(key):
+        return key
+
+    paths = {
+        'chaining': [
+            ('str(id), hash_function_2', ids, str,
+             lambda: hash_map_chaining.HashMap(16, hash_map_chaining.hash_function_2, max_load=1.0)),
+            ('str(id), murmur', ids, str, lambda: hash_map_chaining.HashMap(16, murmur, max_load=1.0)),
+            ('int, IntHashMap', ids, same, lambda: IntHashMap(16, max_load=1.0)),
+            ('bytes.decode(), murmur', blobs, bytes.decode,
+             lambda: hash_map_chaining.HashMap(16, murmur, max_load=1.0)),
+            ('bytes, BytesHashMap', blobs, same, lambda: BytesHashMap(16, max_load=1.0)),
+            ('memoryview, BytesHashMap', views, same, lambda: BytesHashMap(16, max_load=1.0)),
+        ],
+        'open addressing': [
+            ('str(id), murmur', ids, str, lambda: hash_map_open_addressing.HashMap(16, murmur)),
+            ('int, IntOpenAddressing', ids, same, lambda: IntOpenAddressingHashMap(16)),
+            ('bytes.decode(), murmur', blobs, bytes.decode, lambda: hash_map_open_addressing.HashMap(16, murmur)),
+            ('bytes, BytesOpenAddr.', blobs, same, lambda: BytesOpenAddressingHashMap(16)),
+            ('memoryview, BytesOpenAddr.', views, same, lambda: BytesOpenAddressingHashMap(16)),
+        ],
+    }
+    print(f"{'engine':<17}{'keys':<28}{'put ops/s':>12}{'get ops/s':>12}")
+    for engine, rows in paths.items():
+        for name, keys, convert, make in rows:
+            puts, gets = run_path(make, keys, convert)
+            print(f"{engine:<17}{name:<28}{puts:>12,.0f}{gets:>12,.0f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,160 @@
+# Description: Key generators and workloads for the benchmark suite. A workload is built ahead of time as a list of
+#              (operation, key, value) tuples plus the keys to load into the map before timing starts, so building
+#              keys and picking random numbers are never part of the measured time.
+
+
+import itertools
+import random
+import string
+
+
+class Workload:
+    """
+    A benchmark workload: the map's initial capacity, the pairs put before
+    timing starts and the timed operations as (operation, key, value)
+    tuples where operation is 'put', 'get', 'remove' or 'contains_key'
+    """
+
+    def __init__(self, name: str, capacity: int, preload: list, operations: list) -> None:
+        self.name = name
+        self.capacity = capacity
+        self.preload = preload
+        self.operations = operations
+
+
+def make_keys(count: int, kind: str = 'sequential', length: int = 12, rng: random.Random = None) -> list:
+    """
+    Takes a key count, a key kind and a key length and returns a list of
+    distinct key strings. 'sequential' keys are 'key0', 'key1', ... and
+    'random' keys are random letters and digits of the given length.
+    """
+    if kind == 'sequential':
+        return ['key' + str(i) for i in range(count)]
+    if kind == 'random':
+        rng = rng or random.Random(0)
+        alphabet = string.ascii_letters + string.digits
+        keys = set()
+        while len(keys) < count:
+            keys.add(''.join(rng.choices(alphabet, k=length)))
+        return sorted(keys)
+    raise ValueError("unknown key kind: " + kind)
+
+
+class ZipfSampler:
+    """
+    Picks ranks 0..n-1 with probability proportional to 1 / (rank + 1)^s
+    """
+
+    def __init__(self, n: int, s: float = 1.1, rng: random.Random = None) -> None:
+        self.rng = rng or random.Random(0)
+        self.cum_weights = list(itertools.accumulate(1 / (rank + 1) ** s for rank in range(n)))
+        self.population = range(n)
+
+    def sample(self, count: int) -> list:
+        """
+        Takes a count and returns that many ranks
+        """
+        return self.rng.choices(self.population, cum_weights=self.cum_weights, k=count)
+
+
+def pick(keys: list, count: int, access: str, rng: random.Random, zipf_s: float = 1.1) -> list:
+    """
+    Takes a list of keys and returns count keys picked from it, either
+    uniformly ('uniform') or with a Zipf skew ('zipf')
+    """
+    if access == 'uniform':
+        return rng.choices(keys, k=count)
+    if access == 'zipf':
+        return [keys[rank] for rank in ZipfSampler(len(keys), zipf_s, rng).sample(count)]
+    raise ValueError("unknown access distribution: " + access)
+
+
+def insert_heavy(size: int, operations: int, keys: list, access: str, rng: random.Random, **options) -> Workload:
+    """
+    Starts from a small table. 90% of operations put a new key, 10% update
+    an existing one, so the table keeps growing.
+    """
+    ops = []
+    inserted = 0
+    for i in range(operations):
+        if inserted == 0 or rng.random() < 0.9:
+            key = keys[inserted % len(keys)]
+            inserted += 1
+        else:
+            key = keys[rng.randrange(min(inserted, len(keys)))]
+        ops.append(('put', key, i))
+    return Workload('insert_heavy', 16, [], ops)
+
+
+def read_heavy(size: int, operations: int, keys: list, access: str, rng: random.Random, **options) -> Workload:
+    """
+    Preloads size keys. 95% of operations are gets of existing keys and 5%
+    update them.
+    """
+    loaded = keys[:size]
+    picked = pick(loaded, operations, access, rng, options.get('zipf_s', 1.1))
+    ops = [('get' if rng.random() < 0.95 else 'put', key, i) for i, key in enumerate(picked)]
+    return Workload('read_heavy', size, [(key, i) for i, key in enumerate(loaded)], ops)
+
+
+def miss_heavy(size: int, operations: int, keys: list, access: str, rng: random.Random, **options) -> Workload:
+    """
+    Preloads size keys. 90% of operations look up keys that were never put
+    and 10% check keys that were.
+    """
+    loaded = keys[:size]
+    absent = ['absent-' + key for key in pick(loaded, operations, access, rng, options.get('zipf_s', 1.1))]
+    present = pick(loaded, operations, access, rng, options.get('zipf_s', 1.1))
+    ops = []
+    for i in range(operations):
+        if rng.random() < 0.9:
+            ops.append(('get', absent[i], None))
+        else:
+            ops.append(('contains_key', present[i], None))
+    return Workload('miss_heavy', size, [(key, i) for i, key in enumerate(loaded)], ops)
+
+
+def delete_churn(size: int, operations: int, keys: list, access: str, rng: random.Random, **options) -> Workload:
+    """
+    Preloads size keys, then every pair of operations removes the oldest key
+    and puts a brand new one, so the size stays the same.
+    """
+    ops = []
+    for i in range(operations // 2):
+        ops.append(('remove', keys[i % len(keys)], None))
+        ops.append(('put', 'churn' + str(i) + '-' + keys[(i + size) % len(keys)], i))
+    return Workload('delete_churn', size, [(key, i) for i, key in enumerate(keys[:size])], ops)
+
+
+def resize_storm(size: int, operations: int, keys: list, access: str, rng: random.Random, **options) -> Workload:
+    """
+    Starts from a one bucket table and repeatedly fills it with size keys
+    and empties it again, so the table keeps growing and shrinking.
+    """
+    ops = []
+    loaded = keys[:size]
+    while len(ops) < operations:
+        ops.extend(('put', key, i) for i, key in enumerate(loaded))
+        ops.extend(('remove', key, None) for key in loaded)
+    return Workload('resize_storm', 1, [], ops[:operations])
+
+
+def key_skew(size: int, operations: int, keys: list, access: str, rng: random.Random, **options) -> Workload:
+    """
+    Preloads size keys. Operations are 80% gets and 20% puts of keys picked
+    with a Zipf skew, whatever the access distribution.
+    """
+    loaded = keys[:size]
+    picked = pick(loaded, operations, 'zipf', rng, options.get('zipf_s', 1.1))
+    ops = [('get' if rng.random() < 0.8 else 'put', key, i) for i, key in enumerate(picked)]
+    return Workload('key_skew', size, [(key, i) for i, key in enumerate(loaded)], ops)
+
+
+WORKLOADS = {
+    'insert_heavy': insert_heavy,
+    'read_heavy': read_heavy,
+    'miss_heavy': miss_heavy,
+    'delete_churn': delete_churn,
+    'resize_storm': resize_storm,
+    'key_skew': key_skew,
+}
@@ -0,0 +1,496 @@
+# Description: Bounded caches built on the chaining HashMap. The caches' entries are CacheNode objects, a subclass of
+#              SLNode, inserted into the map itself with put_node, so an entry is one object that sits in its
+#              bucket's chain and in a doubly linked eviction order list at the same time. LRUCache keeps one list
+#              in recency order: a hit moves its node to the newest end and eviction unlinks the oldest node.
+#              LFUCache keeps one list per use count and evicts the least recently used node of the lowest count.
+#              Both are O(1) per operation without searching. A cache is bounded by an entry count, a byte budget
+#              or both, and entries can expire after a time to live. Expiry is lazy: an expired entry is dropped
+#              when a lookup finds it or when eviction reaches it, and purge_expired drops them all at once. Hits,
+#              misses, evictions and expirations are counted.
+
+
+import sys
+import time
+
+from hash_map_chaining import HashMap
+from include_file import SLNode
+
+
+class CacheNode(SLNode):
+    """
+    Node of a cache: a HashMap node with the entry's cost in bytes, its
+    expiry time (None if it never expires), its use count and links to the
+    next newer and next older node of its eviction order list
+    """
+
+    def __init__(self, key: str, value: object, hash: int = None, cost: int = 0, expires: float = None) -> None:
+        super().__init__(key, value, hash)
+        self.cost = cost
+        self.expires = expires
+        self.count = 0
+        self.newer = None
+        self.older = None
+
+
+def _ring() -> CacheNode:
+    """
+    Takes no parameters and returns the sentinel of an empty circular list.
+    The sentinel's newer link is the oldest node and its older link the
+    newest.
+    """
+    sentinel = CacheNode(None, None)
+    sentinel.newer = sentinel.older = sentinel
+    return sentinel
+
+
+def _append(sentinel: CacheNode, node: CacheNode) -> None:
+    """
+    Takes the sentinel of a list and a node that isn't in a list and links
+    the node at the newest end
+    """
+    newest = sentinel.older
+    node.older = newest
+    node.newer = sentinel
+    newest.newer = node
+    sentinel.older = node
+
+
+def _unlink(node: CacheNode) -> None:
+    """
+    Takes a node of a list and unlinks it
+    """
+    node.older.newer = node.newer
+    node.newer.older = node.older
+    node.newer = node.older = None
+
+
+def _walk(sentinel: CacheNode):
+    """
+    Takes the sentinel of a list and yields its nodes from the oldest to
+    the newest. The node yielded can be unlinked before the next one.
+    """
+    node = sentinel.newer
+    while node is not sentinel:
+        newer = node.newer
+        yield node
+        node = newer
+
+
+class _Cache:
+    """
+    Bounded cache over a chaining HashMap. Subclasses keep the eviction
+    order with _link, _use, _unlink, _victim, _nodes and _reset_order.
+    """
+
+    def __init__(self, capacity: int, function, max_entries: int = None, max_bytes: int = None,
+                 ttl: float = None, sizeof=sys.getsizeof, clock=time.monotonic, **options) -> None:
+        """
+        Takes the initial capacity and hash function of the HashMap, the
+        most entries to keep, the most bytes to keep, the default time to
+        live of an entry in seconds, a function returning the size in bytes
+        of a key or value, a function returning the current time and any
+        other options of the chaining HashMap.
+        Any of max_entries, max_bytes and ttl can be None for no limit.
+        """
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        # A cache is sized by its limits, so its HashMap runs fuller than the default unless asked otherwise
+        options.setdefault('max_load', 1.0)
+        self.map = HashMap(capacity, function, **options)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.clock = clock
+        self.bytes = 0
+        self._reset_order()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def size(self) -> int:
+        """ Number of entries in the cache, expired ones not dropped yet included """
+        return self.map.size
+
+    def _drop(self, node: CacheNode) -> None:
+        """
+        Takes a node of the cache and removes it from the map and the
+        eviction order
+        """
+        self.map.remove_node(node)
+        self._unlink(node)
+        self.bytes -= node.cost
+
+    def _expired(self, node: CacheNode, now: float = None) -> bool:
+        if node.expires is None:
+            return False
+        return (self.clock() if now is None else now) >= node.expires
+
+    def _cost(self, key: str, value: object) -> int:
+        """
+        Takes a key and a value and returns their size in bytes, or 0 if
+        the cache has no byte budget
+        """
+        if self.max_bytes is None:
+            return 0
+        return self.sizeof(key) + self.sizeof(value)
+
+    def _evict(self, pending: int = 0) -> None:
+        """
+        Takes the number of entries in the map not linked into the eviction
+        order yet and drops linked entries in eviction order until the
+        cache is within its entry count and byte budget, or only the
+        pending entries are left
+        """
+        while (self.map.size > pending
+               and ((self.max_entries is not None and self.map.size > self.max_entries)
+                    or (self.max_bytes is not None and self.bytes > self.max_bytes))):
+            victim = self._victim()
+            if self._expired(victim):
+                self.expirations += 1
+            else:
+                self.evictions += 1
+            self._drop(victim)
+
+    def get(self, key: str, default: object = None) -> object:
+        """
+        Takes a key string and an optional default and returns the value
+        paired with that key, counting it as a use of the entry. If the key
+        doesn't exist or its entry has expired, the default is returned.
+        """
+        node = self.map.get_node(key)
+        if node is None:
+            self.misses += 1
+            return default
+        if node.expires is not None and self.clock() >= node.expires:
+            self._drop(node)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._use(node)
+        self.hits += 1
+        return node.value
+
+    def put(self, key: str, value: object, ttl: float = None) -> None:
+        """
+        Takes a key string, a value and an optional time to live in seconds
+        that overrides the cache's default, and adds the key/value pair,
+        replacing the value if the key is already there, which counts as a
+        use of the entry. Then evicts entries until the cache is within its
+        limits.
+        """
+        if ttl is None:
+            ttl = self.ttl
+        elif ttl <= 0:
+            raise ValueError("ttl must be positive")
+        expires = None if ttl is None else self.clock() + ttl
+        cost = self._cost(key, value)
+
+        node = CacheNode(key, value, self.map.hash_function(key), cost, expires)
+        existing = self.map.put_node(node)
+        # Replace value of the existing node
+        if existing is not node:
+            self.bytes += cost - existing.cost
+            existing.value = value
+            existing.cost = cost
+            existing.expires = expires
+            self._use(existing)
+        else:
+            self.bytes += cost
+            # Make room among the older entries first, so the new one is never evicted for itself
+            self._evict(pending=1)
+            self._link(node)
+        self._evict()
+
+    def remove(self, key: str) -> None:
+        """
+        Takes a key string as a parameter and removes its entry from the
+        cache. If the key doesn't exist, the method simply returns without
+        doing anything.
+        """
+        node = self.map.get_node(key)
+        if node is not None:
+            self._drop(node)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Takes a key string as a parameter and returns True if the key is in
+        the cache and hasn't expired. The entry's place in the eviction
+        order and the hit and miss counts don't change.
+        """
+        node = self.map.get_node(key)
+        if node is None:
+            return False
+        if self._expired(node):
+            self._drop(node)
+            self.expirations += 1
+            return False
+        return True
+
+    def purge_expired(self) -> int:
+        """
+        Takes no parameters, drops every expired entry and returns how many
+        were dropped
+        """
+        now = self.clock()
+        count = 0
+        for node in list(self._nodes()):
+            if self._expired(node, now):
+                self._drop(node)
+                count += 1
+        self.expirations += count
+        return count
+
+    def clear(self) -> None:
+        """
+        Takes no parameters and removes every entry. The counters are kept.
+        """
+        self.map.clear()
+        self._reset_order()
+        self.bytes = 0
+
+    def keys(self):
+        """
+        Takes no parameters and returns a generator of the keys in eviction
+        order, the next to be evicted first, expired ones included
+        """
+        for node in self._nodes():
+            yield node.key
+
+    def stats(self) -> dict:
+        """
+        Takes no parameters and returns a dict with the entry count, bytes
+        used, limits, hits, misses, hit ratio, evictions and expirations
+        """
+        lookups = self.hits + self.misses
+        return {
+            'size': self.map.size,
+            'bytes': self.bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+
+class LRUCache(_Cache):
+    """
+    Cache that evicts its least recently used entries
+    Supported methods are: get, put, remove, contains_key, purge_expired,
+    clear, keys and stats
+    """
+
+    def _reset_order(self) -> None:
+        self._sentinel = _ring()
+
+    def _link(self, node: CacheNode) -> None:
+        _append(self._sentinel, node)
+
+    def _use(self, node: CacheNode) -> None:
+        """
+        Takes a node of the cache and moves it to the newest end
+        """
+        if node.newer is not self._sentinel:
+            _unlink(node)
+            _append(self._sentinel, node)
+
+    def _unlink(self, node: CacheNode) -> None:
+        _unlink(node)
+
+    def _victim(self) -> CacheNode:
+        return self._sentinel.newer
+
+    def _nodes(self):
+        return _walk(self._sentinel)
+
+
+class LFUCache(_Cache):
+    """
+    Cache that evicts its least frequently used entries, and the least
+    recently used of those first
+    Supported methods are: get, put, remove, contains_key, purge_expired,
+    clear, keys and stats
+    """
+
+    def _reset_order(self) -> None:
+        # Sentinel of the list of nodes with each use count, and the lowest count
+        self._counts = {}
+        self._min_count = 0
+
+    def _append(self, node: CacheNode) -> None:
+        """
+        Takes a node that isn't in a list and links it at the newest end of
+        the list of its use count
+        """
+        sentinel = self._counts.get(node.count)
+        if sentinel is None:
+            sentinel = self._counts[node.count] = _ring()
+        _append(sentinel, node)
+
+    def _link(self, node: CacheNode) -> None:
+        node.count = 1
+        self._append(node)
+        self._min_count = 1
+
+    def _use(self, node: CacheNode) -> None:
+        """
+        Takes a node of the cache and moves it to the list of the next use
+        count
+        """
+        lowest = node.count == self._min_count
+        self._unlink(node)
+        node.count += 1
+        self._append(node)
+        # The node was alone at the lowest count, which is now its new one
+        if lowest is True and self._min_count == 0:
+            self._min_count = node.count
+
+    def _unlink(self, node: CacheNode) -> None:
+        """
+        Takes a node of the cache and unlinks it from the list of its use
+        count, dropping the list if it is left empty
+        """
+        sentinel = self._counts[node.count]
+        _unlink(node)
+        if sentinel.newer is sentinel:
+            del self._counts[node.count]
+            if node.count == self._min_count:
+                # Found again by _victim when it is needed
+                self._min_count = 0
+
+    def _victim(self) -> CacheNode:
+        """
+        Takes no parameters and returns the oldest node of the lowest use
+        count
+        """
+        if self._min_count == 0:
+            self._min_count = min(self._counts)
+        return self._counts[self._min_count].newer
+
+    def _nodes(self):
+        for count in sorted(self._counts):
+            yield from _walk(self._counts[count])
+
+
+if __name__ == "__main__":
+    from hash_functions import murmur
+
+    print("\nLRU example 1")
+    print("-------------------")
+    c = LRUCache(4, murmur, max_entries=3)
+    for key in 'a', 'b', 'c':
+        c.put(key, key.upper())
+    c.get('a')
+    c.put('d', 'D')
+    print(list(c.keys()), c.get('b'), c.get('a'), c.size)
+    c.put('c', 'C2')
+    c.put('e', 'E')
+    print(list(c.keys()), c.stats()['evictions'], c.stats()['hits'], c.stats()['misses'])
+    c = LRUCache(4, murmur, max_entries=100, max_load=0.75)
+    for i in range(100):
+        c.put('key' + str(i), i)
+    print(c.map.max_load, c.map.table_load() <= 0.75, c.size)
+
+    print("\nbyte budget example 1")
+    print("---------------------------")
+    c = LRUCache(4, murmur, max_bytes=100, sizeof=len)
+    for i in range(10):
+        c.put('k' + str(i), 'x' * 20)
+    print(c.size, c.bytes, list(c.keys()))
+    c.put('k9', 'x' * 60)
+    print(c.size, c.bytes, list(c.keys()))
+
+    print("\nTTL example 1")
+    print("-------------------")
+    now = [0.0]
+    c = LRUCache(4, murmur, max_entries=10, ttl=5, clock=lambda: now[0])
+    c.put('short', 1, ttl=1)
+    c.put('default', 2)
+    c.put('long', 3, ttl=100)
+    now[0] = 2
+    print(c.get('short'), c.get('default'), c.contains_key('long'), c.size)
+    now[0] = 10
+    print(c.purge_expired(), c.size, c.get('long'), c.stats()['expirations'])
+
+    print("\nrandom operations example 1")
+    print("---------------------------------")
+    import collections
+    import random
+    rng = random.Random(3)
+    c = LRUCache(8, murmur, max_entries=50)
+    model = collections.OrderedDict()
+    result = True
+    for _ in range(20_000):
+        key = 'key' + str(rng.randrange(120))
+        op = rng.random()
+        if op < 0.5:
+            value = c.get(key)
+            if key in model:
+                model.move_to_end(key)
+            result &= value == model.get(key)
+        elif op < 0.9:
+            c.put(key, op)
+            model[key] = op
+            model.move_to_end(key)
+            if len(model) > 50:
+                model.popitem(last=False)
+        else:
+            c.remove(key)
+            model.pop(key, None)
+    result &= list(c.keys()) == list(model) and c.size == len(model) == c.map.get_keys().length()
+    print(result, c.stats()['hit_ratio'] > 0)
+
+    print("\nLFU example 1")
+    print("-------------------")
+    c = LFUCache(4, murmur, max_entries=3)
+    for key in 'a', 'b', 'c':
+        c.put(key, key.upper())
+    c.get('a')
+    c.get('a')
+    c.get('b')
+    c.put('d', 'D')
+    print(list(c.keys()), c.get('c'), c.size)
+    c.get('d')
+    c.get('d')
+    c.put('e', 'E')
+    print(list(c.keys()), c.stats()['evictions'])
+
+    print("\nLFU random operations example 1")
+    print("-------------------------------------")
+    rng = random.Random(5)
+    c = LFUCache(8, murmur, max_entries=40)
+    # key -> [count, last use], the victim has the lowest (count, last use)
+    model = {}
+    result = True
+    for tick in range(20_000):
+        key = 'key' + str(int(rng.paretovariate(1.2)) % 150)
+        op = rng.random()
+        if op < 0.5:
+            value = c.get(key)
+            result &= value == (key if key in model else None)
+            if key in model:
+                model[key] = [model[key][0] + 1, tick]
+        elif op < 0.9:
+            c.put(key, key)
+            if key in model:
+                model[key] = [model[key][0] + 1, tick]
+            else:
+                model[key] = [1, tick]
+                if len(model) > 40:
+                    victim = min((k for k in model if k != key), key=lambda k: model[k])
+                    del model[victim]
+        else:
+            c.remove(key)
+            model.pop(key, None)
+    result &= list(c.keys()) == sorted(model, key=lambda k: model[k]) and c.size == len(model)
+    print(result)
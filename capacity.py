@@ -0,0 +1,122 @@
+# Description: Capacity policies for the open addressing HashMap. A policy rounds every capacity the table is given
+#              and picks the next one when the table grows, decides how a key's hash is mixed before it is used and
+#              which probing strategy suits its capacities. DoublingCapacity keeps capacities as given, which is the
+#              original behaviour. PrimeCapacity keeps the capacity prime, so quadratic probing reaches an open bucket
+#              whenever the load factor is under 0.5. PowerOfTwoCapacity keeps the capacity a power of two, mixes
+#              hashes with fmix64 so the low bits depend on every bit of the hash, and uses triangular probing with a
+#              bitmask, which visits every bucket of a power of two table.
+
+
+from hash_functions import fmix64
+from probing import QuadraticProbing, TriangularProbing
+
+
+def is_prime(n: int) -> bool:
+    """
+    Takes an integer and returns True if it is prime
+    """
+    if n < 2:
+        return False
+    if n < 4:
+        return True
+    if n % 2 == 0 or n % 3 == 0:
+        return False
+    i = 5
+    while i * i <= n:
+        if n % i == 0 or n % (i + 2) == 0:
+            return False
+        i += 6
+    return True
+
+
+def next_prime(n: int) -> int:
+    """
+    Takes an integer and returns the smallest prime at least as large
+    """
+    if n <= 2:
+        return 2
+    if n % 2 == 0:
+        n += 1
+    while not is_prime(n):
+        n += 2
+    return n
+
+
+def next_power_of_two(n: int) -> int:
+    """
+    Takes an integer and returns the smallest power of two at least as large
+    """
+    if n <= 1:
+        return 1
+    return 1 << (n - 1).bit_length()
+
+
+class DoublingCapacity:
+    """
+    Any capacity is used as given and growing doubles it. Hashes are used
+    as they are and the table uses quadratic probing.
+    """
+
+    # True if mix changes hashes, so the HashMap has to call it
+    mixes = False
+
+    def round(self, capacity: int) -> int:
+        """
+        Takes a requested capacity and returns the capacity to use for it
+        """
+        return capacity
+
+    def grow(self, capacity: int) -> int:
+        """
+        Takes the current capacity and returns the next larger capacity
+        """
+        return 2 * capacity
+
+    def mix(self, hash: int) -> int:
+        """
+        Takes the hash function's result for a key and returns the hash the
+        table stores and probes with
+        """
+        return hash
+
+    def probing(self):
+        """
+        Takes no parameters and returns the probing strategy used when the
+        HashMap isn't given one
+        """
+        return QuadraticProbing()
+
+
+class PrimeCapacity(DoublingCapacity):
+    """
+    Capacities are rounded up to the next prime and growing picks the next
+    prime after twice the capacity. With a prime capacity the first half of
+    a quadratic probe sequence never repeats a bucket, so a probe always
+    reaches an open bucket while the load factor is under 0.5.
+    """
+
+    def round(self, capacity: int) -> int:
+        return next_prime(capacity)
+
+    def grow(self, capacity: int) -> int:
+        return next_prime(2 * capacity)
+
+
+class PowerOfTwoCapacity(DoublingCapacity):
+    """
+    Capacities are rounded up to the next power of two and growing doubles
+    them. Hashes go through fmix64, so masking off the low bits still
+    depends on the whole hash, and the table uses triangular probing, which
+    visits every bucket of a power of two table once.
+    """
+
+    mixes = True
+
+    def round(self, capacity: int) -> int:
+        return next_power_of_two(capacity)
+
+    def mix(self, hash: int) -> int:
+        return fmix64(hash)
+
+    def probing(self):
+        return TriangularProbing()
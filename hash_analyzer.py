@@ -0,0 +1,126 @@
+# Description: Measures how well a hash function spreads a sample of keys over a table of a given capacity, so the
+#              function passed to HashMap(capacity, function) can be chosen from real keys. For a chaining table it
+#              reports bucket occupancy, the chain length histogram and the collision rate next to what an ideal
+#              random hash would give. For an open addressing table it reports the probe length histogram.
+#              Run with: python hash_analyzer.py [keys_file] [--capacity N] [--probing]
+
+
+from collections import Counter
+
+from hash_batch import hash_many
+from hash_functions import HASH_FUNCTIONS, get_hash_function
+from hash_map_open_addressing import HashMap as OpenAddressingHashMap
+
+
+def chain_report(keys: list, capacity: int, function) -> dict:
+    """
+    Takes a list of distinct keys, a capacity and a hash function and
+    returns a dict describing the chaining table the keys would make:
+    occupied and empty buckets, the chain length histogram (chain length ->
+    number of buckets), the longest and mean non-empty chain, the
+    collision rate (the fraction of keys that land in a bucket already
+    holding a key), the collision rate an ideal random hash would give and
+    the number of keys whose full hash value is shared with another key.
+    """
+    hashes = hash_many(function, keys)
+    chains = Counter(hash % capacity for hash in hashes)
+    count = len(keys)
+    occupied = len(chains)
+
+    # An ideal hash leaves each bucket empty with probability (1 - 1/capacity)^count
+    expected_occupied = capacity * (1 - (1 - 1 / capacity) ** count)
+    histogram = Counter(chains.values())
+    histogram[0] = capacity - occupied
+    duplicates = sum(shared for shared in Counter(hashes).values() if shared > 1)
+
+    return {
+        'keys': count,
+        'capacity': capacity,
+        'table_load': count / capacity,
+        'occupied_buckets': occupied,
+        'empty_buckets': capacity - occupied,
+        'chain_histogram': dict(sorted(histogram.items())),
+        'max_chain': max(chains.values(), default=0),
+        'mean_chain': count / occupied if occupied else 0.0,
+        'collision_rate': (count - occupied) / count if count else 0.0,
+        'expected_collision_rate': (count - expected_occupied) / count if count else 0.0,
+        'full_hash_collisions': duplicates,
+    }
+
+
+def probe_report(keys: list, capacity: int, function, probing=None) -> dict:
+    """
+    Takes a list of distinct keys, a capacity, a hash function and an
+    optional probing strategy and puts the keys in an open addressing
+    HashMap of that capacity (which doubles as usual when the load factor
+    reaches 0.5). Returns a dict with the final capacity, the probe length
+    histogram of looking up every key, and the mean and longest probe.
+    """
+    m = OpenAddressingHashMap(capacity, function, probing=probing)
+    for key in keys:
+        m.put(key, None)
+    lengths = [m.probe_length(key) for key in keys]
+    return {
+        'keys': len(keys),
+        'capacity': m.capacity,
+        'table_load': m.table_load(),
+        'probe_histogram': dict(sorted(Counter(lengths).items())),
+        'max_probe': max(lengths, default=0),
+        'mean_probe': sum(lengths) / len(lengths) if lengths else 0.0,
+    }
+
+
+def compare(keys: list, capacity: int, names=None, probing: bool = False) -> list:
+    """
+    Takes a list of keys, a capacity and the names of registered hash
+    functions (all of them by default) and returns a list of
+    (name, chain report, probe report or None) tuples, best first: sorted
+    by longest chain, then collision rate
+    """
+    rows = []
+    for name in names or HASH_FUNCTIONS:
+        function = get_hash_function(name)
+        probes = probe_report(keys, capacity, function) if probing else None
+        rows.append((name, chain_report(keys, capacity, function), probes))
+    rows.sort(key=lambda row: (row[1]['max_chain'], row[1]['collision_rate']))
+    return rows
+
+
+def format_comparison(rows: list) -> str:
+    """
+    Takes the list returned by compare and returns it as a table
+    """
+    lines = [f"{'function':<16}{'empty':>8}{'max chain':>11}{'mean chain':>12}"
+             f"{'collisions':>12}{'ideal':>8}{'max probe':>11}{'mean probe':>12}"]
+    for name, chains, probes in rows:
+        line = (f"{name:<16}{chains['empty_buckets']:>8}{chains['max_chain']:>11}{chains['mean_chain']:>12.2f}"
+                f"{chains['collision_rate']:>12.3f}{chains['expected_collision_rate']:>8.3f}")
+        if probes is not None:
+            line += f"{probes['max_probe']:>11}{probes['mean_probe']:>12.2f}"
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+    import itertools
+
+    parser = argparse.ArgumentParser(description='Compare the registered hash functions on a sample of keys.')
+    parser.add_argument('keys_file', nargs='?', help='file with one key per line (sample keys if omitted)')
+    parser.add_argument('--capacity', type=int, help='table capacity (the number of keys by default)')
+    parser.add_argument('--probing', action='store_true', help='also report open addressing probe lengths')
+    args = parser.parse_args()
+
+    if args.keys_file:
+        with open(args.keys_file, encoding='utf-8') as file:
+            samples = {args.keys_file: list(dict.fromkeys(line.rstrip('\n') for line in file))}
+    else:
+        samples = {
+            "'key0'..'key9999'": ['key' + str(i) for i in range(10_000)],
+            "anagrams of 'abcdefg'": [''.join(p) for p in itertools.permutations('abcdefg')],
+        }
+
+    for title, keys in samples.items():
+        print(f"\n{title}: {len(keys)} keys")
+        print("-" * 40)
+        print(format_comparison(compare(keys, args.capacity or len(keys), probing=args.probing)))
@@ -0,0 +1,152 @@
+# Description: Batch versions of the two sample hash functions used by the HashMap classes. hash_many_1 and
+#              hash_many_2 hash a whole list of keys at once and return the same values as calling
+#              hash_function_1 and hash_function_2 on every key. When NumPy is installed the keys are encoded into
+#              a single buffer of code points and each key's hash is computed with a segmented reduction, otherwise
+#              the scalar loop is used. fmix64 is the MurmurHash3 64-bit finalizer and fmix64_many runs it over a
+#              batch of integers with NumPy. hash_many picks the batch version attached to a hash function, if any.
+
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Batches smaller than this are hashed with the scalar loop, where NumPy's
+# per-call overhead would cost more than it saves
+MIN_VECTOR_BATCH = 64
+
+# Longest key the NumPy path accepts before falling back to the scalar loop.
+# Keeps hash_function_2's weighted sum well inside a signed 64-bit integer.
+MAX_VECTOR_KEY_LENGTH = 1 << 20
+
+_HASH_MASK = (1 << 64) - 1
+
+
+def _encode_keys(keys: list):
+    """
+    Takes a list of key strings and returns a tuple of (code points, offsets,
+    lengths) as NumPy arrays, where code points holds every character of every
+    key back to back. Returns None if the keys can't be hashed on the vector
+    path (non-str keys or very long keys).
+    """
+    lengths = np.fromiter((len(key) for key in keys), dtype=np.int64, count=len(keys))
+    if lengths.size and lengths.max() > MAX_VECTOR_KEY_LENGTH:
+        return None
+
+    # UTF-32 gives exactly one 4 byte unit per character, which is ord(letter)
+    buffer = ''.join(keys).encode('utf-32-le', 'surrogatepass')
+    codes = np.frombuffer(buffer, dtype=np.uint32).astype(np.int64)
+    offsets = np.zeros(len(keys), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=offsets[1:])
+    return codes, offsets, lengths
+
+
+def _segment_sums(values, offsets, lengths) -> list:
+    """
+    Takes a flat array of values and the offsets/lengths of each segment and
+    returns a list with the sum of every segment. Empty segments sum to 0.
+    """
+    # Running total with a leading 0, so each segment is a difference of two
+    # entries. Wrap-around in the running total cancels out in the difference.
+    totals = np.zeros(values.size + 1, dtype=np.int64)
+    np.cumsum(values, out=totals[1:])
+    return (totals[offsets + lengths] - totals[offsets]).tolist()
+
+
+def _vector_ready(keys: list) -> bool:
+    """
+    Returns True if the batch of keys can be hashed with NumPy
+    """
+    return np is not None and len(keys) >= MIN_VECTOR_BATCH and all(type(key) is str for key in keys)
+
+
+def hash_many_1(keys) -> list:
+    """
+    Takes an iterable of key strings and returns a list with
+    hash_function_1 of every key, in the same order.
+    """
+    keys = list(keys)
+    if _vector_ready(keys):
+        encoded = _encode_keys(keys)
+        if encoded is not None:
+            codes, offsets, lengths = encoded
+            return _segment_sums(codes, offsets, lengths)
+
+    hashes = []
+    for key in keys:
+        hash = 0
+        for letter in key:
+            hash += ord(letter)
+        hashes.append(hash)
+    return hashes
+
+
+def hash_many_2(keys) -> list:
+    """
+    Takes an iterable of key strings and returns a list with
+    hash_function_2 of every key, in the same order.
+    """
+    keys = list(keys)
+    if _vector_ready(keys):
+        encoded = _encode_keys(keys)
+        if encoded is not None:
+            codes, offsets, lengths = encoded
+            # Position of every character inside its own key, starting at 1
+            weights = np.arange(1, codes.size + 1, dtype=np.int64) - np.repeat(offsets, lengths)
+            return _segment_sums(codes * weights, offsets, lengths)
+
+    hashes = []
+    for key in keys:
+        hash = 0
+        for index, letter in enumerate(key):
+            hash += (index + 1) * ord(letter)
+        hashes.append(hash)
+    return hashes
+
+
+def fmix64(hash: int) -> int:
+    """
+    Takes an integer and returns it scrambled by the MurmurHash3 64-bit
+    finalizer, so every input bit affects every output bit
+    """
+    hash &= _HASH_MASK
+    hash ^= hash >> 33
+    hash = (hash * 0xFF51AFD7ED558CCD) & _HASH_MASK
+    hash ^= hash >> 33
+    hash = (hash * 0xC4CEB9FE1A85EC53) & _HASH_MASK
+    hash ^= hash >> 33
+    return hash
+
+
+def fmix64_many(keys: list) -> list:
+    """
+    Takes a list of integers and returns a list with every integer run
+    through the MurmurHash3 64-bit finalizer, computed on a NumPy uint64
+    array whose multiplications wrap at 2^64. Returns None if NumPy isn't
+    installed, the batch is small or an integer isn't in [0, 2^64).
+    """
+    if np is None or len(keys) < MIN_VECTOR_BATCH:
+        return None
+    try:
+        hashes = np.array(keys, dtype=np.uint64)
+    except (OverflowError, TypeError, ValueError):
+        return None
+    hashes ^= hashes >> np.uint64(33)
+    hashes *= np.uint64(0xFF51AFD7ED558CCD)
+    hashes ^= hashes >> np.uint64(33)
+    hashes *= np.uint64(0xC4CEB9FE1A85EC53)
+    hashes ^= hashes >> np.uint64(33)
+    return hashes.tolist()
+
+
+def hash_many(function, keys) -> list:
+    """
+    Takes a hash function and an iterable of keys and returns a list with
+    the hash of every key. Uses the batch version of the function when one
+    is attached to it as function.hash_many, otherwise calls it per key.
+    """
+    batch = getattr(function, 'hash_many', None)
+    if batch is not None:
+        return batch(keys)
+    return [function(key) for key in keys]
@@ -0,0 +1,217 @@
+# Description: Hash functions for the HashMap classes and a registry to pick them by name. The two sample hash
+#              functions only add up character codes, so anagrams and keys that share characters collide. The
+#              functions here mix every byte into a 64-bit value: fnv1a is 64-bit FNV-1a over the key's UTF-8 bytes,
+#              murmur mixes the UTF-8 bytes 8 at a time with the MurmurHash3 x64 rounds and its fmix64 finalizer and
+#              builtin_hash wraps Python's own string hash. SeededHash is a keyed BLAKE2b hash with a random secret
+#              seed per instance, for keys that come from untrusted clients: without the seed nobody can compute
+#              which keys collide. Every function returns an integer in [0, 2^64) and can be passed to any HashMap as
+#              its function. hash_analyzer compares them on a sample of keys. int_hash and bytes_hash hash int and
+#              bytes keys for the typed maps and aren't registered, since the registry is for string keys.
+
+
+import hashlib
+import secrets
+import struct
+
+from hash_batch import fmix64, fmix64_many
+from hash_map_chaining import hash_function_1, hash_function_2
+
+
+HASH_MASK = (1 << 64) - 1
+
+FNV_OFFSET_BASIS = 0xCBF29CE484222325
+FNV_PRIME = 0x100000001B3
+
+MURMUR_SEED = 0
+MURMUR_C1 = 0x87C37B91114253D5
+MURMUR_C2 = 0x4CF5AD432745937F
+
+
+def fnv1a(key: str) -> int:
+    """
+    64-bit FNV-1a hash of the key's UTF-8 bytes
+    """
+    hash = FNV_OFFSET_BASIS
+    for byte in key.encode('utf-8', 'surrogatepass'):
+        hash = ((hash ^ byte) * FNV_PRIME) & HASH_MASK
+    return hash
+
+
+def _rotl64(value: int, bits: int) -> int:
+    return ((value << bits) | (value >> (64 - bits))) & HASH_MASK
+
+
+def murmur(key: str) -> int:
+    """
+    64-bit hash of the key's UTF-8 bytes with a single lane of the
+    MurmurHash3 x64 mixing: every 8-byte little-endian word, and the zero
+    padded tail, is multiplied, rotated and multiplied again before it is
+    mixed into the state, and the state goes through fmix64 at the end.
+    Unlike a hash over characters, keys that sum to the same polynomial,
+    like 'Aa' and 'BB', hash apart.
+    """
+    data = key.encode('utf-8', 'surrogatepass')
+    length = len(data)
+    blocks = length // 8
+    hash = MURMUR_SEED
+    for word in struct.unpack_from('<' + str(blocks) + 'Q', data):
+        word = (word * MURMUR_C1) & HASH_MASK
+        word = _rotl64(word, 31)
+        word = (word * MURMUR_C2) & HASH_MASK
+        hash ^= word
+        hash = _rotl64(hash, 27)
+        hash = (hash * 5 + 0x52DCE729) & HASH_MASK
+    if length % 8:
+        word = int.from_bytes(data[blocks * 8:], 'little')
+        word = (word * MURMUR_C1) & HASH_MASK
+        word = _rotl64(word, 31)
+        word = (word * MURMUR_C2) & HASH_MASK
+        hash ^= word
+    return fmix64(hash ^ length)
+
+
+def builtin_hash(key: str) -> int:
+    """
+    Python's own hash of the key as a non-negative 64-bit integer. It is
+    the fastest option, but string hashes are salted per process unless
+    PYTHONHASHSEED is set, so bucket positions change between runs.
+    """
+    return hash(key) & HASH_MASK
+
+
+class SeededHash:
+    """
+    A keyed hash function: 64-bit BLAKE2b of the key's UTF-8 bytes, keyed
+    with a secret seed. Each instance picks its own random seed unless one
+    is given, and always returns the same hash for the same key, so a
+    HashMap built with HashMap(capacity, SeededHash()) keeps working while
+    its collisions can't be predicted from outside the process.
+    """
+
+    def __init__(self, seed: bytes = None) -> None:
+        """
+        Takes an optional seed of up to 64 bytes. A 16 byte seed is drawn
+        from the secrets module if none is given.
+        """
+        if seed is None:
+            seed = secrets.token_bytes(16)
+        if not isinstance(seed, bytes) or len(seed) > hashlib.blake2b.MAX_KEY_SIZE:
+            raise ValueError("seed must be at most 64 bytes")
+        self.seed = seed
+
+    def __call__(self, key: str) -> int:
+        digest = hashlib.blake2b(key.encode('utf-8', 'surrogatepass'), digest_size=8, key=self.seed).digest()
+        return int.from_bytes(digest, 'little')
+
+    def hash_many(self, keys) -> list:
+        """
+        Takes an iterable of key strings and returns a list with the hash of
+        every key, in the same order
+        """
+        blake2b, seed = hashlib.blake2b, self.seed
+        return [int.from_bytes(blake2b(key.encode('utf-8', 'surrogatepass'), digest_size=8, key=seed).digest(),
+                               'little') for key in keys]
+
+    def __repr__(self) -> str:
+        # Never show the seed
+        return 'SeededHash()'
+
+
+def int_hash(key: int) -> int:
+    """
+    Hash of an integer key: its low 64 bits through fmix64, so keys that
+    differ only above bit 63 collide. Consecutive IDs come out spread over
+    the whole 64-bit range.
+    """
+    return fmix64(key)
+
+
+def _int_hash_many(keys) -> list:
+    """
+    Takes an iterable of integer keys and returns a list with int_hash of
+    every key, in the same order
+    """
+    keys = list(keys)
+    hashes = fmix64_many(keys)
+    if hashes is None:
+        hashes = [fmix64(key) for key in keys]
+    return hashes
+
+
+int_hash.hash_many = _int_hash_many
+
+
+def bytes_hash(key: bytes) -> int:
+    """
+    Hash of a bytes key, or of any object exporting a buffer like a
+    memoryview or bytearray: 64-bit BLAKE2b of the bytes, with no decoding
+    """
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little')
+
+
+def _bytes_hash_many(keys) -> list:
+    """
+    Takes an iterable of bytes keys and returns a list with bytes_hash of
+    every key, in the same order
+    """
+    blake2b = hashlib.blake2b
+    return [int.from_bytes(blake2b(key, digest_size=8).digest(), 'little') for key in keys]
+
+
+bytes_hash.hash_many = _bytes_hash_many
+
+
+HASH_FUNCTIONS = {}
+
+
+def register(name: str, function) -> None:
+    """
+    Takes a name and a hash function and adds the function to the registry
+    under that name, replacing any function already registered there
+    """
+    HASH_FUNCTIONS[name] = function
+
+
+def get_hash_function(name: str):
+    """
+    Takes a name and returns the hash function registered under it.
+    Raises a KeyError listing the registered names if there is none.
+    """
+    try:
+        return HASH_FUNCTIONS[name]
+    except KeyError:
+        raise KeyError(f"no hash function named {name!r}, choose from {sorted(HASH_FUNCTIONS)}") from None
+
+
+register('hash_function_1', hash_function_1)
+register('hash_function_2', hash_function_2)
+register('fnv1a', fnv1a)
+register('murmur', murmur)
+register('builtin', builtin_hash)
+# One seed for the whole process, so the registered function is stable
+register('seeded', SeededHash())
+
+
+if __name__ == "__main__":
+    import itertools
+
+    print("\nhash functions example 1")
+    print("------------------------------")
+    for name in HASH_FUNCTIONS:
+        function = get_hash_function(name)
+        print(f"{name:<16}{function('key12'):>22}{function('key21'):>22}")
+
+    print("\ncollision example 1")
+    print("-------------------------")
+    # 'Aa' and 'BB' have the same base-31 polynomial hash, so every key made of them does too
+    blocks = [''.join(parts) for parts in itertools.product(('Aa', 'BB'), repeat=12)]
+    for name in 'fnv1a', 'murmur':
+        function = get_hash_function(name)
+        print(name, function('Aa') != function('BB'), len({function(key) for key in blocks}), len(blocks))
+
+    print("\nseeded hash example 1")
+    print("---------------------------")
+    first, second = SeededHash(), SeededHash()
+    print(first('key12') == first('key12'), first('key12') != second('key12'),
+          SeededHash(b'seed')('key12') == SeededHash(b'seed')('key12'),
+          first.hash_many(['key12', 'key21']) == [first('key12'), first('key21')])
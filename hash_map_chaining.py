@@ -12,6 +12,9 @@
 
 
 from include_file import *
+from hash_batch import hash_many, hash_many_1, hash_many_2
+import snapshot
+import streaming
 
 
 def hash_function_1(key: str) -> int:
@@ -36,23 +39,128 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+# Batch versions used by bulk loads and rehashes
+hash_function_1.hash_many = hash_many_1
+hash_function_2.hash_many = hash_many_2
+
+# A chain longer than this becomes a SortedChain
+TREEIFY_THRESHOLD = 8
+
+
+class ChainLengths:
+    """
+    Number of buckets with each chain length, kept up to date as chains
+    grow and shrink, so the number of empty buckets and the longest chain
+    are known without walking the buckets
+    """
+
+    def __init__(self, buckets: int) -> None:
+        """
+        Takes a number of buckets, all of them empty
+        """
+        # counts[n] is the number of buckets whose chain has n nodes
+        self.counts = [buckets]
+        self.max = 0
+
+    def change(self, old: int, new: int) -> None:
+        """
+        Takes the old and new length of a chain that grew or shrank
+        """
+        counts = self.counts
+        counts[old] -= 1
+        while new >= len(counts):
+            counts.append(0)
+        counts[new] += 1
+        if new > self.max:
+            self.max = new
+        else:
+            # Chains only shrink a node or a few at a time, so this loop is short
+            while self.max > 0 and counts[self.max] == 0:
+                self.max -= 1
+
+    @classmethod
+    def merged(cls, parts: list) -> 'ChainLengths':
+        """
+        Takes a list of ChainLengths and returns one that counts the buckets
+        of all of them
+        """
+        merged = cls(0)
+        merged.counts = [0] * (max(part.max for part in parts) + 1)
+        for part in parts:
+            for length in range(part.max + 1):
+                merged.counts[length] += part.counts[length]
+        merged.max = len(merged.counts) - 1
+        return merged
+
+
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    def __init__(self, capacity: int, function, max_load: float = None, min_load: float = None,
+                 incremental_step: int = None, treeify_threshold: int = TREEIFY_THRESHOLD) -> None:
         """
         Init new HashMap based on DA with SLL for collision resolution
+
+        max_load and min_load are an optional resize policy. When the load
+        factor goes over max_load after a put the table doubles, and when it
+        drops under min_load after a remove the table halves (never below the
+        initial capacity). min_load must be under half of max_load so a
+        resize always lands strictly inside the bounds and can't thrash.
+
+        If incremental_step is given, resizes done by the policy are
+        incremental: the old and new bucket arrays are kept side by side and
+        every get, put, remove and contains_key moves at most that many old
+        buckets into the new array until the migration is done.
+
+        A bucket whose chain grows longer than treeify_threshold is turned
+        into a SortedChain, which finds keys with a binary search, and is
+        turned back into a linked list once it shrinks under three quarters
+        of the threshold. treeify_threshold=None keeps every bucket a
+        linked list.
         """
+        if max_load is not None and max_load <= 0:
+            raise ValueError("max_load must be greater than 0")
+        if min_load is not None and (min_load < 0 or (max_load is not None and 2 * min_load >= max_load)):
+            raise ValueError("min_load must be at least 0 and less than half of max_load")
+        if incremental_step is not None and incremental_step < 1:
+            raise ValueError("incremental_step must be at least 1")
+        if treeify_threshold is not None and treeify_threshold < 2:
+            raise ValueError("treeify_threshold must be at least 2")
+
         self.buckets = DynamicArray()
         for _ in range(capacity):
             self.buckets.append(LinkedList())
         self.capacity = capacity
+        self._reset_chain_lengths(capacity)
         self.hash_function = function
         self.size = 0
+        # Bumped by every change that adds, removes or moves a node, so the
+        # iterators can tell the hash map changed under them
+        self._version = 0
+        self.max_load = max_load
+        self.min_load = min_load
+        self.min_capacity = capacity
+        self.resizes = 0
+        self.incremental_step = incremental_step
+        self.treeify_threshold = treeify_threshold
+        if treeify_threshold is None:
+            self._treeify_at = float('inf')
+            self._untreeify_at = 0
+        else:
+            self._treeify_at = treeify_threshold
+            self._untreeify_at = treeify_threshold * 3 // 4
+
+        # Old bucket array while an incremental resize is in progress. Old
+        # buckets below _migrate_index have already been moved.
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._migrate_index = 0
+        self._fill_index = 0
 
     def __str__(self) -> str:
         """
         Overrides object's string method
         Return content of hash map t in human-readable form
         """
+        self._finish_migration()
         out = ''
         for i in range(self.buckets.length()):
             list = self.buckets.get_at_index(i)
@@ -68,9 +176,121 @@ class HashMap:
         self.buckets = DynamicArray()
         for i in range(self.capacity):
             self.buckets.append(LinkedList())
+        self._old_buckets = None
 
         # Size needs to be reset to 0, but capacity remains the same
         self.size = 0
+        self._version += 1
+        self._reset_chain_lengths(self.capacity)
+
+    def _bucket(self, index: int) -> LinkedList:
+        """
+        Takes a bucket index and returns the linked list at that index. The
+        new bucket array of an incremental resize is filled in gradually, so
+        an empty linked list is created here if the bucket has none yet.
+        """
+        linked_list = self.buckets.get_at_index(index)
+        if linked_list is None:
+            linked_list = LinkedList()
+            self.buckets.set_at_index(index, linked_list)
+        return linked_list
+
+    def _relink(self, index: int, node: SLNode) -> None:
+        """
+        Takes a bucket index and a node and inserts the node into the chain
+        at that index, turning the chain into a SortedChain if it grows
+        longer than the treeify threshold
+        """
+        chain = self._bucket(index)
+        chain.insert_node(node)
+        self._chain_lengths(index).change(chain.size - 1, chain.size)
+        if chain.size > self._treeify_at and chain.__class__ is LinkedList:
+            self.buckets.set_at_index(index, SortedChain(chain))
+
+    def _reset_chain_lengths(self, capacity: int) -> None:
+        """
+        Takes the capacity of a new, empty bucket array and starts counting
+        its chain lengths from scratch
+        """
+        self._lengths = ChainLengths(capacity)
+
+    def _chain_lengths(self, index: int) -> ChainLengths:
+        """
+        Takes a bucket index and returns the ChainLengths that counts that
+        bucket
+        """
+        return self._lengths
+
+    def _all_chain_lengths(self) -> ChainLengths:
+        """
+        Takes no parameters and returns the ChainLengths of every bucket
+        """
+        return self._lengths
+
+    def _chain_changed(self, chain, hash: int, old_length: int) -> None:
+        """
+        Takes a chain that a put or remove just changed, the hash of the key
+        that changed and the chain's length before, and updates the chain
+        length counts. Chains of the old bucket array of an incremental
+        resize aren't counted.
+        """
+        index = hash % self.capacity
+        if self._old_buckets is None or self.buckets.get_at_index(index) is chain:
+            self._chain_lengths(index).change(old_length, chain.size)
+
+    def _recount_chain_lengths(self) -> None:
+        """
+        Takes no parameters and counts the chain lengths again by walking
+        every bucket, for code that fills the bucket array directly
+        """
+        self._reset_chain_lengths(self.capacity)
+        for index in range(self.capacity):
+            chain = self.buckets.get_at_index(index)
+            if chain is not None and chain.length() != 0:
+                self._chain_lengths(index).change(0, chain.length())
+
+    def _rebalance(self, chain, hash: int) -> None:
+        """
+        Takes a chain that a put or remove just changed and the hash of the
+        key that changed, and swaps the chain for a SortedChain if it is
+        longer than the treeify threshold, or back for a LinkedList if it
+        is a SortedChain that is now shorter than the untreeify threshold
+        """
+        if chain.__class__ is LinkedList:
+            if chain.size <= self._treeify_at:
+                return
+            replacement = SortedChain(chain)
+        else:
+            if chain.size >= self._untreeify_at:
+                return
+            replacement = chain.to_linked_list()
+
+        index = hash % self.capacity
+        if self.buckets.get_at_index(index) is chain:
+            self.buckets.set_at_index(index, replacement)
+        else:
+            # Unmigrated bucket of the old array during an incremental resize
+            self._old_buckets.set_at_index(hash % self._old_capacity, replacement)
+
+    def _find(self, key: str, hash: int) -> tuple:
+        """
+        Takes a key string and its hash and returns a tuple of (linked list,
+        node). The linked list is the bucket the key belongs to and node is
+        the node holding the key, or None if the key isn't in the hash map.
+        While an incremental resize is in progress, an old bucket that
+        hasn't been migrated yet is searched too and returned if it holds
+        the key.
+        """
+        linked_list = self._bucket(hash % self.capacity)
+        node = linked_list.contains(key, hash)
+        if node is None and self._old_buckets is not None:
+            old_index = hash % self._old_capacity
+            if old_index >= self._migrate_index:
+                old_list = self._old_buckets.get_at_index(old_index)
+                old_node = old_list.contains(key, hash)
+                if old_node is not None:
+                    return old_list, old_node
+        return linked_list, node
 
     def get(self, key: str) -> object:
         """
@@ -78,18 +298,14 @@ class HashMap:
         with that key. If no such key exists in the hash map, None is
         returned.
         """
-        # Determine index of key and get linked list in hash map at index
-        hash = self.hash_function(key)
-        index = hash % self.capacity
-        linked_list = self.buckets.get_at_index(index)
+        if self._old_buckets is not None:
+            self._migrate(self.incremental_step)
 
-        # Return None for empty linked list or key not in linked list
-        if linked_list.length() == 0 or linked_list.contains(key) is None:
+        # Find the node that matches key, return None if there isn't one
+        linked_list, node = self._find(key, self.hash_function(key))
+        if node is None:
             return None
-        # Return value of node that matches key
-        else:
-            node = linked_list.contains(key)
-            return node.value
+        return node.value
 
     def put(self, key: str, value: object) -> None:
         """
@@ -97,18 +313,23 @@ class HashMap:
         exists in the hash map, the value is updated to the new value. If
         the key doesn't exist, the key/value pair is added to the hash map.
         """
-        # Determine index of key and get linked list in hash map at index
+        if self._old_buckets is not None:
+            self._migrate(self.incremental_step)
+
+        # Determine linked list for the key and the node that matches it
         hash = self.hash_function(key)
-        index = hash % self.capacity
-        linked_list = self.buckets.get_at_index(index)
+        linked_list, node = self._find(key, hash)
 
-        # Insert node with key/value if empty linked list or key doesn't exist
-        if linked_list.length() == 0 or linked_list.contains(key) is None:
-            linked_list.insert(key, value)
+        # Insert node with key/value if key doesn't exist
+        if node is None:
+            linked_list.insert(key, value, hash)
             self.size += 1
+            self._version += 1
+            self._chain_changed(linked_list, hash, linked_list.size - 1)
+            self._rebalance(linked_list, hash)
+            self._apply_load_policy()
         # Replace value of node if key exists in linked list
         else:
-            node = linked_list.contains(key)
             node.value = value
 
     def remove(self, key: str) -> None:
@@ -117,18 +338,69 @@ class HashMap:
         from the hash map. If the key doesn't exist in the hash map, the
         method simply returns without doing anything.
         """
-        # Determine index of key and get linked list in hash map at index
-        hash = self.hash_function(key)
-        index = hash % self.capacity
-        linked_list = self.buckets.get_at_index(index)
+        self._remove_hashed(key, self.hash_function(key))
+
+    def _remove_hashed(self, key: str, hash: int) -> bool:
+        """
+        Takes a key string and its hash and removes the key/value pair from
+        the hash map. Returns True if the key was there.
+        """
+        if self._old_buckets is not None:
+            self._migrate(self.incremental_step)
+
+        linked_list, node = self._find(key, hash)
 
         # Don't do anything if key doesn't exist
-        if linked_list.contains(key) is None:
-            return
+        if node is None:
+            return False
         # Remove if key exists and decrement size of hash map
         else:
-            linked_list.remove(key)
+            linked_list.remove(key, hash)
             self.size -= 1
+            self._version += 1
+            self._chain_changed(linked_list, hash, linked_list.size + 1)
+            self._rebalance(linked_list, hash)
+            self._apply_load_policy()
+            return True
+
+    def get_node(self, key: str) -> SLNode:
+        """
+        Takes a key string as a parameter and returns the node holding the
+        key, or None if the key isn't in the hash map
+        """
+        if self._old_buckets is not None:
+            self._migrate(self.incremental_step)
+        _, node = self._find(key, self.hash_function(key))
+        return node
+
+    def put_node(self, node: SLNode) -> SLNode:
+        """
+        Takes a node whose hash is the hash function's hash of its key and
+        inserts the node itself into the hash map, unless the key is
+        already there. Returns the node that holds the key afterwards: the
+        given node if it was inserted, otherwise the existing one. Callers
+        can keep their own data on nodes of an SLNode subclass this way.
+        """
+        if self._old_buckets is not None:
+            self._migrate(self.incremental_step)
+
+        linked_list, existing = self._find(node.key, node.hash)
+        if existing is not None:
+            return existing
+        linked_list.insert_node(node)
+        self.size += 1
+        self._version += 1
+        self._chain_changed(linked_list, node.hash, linked_list.size - 1)
+        self._rebalance(linked_list, node.hash)
+        self._apply_load_policy()
+        return node
+
+    def remove_node(self, node: SLNode) -> bool:
+        """
+        Takes a node of the hash map and removes it, using its cached hash
+        instead of hashing the key again. Returns True if it was removed.
+        """
+        return self._remove_hashed(node.key, node.hash)
 
     def contains_key(self, key: str) -> bool:
         """
@@ -136,35 +408,24 @@ class HashMap:
         is in the hash map. If the key is not found or the hash map
         is empty, False is returned.
         """
-        # Determine index of key and get linked list in hash map at index
-        hash = self.hash_function(key)
-        index = hash % self.capacity
-        linked_list = self.buckets.get_at_index(index)
-
         # Hash map is empty return False
-        if self.empty_buckets() == self.buckets.length():
-            return False
-        # Key not in linked list return False
-        elif linked_list.contains(key) is None:
+        if self.size == 0:
             return False
-        # Key was found return True
-        else:
-            return True
+
+        if self._old_buckets is not None:
+            self._migrate(self.incremental_step)
+
+        linked_list, node = self._find(key, self.hash_function(key))
+        return node is not None
 
     def empty_buckets(self) -> int:
         """
         Takes no parameters and returns an integer value that equals
-        the number of buckets that are empty in the hash table.
+        the number of buckets that are empty in the hash table. The count
+        is kept up to date by every change, so no bucket is walked.
         """
-        empty_buckets_count = 0
-
-        # Iterate through buckets in hash map and increment count when linked list is empty
-        for i in range(self.buckets.length()):
-            linked_list = self.buckets.get_at_index(i)
-            if linked_list.length() == 0:
-                empty_buckets_count += 1
-
-        return empty_buckets_count
+        self._finish_migration()
+        return self._all_chain_lengths().counts[0]
 
     def table_load(self) -> float:
         """
@@ -176,6 +437,122 @@ class HashMap:
         table_load = elements / buckets
         return table_load
 
+    def _policy_capacity(self, size: int) -> int:
+        """
+        Takes a number of entries and returns the capacity the load policy
+        wants for it. The table doubles until the load is at most max_load,
+        or halves while the load is under min_load and the capacity stays at
+        or above the initial capacity.
+        """
+        new_capacity = self.capacity
+        if self.max_load is not None and size / new_capacity > self.max_load:
+            while size / new_capacity > self.max_load:
+                new_capacity *= 2
+        elif self.min_load is not None:
+            while new_capacity // 2 >= self.min_capacity and size / new_capacity < self.min_load:
+                new_capacity //= 2
+        return new_capacity
+
+    def _apply_load_policy(self) -> None:
+        """
+        Takes no parameters and resizes the hash table if the load factor
+        is outside the max_load / min_load bounds
+        """
+        new_capacity = self._policy_capacity(self.size)
+        if new_capacity != self.capacity:
+            if self.incremental_step is None:
+                self.resize_table(new_capacity)
+            else:
+                self._start_resize(new_capacity)
+
+    def _start_resize(self, new_capacity: int) -> None:
+        """
+        Takes an integer for a new capacity and starts an incremental resize.
+        The current buckets become the old buckets and an empty bucket array
+        of the new capacity takes their place. Nodes are moved later by
+        _migrate, a few buckets at a time.
+        """
+        self._finish_migration()
+
+        # Linked lists are created as the migration goes, see _bucket
+        new_buckets = DynamicArray([None] * new_capacity)
+
+        self._old_buckets = self.buckets
+        self._old_capacity = self.capacity
+        self._migrate_index = 0
+        self._fill_index = 0
+        self.buckets = new_buckets
+        self.capacity = new_capacity
+        self._reset_chain_lengths(new_capacity)
+        self.resizes += 1
+        self._version += 1
+
+    def _migrate(self, steps: int) -> None:
+        """
+        Takes an integer number of steps and moves that many buckets from
+        the old bucket array into the new one. Once every old bucket has
+        been moved the old bucket array is dropped.
+        """
+        stop = min(self._migrate_index + steps, self._old_capacity)
+        nodes = []
+        for i in range(self._migrate_index, stop):
+            linked_list = self._old_buckets.get_at_index(i)
+            if linked_list.length() != 0:
+                for node in linked_list:
+                    nodes.append(node)
+            # Release old linked lists as they go rather than all at the end
+            self._old_buckets.set_at_index(i, None)
+
+        # Relink nodes into the new array using their cached hashes
+        for node in nodes:
+            self._relink(node.hash % self.capacity, node)
+
+        # Create the new array's linked lists at the same pace as the migration
+        if stop == self._old_capacity:
+            fill_stop = self.capacity
+        else:
+            fill_stop = stop * self.capacity // self._old_capacity
+        for i in range(self._fill_index, fill_stop):
+            self._bucket(i)
+        self._fill_index = max(self._fill_index, fill_stop)
+
+        self._migrate_index = stop
+        if stop == self._old_capacity:
+            self._old_buckets = None
+
+    def _finish_migration(self) -> None:
+        """
+        Takes no parameters and moves every remaining old bucket into the
+        new bucket array if an incremental resize is in progress
+        """
+        if self._old_buckets is not None:
+            self._migrate(self._old_capacity)
+
+    def stats(self) -> dict:
+        """
+        Takes no parameters and returns a dict describing the hash map:
+        its size, capacity, load factor, empty and occupied buckets, the
+        longest chain, how many buckets have each chain length, the resize
+        policy and the number of resizes done so far. Every value is kept up
+        to date as the hash map changes, so this doesn't walk the buckets.
+        During an incremental resize the bucket counts only cover entries
+        already moved to the new bucket array.
+        """
+        lengths = self._all_chain_lengths()
+        return {
+            'size': self.size,
+            'capacity': self.capacity,
+            'table_load': self.table_load(),
+            'empty_buckets': lengths.counts[0],
+            'occupied_buckets': self.capacity - lengths.counts[0],
+            'max_chain_length': lengths.max,
+            'chain_lengths': lengths.counts[:lengths.max + 1],
+            'max_load': self.max_load,
+            'min_load': self.min_load,
+            'min_capacity': self.min_capacity,
+            'resizes': self.resizes,
+        }
+
     def resize_table(self, new_capacity: int) -> None:
         """
         Takes an integer parameter for a new capacity to resize a hash
@@ -186,32 +563,35 @@ class HashMap:
         if new_capacity < 1:
             return
         else:
+            self._finish_migration()
             # Create new hash map
             new_buckets = DynamicArray()
             # Set empty links in the new hash map
             for i in range(new_capacity):
                 new_buckets.append(LinkedList())
-            # Iterate through buckets in new hash map
+            # Collect the nodes of every non-empty linked list in the old hash map
+            nodes = []
             for i in range(self.buckets.length()):
                 linked_list = self.buckets.get_at_index(i)
-                # If linked list is not empty iterate through it and rehash old keys to new hash map
                 if linked_list.length() != 0:
                     for node in linked_list:
-                        key = node.key
-                        value = node.value
-                        hash = self.hash_function(key)
-                        index = hash % new_capacity
-                        new_linked_list = new_buckets.get_at_index(index)
-                        new_linked_list.insert(key, value)
+                        nodes.append(node)
             # Set new hash map as current hash map and capacity to new capacity
             self.buckets = new_buckets
             self.capacity = new_capacity
+            self._reset_chain_lengths(new_capacity)
+            self.resizes += 1
+            self._version += 1
+            # Relink the nodes into the new hash map using their cached hashes
+            for node in nodes:
+                self._relink(node.hash % new_capacity, node)
 
     def get_keys(self) -> DynamicArray:
         """
         Takes no parameters and returns a DynamicArray that includes all
         the keys from the hash map appended to it.
         """
+        self._finish_migration()
         keys_da = DynamicArray()
 
         # Iterate through buckets
@@ -224,6 +604,202 @@ class HashMap:
 
         return keys_da
 
+    def _nodes(self):
+        """
+        Takes no parameters and yields every node in the hash map, straight
+        from the buckets. Raises RuntimeError if the hash map gains, loses or
+        moves a node before the iteration is done. Changing the value of an
+        existing key is allowed.
+        """
+        self._finish_migration()
+        version = self._version
+        for linked_list in self.buckets:
+            for node in linked_list:
+                yield node
+                if self._version != version:
+                    raise RuntimeError("HashMap changed during iteration")
+
+    def keys(self):
+        """
+        Takes no parameters and returns a generator over the keys in the
+        hash map, in bucket order, without copying them
+        """
+        return (node.key for node in self._nodes())
+
+    def values(self):
+        """
+        Takes no parameters and returns a generator over the values in the
+        hash map, in bucket order, without copying them
+        """
+        return (node.value for node in self._nodes())
+
+    def items(self):
+        """
+        Takes no parameters and returns a generator over the (key, value)
+        pairs in the hash map, in bucket order, without copying them
+        """
+        return ((node.key, node.value) for node in self._nodes())
+
+    def __iter__(self):
+        """ Iterate over the keys, the same as keys() """
+        return self.keys()
+
+    def chunks(self, size: int):
+        """
+        Takes a page size and yields lists of up to that many (key, value)
+        pairs until every pair in the hash map has been yielded
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        chunk = []
+        for node in self._nodes():
+            chunk.append((node.key, node.value))
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _entries(self):
+        """
+        Takes no parameters and yields a (key, value, hash) tuple for every
+        node in the hash map
+        """
+        return ((node.key, node.value, node.hash) for node in self._nodes())
+
+    def save(self, path: str) -> None:
+        """
+        Takes a file path and writes a snapshot of the hash map there, which
+        snapshot.load(path, function) maps back as a read-only map
+        """
+        snapshot.save(self._entries(), path)
+
+    def reserve(self, count: int) -> None:
+        """
+        Takes an expected number of entries and resizes the table once, if
+        needed, so that many entries fit under max_load (or at a load factor
+        of 1.0 without a load policy) without another resize. The table
+        never shrinks here.
+        """
+        max_load = self.max_load if self.max_load is not None else 1.0
+        new_capacity = self.capacity
+        while count / new_capacity > max_load:
+            new_capacity *= 2
+        if new_capacity != self.capacity:
+            self.resize_table(new_capacity)
+
+    from_iterable = classmethod(streaming.from_iterable)
+    from_file = classmethod(streaming.from_file)
+
+    def _group_by_bucket(self, keys: list) -> tuple:
+        """
+        Takes a list of keys and hashes them in one batch. Returns a tuple
+        (groups, hashes) where groups is a dict that maps each bucket index
+        to the positions (in input order) of the keys that hash to that
+        bucket, and hashes is the list of key hashes.
+        """
+        self._finish_migration()
+        hashes = hash_many(self.hash_function, keys)
+        groups = {}
+        for position, hash in enumerate(hashes):
+            index = hash % self.capacity
+            if index in groups:
+                groups[index].append(position)
+            else:
+                groups[index] = [position]
+        return groups, hashes
+
+    def put_many(self, pairs) -> None:
+        """
+        Takes an iterable of (key, value) pairs and puts every pair in the
+        hash map, with the same result as calling put on each pair in order.
+        Keys are hashed in one batch and each linked list is walked once.
+        """
+        pairs = list(pairs)
+        groups, hashes = self._group_by_bucket([pair[0] for pair in pairs])
+
+        for index, positions in groups.items():
+            linked_list = self.buckets.get_at_index(index)
+            # Walk the linked list once to find the nodes of existing keys
+            nodes = {}
+            if linked_list.length() != 0:
+                for node in linked_list:
+                    nodes[node.key] = node
+            length = linked_list.length()
+            # Update existing nodes or insert new ones, in input order
+            for position in positions:
+                key, value = pairs[position]
+                node = nodes.get(key)
+                if node is None:
+                    node = SLNode(key, value, hashes[position])
+                    linked_list.insert_node(node)
+                    nodes[key] = node
+                    self.size += 1
+                    self._version += 1
+                else:
+                    node.value = value
+            if linked_list.size != length:
+                self._chain_lengths(index).change(length, linked_list.size)
+            self._rebalance(linked_list, hashes[positions[0]])
+
+        self._apply_load_policy()
+
+    def get_many(self, keys) -> list:
+        """
+        Takes an iterable of key strings and returns a list with the value
+        paired with each key, in input order. None is returned in place of
+        keys that don't exist in the hash map.
+        """
+        keys = list(keys)
+        values = [None] * len(keys)
+
+        groups, _ = self._group_by_bucket(keys)
+        for index, positions in groups.items():
+            linked_list = self.buckets.get_at_index(index)
+            if linked_list.length() == 0:
+                continue
+            # Walk the linked list once and answer every key in this bucket
+            nodes = {}
+            for node in linked_list:
+                nodes[node.key] = node
+            for position in positions:
+                node = nodes.get(keys[position])
+                if node is not None:
+                    values[position] = node.value
+
+        return values
+
+    def remove_many(self, keys) -> list:
+        """
+        Takes an iterable of key strings and removes each key/value pair from
+        the hash map. Returns a list of booleans in input order which are True
+        where that key was removed by this call (only the first of repeated
+        keys is True) and False where the key didn't exist.
+        """
+        keys = list(keys)
+        removed = [False] * len(keys)
+
+        groups, hashes = self._group_by_bucket(keys)
+        for index, positions in groups.items():
+            linked_list = self.buckets.get_at_index(index)
+            if linked_list.length() == 0:
+                continue
+            # Unlink every matching node in one walk of the linked list
+            removed_keys = linked_list.remove_keys({keys[position] for position in positions})
+            self.size -= len(removed_keys)
+            self._version += len(removed_keys)
+            if removed_keys:
+                self._chain_lengths(index).change(linked_list.size + len(removed_keys), linked_list.size)
+            self._rebalance(linked_list, hashes[positions[0]])
+            for position in positions:
+                key = keys[position]
+                if key in removed_keys:
+                    removed[position] = True
+                    removed_keys.discard(key)
+
+        self._apply_load_policy()
+        return removed
+
 
 # BASIC TESTING
 if __name__ == "__main__":
@@ -406,3 +982,71 @@ if __name__ == "__main__":
     m.remove('100')
     m.resize_table(2)
     print(m.get_keys())
+
+    print("\nput_many / get_many / remove_many example 1")
+    print("-------------------------------------------------")
+    m = HashMap(20, hash_function_2)
+    m.put_many([('key' + str(i), i) for i in range(50)] + [('key7', 700)])
+    print(m.size, m.capacity, m.get('key7'), m.get('key49'))
+    print(m.get_many(['key1', 'nokey', 'key7', 'key1']))
+    print(m.remove_many(['key1', 'key1', 'nokey', 'key2']))
+    print(m.size, m.get_many(['key1', 'key2', 'key3']))
+
+    print("\nload policy example 1")
+    print("---------------------------")
+    m = HashMap(8, hash_function_2, max_load=1.0, min_load=0.25)
+    for i in range(100):
+        m.put('key' + str(i), i)
+    print(m.size, m.capacity, m.table_load() <= 1.0, m.resizes)
+    for i in range(95):
+        m.remove('key' + str(i))
+    print(m.size, m.capacity, m.table_load() >= 0.25 or m.capacity == 8, m.get('key99'))
+    print(m.stats())
+
+    print("\nkeys / values / items / chunks example 1")
+    print("----------------------------------------------")
+    m = HashMap(20, hash_function_2)
+    for i in range(25):
+        m.put('key' + str(i), i)
+    print(sorted(m.keys()) == sorted(m.get_keys()), sum(m.values()), len(list(m.items())), 'key7' in list(m))
+    print([len(chunk) for chunk in m.chunks(10)])
+    try:
+        for key in m:
+            m.remove(key)
+    except RuntimeError as error:
+        print(error, m.size)
+
+    print("\noccupancy recount example 1")
+    print("---------------------------------")
+
+    def recount(m) -> tuple:
+        # Walk every bucket, the way empty_buckets used to
+        lengths = [m.buckets.get_at_index(i).length() for i in range(m.buckets.length())]
+        return lengths.count(0), max(lengths)
+
+    import random
+    rng = random.Random(21)
+    result = True
+    for options in ({}, {'max_load': 1.0, 'min_load': 0.25}, {'max_load': 0.5, 'incremental_step': 2},
+                    {'treeify_threshold': 2}):
+        m = HashMap(7, hash_function_1, **options)
+        for step in range(3000):
+            key = 'key' + str(rng.randrange(300))
+            roll = rng.random()
+            if roll < 0.5:
+                m.put(key, step)
+            elif roll < 0.9:
+                m.remove(key)
+            elif roll < 0.95:
+                m.put_many([('key' + str(rng.randrange(300)), step) for _ in range(20)])
+            elif roll < 0.99:
+                m.remove_many(['key' + str(rng.randrange(300)) for _ in range(20)])
+            elif roll < 0.997:
+                m.resize_table(rng.randrange(1, 200))
+            else:
+                m.clear()
+            if step % 50 == 0:
+                stats = m.stats()
+                result &= (m.empty_buckets(), m.stats()['max_chain_length']) == recount(m)
+                result &= stats['occupied_buckets'] + stats['empty_buckets'] == m.capacity
+    print(result)
@@ -0,0 +1,394 @@
+# Description: A program which defines a HashMap class with the same methods as the open addressing HashMap, but
+#              without any per-entry objects. Keys, values, cached hashes and slot states are kept in parallel flat
+#              arrays indexed by slot, so an entry costs a few machine words instead of a full Python object. The
+#              HashMap uses quadratic probing open-addressing, tombstones for deletion and doubles its capacity
+#              when the load factor reaches 0.5, exactly like hash_map_open_addressing.HashMap. At the bottom of
+#              the program there are several tests that test the functionality of the methods in the HashMap class.
+
+
+from array import array
+
+from include_file import *
+from hash_batch import hash_many
+from hash_map_open_addressing import hash_function_1, hash_function_2
+import snapshot
+import streaming
+
+
+# Slot states kept in the states bytearray
+EMPTY = 0
+LIVE = 1
+TOMBSTONE = 2
+
+# Cached hashes are stored as unsigned 64-bit integers
+HASH_MASK = (1 << 64) - 1
+
+
+class HashMap:
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new HashMap that stores its entries in parallel arrays
+        and uses Quadratic Probing for collision resolution
+        """
+        self.capacity = capacity
+        self.hash_function = function
+        self.size = 0
+        self._allocate(capacity)
+        self.resizes = 0
+        # Bumped by every change that adds, removes or moves an entry, so the
+        # iterators can tell the hash map changed under them
+        self._version = 0
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Takes an integer capacity and sets up empty slot arrays of that size
+        """
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = array('Q', bytes(8 * capacity))
+        self._states = bytearray(capacity)
+
+    def __str__(self) -> str:
+        """
+        Overrides object's string method
+        Return content of hash map in human-readable form
+        """
+        out = ''
+        for i in range(self.capacity):
+            if self._states[i] == EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                tombstone = self._states[i] == TOMBSTONE
+                out += f"{i}: K: {self._keys[i]} V: {self._values[i]} TS: {tombstone}\n"
+        return out
+
+    def clear(self) -> None:
+        """
+        Takes no parameters and clears the contents of the hash map.
+        The capacity of the hash map remains the same.
+        """
+        self._allocate(self.capacity)
+        self.size = 0
+        self._version += 1
+
+    def _probe(self, key: str, hash: int) -> tuple:
+        """
+        Takes a key string and its masked hash and probes the slots once
+        using quadratic probing. Returns a tuple (index, free) where index is
+        the slot holding the key (-1 if the key isn't in the hash map) and
+        free is the first tombstone or empty slot passed during the probe
+        (-1 if the probe never passed one). Cached hashes are compared
+        before keys.
+        """
+        capacity = self.capacity
+        states, hashes, keys = self._states, self._hashes, self._keys
+        index_initial = hash % capacity
+        index = index_initial
+        free = -1
+
+        for j in range(1, capacity + 1):
+            state = states[index]
+            if state == EMPTY:
+                if free == -1:
+                    free = index
+                return -1, free
+            if state == TOMBSTONE:
+                if free == -1:
+                    free = index
+            elif hashes[index] == hash and keys[index] == key:
+                return index, free
+            index = (index_initial + j * j) % capacity
+
+        return -1, free
+
+    def get(self, key: str) -> object:
+        """
+        Takes a key string as a parameter and returns the value paired
+        with that key. If the key doesn't exist, None is returned.
+        """
+        if self.size == 0:
+            return None
+        index, _ = self._probe(key, self.hash_function(key) & HASH_MASK)
+        if index == -1:
+            return None
+        return self._values[index]
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes a key string and value object as parameters and inserts the
+        key/value pair into the hash map, updating the value if the key
+        already exists. If the load factor is greater than or equal to 0.5
+        the hash map is first resized to twice its current capacity.
+        """
+        if self.table_load() >= 0.5:
+            self._rehash(2 * self.capacity)
+
+        hash = self.hash_function(key) & HASH_MASK
+        index, free = self._probe(key, hash)
+        while index == -1 and free == -1:
+            # Probe sequence never reached an open slot, so grow and probe again
+            self._rehash(2 * self.capacity)
+            index, free = self._probe(key, hash)
+
+        if index != -1:
+            self._values[index] = value
+            return
+
+        self._keys[free] = key
+        self._values[free] = value
+        self._hashes[free] = hash
+        self._states[free] = LIVE
+        self.size += 1
+        self._version += 1
+
+    def remove(self, key: str) -> None:
+        """
+        Takes a key string as a parameter and removes the key/value pair
+        from the hash map by marking its slot as a tombstone. If the key
+        isn't in the hash map, the method simply returns.
+        """
+        if self.size == 0:
+            return
+        index, _ = self._probe(key, self.hash_function(key) & HASH_MASK)
+        if index == -1:
+            return
+
+        # Drop references so the key and value can be freed
+        self._keys[index] = None
+        self._values[index] = None
+        self._states[index] = TOMBSTONE
+        self.size -= 1
+        self._version += 1
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Takes a key string as a parameter and returns True if the key
+        exists in the hash map and False if it doesn't.
+        """
+        if self.size == 0:
+            return False
+        index, _ = self._probe(key, self.hash_function(key) & HASH_MASK)
+        return index != -1
+
+    def empty_buckets(self) -> int:
+        """
+        Takes no parameters and returns the number of empty slots in the
+        hash map. A slot is empty if it was never used or is a tombstone.
+        """
+        return self.capacity - self.size
+
+    def table_load(self) -> float:
+        """
+        Takes no parameters and returns the load factor of the hash map
+        """
+        return self.size / self.capacity
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        Takes a new capacity integer and moves every live entry into new
+        slot arrays of that capacity, using the cached hashes. If an entry's
+        probe sequence is full the capacity is doubled and moving restarts.
+        """
+        live = [i for i in range(self.capacity) if self._states[i] == LIVE]
+        keys, values, hashes = self._keys, self._values, self._hashes
+
+        placed = False
+        while placed is False:
+            self.capacity = new_capacity
+            self._allocate(new_capacity)
+            placed = True
+            for i in live:
+                _, free = self._probe(keys[i], hashes[i])
+                if free == -1:
+                    placed = False
+                    new_capacity *= 2
+                    break
+                self._keys[free] = keys[i]
+                self._values[free] = values[i]
+                self._hashes[free] = hashes[i]
+                self._states[free] = LIVE
+        self.resizes += 1
+        self._version += 1
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Takes a new capacity integer as a parameter and resizes the hash
+        map to match the new capacity. If the new capacity parameter is
+        less than 1 or less than the current size of the hash map, the
+        method simply returns without doing anything.
+        """
+        if new_capacity < 1 or new_capacity < self.size:
+            return
+        self._rehash(new_capacity)
+        # Same as the open addressing HashMap, keep the load under 0.5
+        while self.table_load() >= 0.5:
+            self._rehash(2 * self.capacity)
+
+    def put_many(self, pairs) -> None:
+        """
+        Takes an iterable of (key, value) pairs and puts every pair in the
+        hash map, hashing all keys in one batch
+        """
+        pairs = list(pairs)
+        hashes = hash_many(self.hash_function, [pair[0] for pair in pairs])
+        for (key, value), hash in zip(pairs, hashes):
+            if self.table_load() >= 0.5:
+                self._rehash(2 * self.capacity)
+            hash &= HASH_MASK
+            index, free = self._probe(key, hash)
+            while index == -1 and free == -1:
+                self._rehash(2 * self.capacity)
+                index, free = self._probe(key, hash)
+            if index != -1:
+                self._values[index] = value
+                continue
+            self._keys[free] = key
+            self._values[free] = value
+            self._hashes[free] = hash
+            self._states[free] = LIVE
+            self.size += 1
+            self._version += 1
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Takes no parameters and returns a DynamicArray which includes
+        all of the keys from the hash map appended to it.
+        """
+        keys_da = DynamicArray()
+        for i in range(self.capacity):
+            if self._states[i] == LIVE:
+                keys_da.append(self._keys[i])
+        return keys_da
+
+    def _live_slots(self):
+        """
+        Takes no parameters and yields the index of every live slot. The
+        states bytearray is searched for the next live slot in C, so long
+        runs of empty slots are skipped quickly. Raises RuntimeError if the
+        hash map gains, loses or moves an entry before the iteration is
+        done, which includes a put that resizes the table.
+        """
+        version = self._version
+        states = self._states
+        index = states.find(LIVE)
+        while index != -1:
+            yield index
+            if self._version != version:
+                raise RuntimeError("HashMap changed during iteration")
+            index = states.find(LIVE, index + 1)
+
+    def keys(self):
+        """
+        Takes no parameters and returns a generator over the keys in the
+        hash map, in slot order, without copying them
+        """
+        return (self._keys[i] for i in self._live_slots())
+
+    def values(self):
+        """
+        Takes no parameters and returns a generator over the values in the
+        hash map, in slot order, without copying them
+        """
+        return (self._values[i] for i in self._live_slots())
+
+    def items(self):
+        """
+        Takes no parameters and returns a generator over the (key, value)
+        pairs in the hash map, in slot order, without copying them
+        """
+        return ((self._keys[i], self._values[i]) for i in self._live_slots())
+
+    def __iter__(self):
+        """ Iterate over the keys, the same as keys() """
+        return self.keys()
+
+    def chunks(self, size: int):
+        """
+        Takes a page size and yields lists of up to that many (key, value)
+        pairs until every pair in the hash map has been yielded
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        chunk = []
+        for i in self._live_slots():
+            chunk.append((self._keys[i], self._values[i]))
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _entries(self):
+        """
+        Takes no parameters and yields a (key, value, hash) tuple for every
+        live slot in the hash map
+        """
+        return ((self._keys[i], self._values[i], self._hashes[i]) for i in self._live_slots())
+
+    def save(self, path: str) -> None:
+        """
+        Takes a file path and writes a snapshot of the hash map there, which
+        snapshot.load(path, function) maps back as a read-only map
+        """
+        snapshot.save(self._entries(), path)
+
+    def reserve(self, count: int) -> None:
+        """
+        Takes an expected number of entries and resizes the table once, if
+        needed, so that many entries can be put without another resize. The
+        table never shrinks here.
+        """
+        new_capacity = self.capacity
+        while count > 0 and (count - 1) / new_capacity >= 0.5:
+            new_capacity *= 2
+        if new_capacity != self.capacity:
+            self._rehash(new_capacity)
+
+    from_iterable = classmethod(streaming.from_iterable)
+    from_file = classmethod(streaming.from_file)
+
+
+if __name__ == "__main__":
+
+    print("\nput / get example 1")
+    print("-------------------------")
+    m = HashMap(10, hash_function_1)
+    for i in range(20):
+        m.put('key' + str(i), i * 10)
+    m.put('key3', 'updated')
+    print(m.size, m.capacity, m.get('key3'), m.get('key19'), m.get('nokey'))
+
+    print("\nremove / contains_key example 1")
+    print("-------------------------------------")
+    m = HashMap(10, hash_function_2)
+    for i in range(10):
+        m.put(str(i), i)
+    m.remove('3')
+    m.remove('nokey')
+    print(m.size, m.contains_key('3'), m.contains_key('4'), m.empty_buckets())
+
+    print("\nresize / get_keys example 1")
+    print("---------------------------------")
+    m = HashMap(75, hash_function_2)
+    keys = [i for i in range(1, 1000, 13)]
+    m.put_many((str(key), key * 42) for key in keys)
+    result = True
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+        for key in keys:
+            result &= m.get(str(key)) == key * 42
+            result &= not m.contains_key(str(key + 1))
+    print(result, m.size, m.capacity, round(m.table_load(), 2), m.get_keys().length())
+
+    print("\nkeys / values / items / chunks example 1")
+    print("----------------------------------------------")
+    m = HashMap(20, hash_function_2)
+    for i in range(25):
+        m.put('key' + str(i), i)
+    print(sorted(m.keys()) == sorted(m.get_keys()), sum(m.values()), len(list(m.items())), 'key7' in list(m))
+    print([len(chunk) for chunk in m.chunks(10)])
+    try:
+        for key in m:
+            m.remove(key)
+    except RuntimeError as error:
+        print(error, m.size)
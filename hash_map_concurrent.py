@@ -0,0 +1,412 @@
+# Description: A thread-safe version of the chaining HashMap that uses lock striping. The table has a fixed number
+#              of stripes, each with its own lock, and stripe s guards every bucket whose index is s modulo the
+#              number of stripes. The capacity is always a multiple of the number of stripes, so a key's stripe is
+#              its hash modulo the number of stripes and never changes when the table is resized. Operations on
+#              keys in different stripes run at the same time. Each stripe keeps its own entry count, so puts and
+#              removes never share a counter, and size is their sum. A resize takes every stripe lock in order, so
+#              no reader ever sees a half resized table. At the bottom of the program there are several tests that
+#              test the functionality of the methods in the ConcurrentHashMap class.
+
+
+import threading
+
+from include_file import *
+from hash_batch import hash_many
+from hash_map_chaining import HashMap, ChainLengths, TREEIFY_THRESHOLD, hash_function_2
+
+
+class ConcurrentHashMap(HashMap):
+    def __init__(self, capacity: int, function, stripes: int = 16, max_load: float = 1.0,
+                 min_load: float = None, treeify_threshold: int = TREEIFY_THRESHOLD) -> None:
+        """
+        Init new thread-safe HashMap with the given number of lock stripes
+
+        The capacity is rounded up to a multiple of stripes. max_load and
+        min_load are the chaining HashMap's resize policy, with the table
+        doubling once the load factor goes over 1.0 by default. Resizes are
+        never incremental.
+        """
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        self.stripes = stripes
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._counts = [0] * stripes
+        capacity = max(1, -(-capacity // stripes)) * stripes
+        super().__init__(capacity, function, max_load=max_load, min_load=min_load,
+                         treeify_threshold=treeify_threshold)
+
+    @property
+    def size(self) -> int:
+        """ Number of entries, the sum of the per-stripe counts """
+        return sum(self._counts)
+
+    @size.setter
+    def size(self, value: int) -> None:
+        # HashMap only assigns size to reset it
+        self._counts = [0] * self.stripes
+        self._counts[0] = value
+
+    def _reset_chain_lengths(self, capacity: int) -> None:
+        """
+        Takes the capacity of a new, empty bucket array and starts counting
+        chain lengths from scratch, separately for each stripe so threads
+        holding different stripe locks never update the same counts
+        """
+        self._stripe_lengths = [ChainLengths(capacity // self.stripes) for _ in range(self.stripes)]
+
+    def _chain_lengths(self, index: int) -> ChainLengths:
+        """
+        Takes a bucket index and returns the ChainLengths of its stripe
+        """
+        return self._stripe_lengths[index % self.stripes]
+
+    def _all_chain_lengths(self) -> ChainLengths:
+        """
+        Takes no parameters and returns the chain length counts of every
+        stripe added together
+        """
+        return ChainLengths.merged(self._stripe_lengths)
+
+    def _lock_all(self) -> None:
+        """
+        Takes no parameters and acquires every stripe lock, always in the
+        same order so two threads doing this can't deadlock
+        """
+        for lock in self._locks:
+            lock.acquire()
+
+    def _unlock_all(self) -> None:
+        """
+        Takes no parameters and releases every stripe lock
+        """
+        for lock in reversed(self._locks):
+            lock.release()
+
+    def _policy_capacity(self, size: int) -> int:
+        """
+        Takes a number of entries and returns the capacity the load policy
+        wants for it, rounded up to a multiple of the number of stripes so
+        every bucket keeps exactly one stripe after a grow or a shrink
+        """
+        new_capacity = super()._policy_capacity(size)
+        return -(-new_capacity // self.stripes) * self.stripes
+
+    def _check_load(self) -> None:
+        """
+        Takes no parameters and resizes the table if the load policy wants a
+        different capacity. The check is first done without locks and then
+        again with every stripe lock held, since another thread may have
+        resized the table in between.
+        """
+        if self._policy_capacity(self.size) == self.capacity:
+            return
+        self._lock_all()
+        try:
+            new_capacity = self._policy_capacity(self.size)
+            if new_capacity != self.capacity:
+                HashMap.resize_table(self, new_capacity)
+        finally:
+            self._unlock_all()
+
+    def _put_locked(self, key: str, value: object, hash: int, stripe: int) -> bool:
+        """
+        Takes a key, a value, the key's hash and its stripe, whose lock the
+        caller holds, and puts the pair in the table. Returns True if the
+        key was new.
+        """
+        chain, node = self._find(key, hash)
+        if node is not None:
+            node.value = value
+            return False
+        chain.insert(key, value, hash)
+        self._counts[stripe] += 1
+        self._version += 1
+        self._chain_changed(chain, hash, chain.size - 1)
+        self._rebalance(chain, hash)
+        return True
+
+    def _remove_locked(self, key: str, hash: int, stripe: int) -> bool:
+        """
+        Takes a key, its hash and its stripe, whose lock the caller holds,
+        and removes the key from the table. Returns True if it was there.
+        """
+        chain, node = self._find(key, hash)
+        if node is None:
+            return False
+        chain.remove(key, hash)
+        self._counts[stripe] -= 1
+        self._version += 1
+        self._chain_changed(chain, hash, chain.size + 1)
+        self._rebalance(chain, hash)
+        return True
+
+    def get(self, key: str) -> object:
+        """
+        Takes a key string as a parameter and returns the value paired
+        with that key. If no such key exists in the hash map, None is
+        returned.
+        """
+        hash = self.hash_function(key)
+        with self._locks[hash % self.stripes]:
+            _, node = self._find(key, hash)
+            if node is None:
+                return None
+            return node.value
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Takes a key string and value object as parameters and puts the pair
+        in the hash map, updating the value if the key already exists
+        """
+        hash = self.hash_function(key)
+        stripe = hash % self.stripes
+        with self._locks[stripe]:
+            added = self._put_locked(key, value, hash, stripe)
+        # Resizing takes every lock, so it can only happen after this one is released
+        if added is True:
+            self._check_load()
+
+    def remove(self, key: str) -> None:
+        """
+        Takes a key string as a parameter and removes the key/value pair
+        from the hash map. If the key doesn't exist in the hash map, the
+        method simply returns without doing anything.
+        """
+        hash = self.hash_function(key)
+        stripe = hash % self.stripes
+        with self._locks[stripe]:
+            removed = self._remove_locked(key, hash, stripe)
+        if removed is True:
+            self._check_load()
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Takes a key string as a parameter and returns True if the key
+        is in the hash map, False otherwise
+        """
+        hash = self.hash_function(key)
+        with self._locks[hash % self.stripes]:
+            _, node = self._find(key, hash)
+            return node is not None
+
+    def get_node(self, key: str) -> SLNode:
+        """
+        Takes a key string as a parameter and returns the node holding the
+        key, or None if the key isn't in the hash map
+        """
+        hash = self.hash_function(key)
+        with self._locks[hash % self.stripes]:
+            _, node = self._find(key, hash)
+            return node
+
+    def put_node(self, node: SLNode) -> SLNode:
+        """
+        Takes a node whose hash is the hash function's hash of its key and
+        inserts the node itself, unless the key is already there. Returns
+        the node that holds the key afterwards.
+        """
+        stripe = node.hash % self.stripes
+        with self._locks[stripe]:
+            chain, existing = self._find(node.key, node.hash)
+            if existing is not None:
+                return existing
+            chain.insert_node(node)
+            self._counts[stripe] += 1
+            self._version += 1
+            self._chain_changed(chain, node.hash, chain.size - 1)
+            self._rebalance(chain, node.hash)
+        self._check_load()
+        return node
+
+    def remove_node(self, node: SLNode) -> bool:
+        """
+        Takes a node of the hash map and removes it using its cached hash.
+        Returns True if it was removed.
+        """
+        stripe = node.hash % self.stripes
+        with self._locks[stripe]:
+            removed = self._remove_locked(node.key, node.hash, stripe)
+        if removed is True:
+            self._check_load()
+        return removed
+
+    def _group_by_stripe(self, keys: list) -> tuple:
+        """
+        Takes a list of keys and hashes them in one batch. Returns a tuple
+        (groups, hashes) where groups maps each stripe to the positions of
+        its keys, in input order.
+        """
+        hashes = hash_many(self.hash_function, keys)
+        groups = {}
+        for position, hash in enumerate(hashes):
+            groups.setdefault(hash % self.stripes, []).append(position)
+        return groups, hashes
+
+    def put_many(self, pairs) -> None:
+        """
+        Takes an iterable of (key, value) pairs and puts every pair in the
+        hash map, taking each stripe's lock once
+        """
+        pairs = list(pairs)
+        groups, hashes = self._group_by_stripe([pair[0] for pair in pairs])
+        for stripe, positions in groups.items():
+            with self._locks[stripe]:
+                for position in positions:
+                    key, value = pairs[position]
+                    self._put_locked(key, value, hashes[position], stripe)
+        self._check_load()
+
+    def get_many(self, keys) -> list:
+        """
+        Takes an iterable of key strings and returns a list with the value
+        paired with each key, in input order, or None for missing keys
+        """
+        keys = list(keys)
+        values = [None] * len(keys)
+        groups, hashes = self._group_by_stripe(keys)
+        for stripe, positions in groups.items():
+            with self._locks[stripe]:
+                for position in positions:
+                    _, node = self._find(keys[position], hashes[position])
+                    if node is not None:
+                        values[position] = node.value
+        return values
+
+    def remove_many(self, keys) -> list:
+        """
+        Takes an iterable of key strings, removes each one from the hash map
+        and returns a list of booleans in input order which are True where
+        that key was removed by this call
+        """
+        keys = list(keys)
+        removed = [False] * len(keys)
+        groups, hashes = self._group_by_stripe(keys)
+        for stripe, positions in groups.items():
+            with self._locks[stripe]:
+                for position in positions:
+                    removed[position] = self._remove_locked(keys[position], hashes[position], stripe)
+        self._check_load()
+        return removed
+
+    def clear(self) -> None:
+        """
+        Takes no parameters and clears the contents of the hash map.
+        The capacity of the hash map remains the same.
+        """
+        self._lock_all()
+        try:
+            super().clear()
+        finally:
+            self._unlock_all()
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Takes an integer parameter for a new capacity, rounds it up to a
+        multiple of the number of stripes and resizes the table with every
+        stripe lock held. The method simply returns if the new capacity
+        parameter is less than 1.
+        """
+        if new_capacity < 1:
+            return
+        new_capacity = -(-new_capacity // self.stripes) * self.stripes
+        self._lock_all()
+        try:
+            super().resize_table(new_capacity)
+        finally:
+            self._unlock_all()
+
+    def __str__(self) -> str:
+        """
+        Return content of hash map in human-readable form, with every
+        stripe lock held
+        """
+        self._lock_all()
+        try:
+            return super().__str__()
+        finally:
+            self._unlock_all()
+
+    def empty_buckets(self) -> int:
+        """
+        Takes no parameters and returns the number of empty buckets, with
+        every stripe lock held
+        """
+        self._lock_all()
+        try:
+            return super().empty_buckets()
+        finally:
+            self._unlock_all()
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Takes no parameters and returns a DynamicArray with every key in the
+        hash map, read with every stripe lock held
+        """
+        self._lock_all()
+        try:
+            return super().get_keys()
+        finally:
+            self._unlock_all()
+
+    def stats(self) -> dict:
+        """
+        Takes no parameters and returns the HashMap stats plus the number of
+        stripes and the entry count of each stripe
+        """
+        self._lock_all()
+        try:
+            stats = super().stats()
+            stats['stripes'] = self.stripes
+            stats['stripe_counts'] = list(self._counts)
+        finally:
+            self._unlock_all()
+        return stats
+
+
+if __name__ == "__main__":
+
+    print("\nput / get / remove example 1")
+    print("----------------------------------")
+    m = ConcurrentHashMap(10, hash_function_2, stripes=4)
+    print(m.capacity)
+    for i in range(50):
+        m.put('key' + str(i), i)
+    m.put('key7', 700)
+    m.remove('key8')
+    print(m.size, m.capacity, m.get('key7'), m.get('key8'), m.contains_key('key49'))
+    print(m.get_keys().length(), m.stats()['stripe_counts'])
+
+    print("\nthreads example 1")
+    print("-----------------------")
+    m = ConcurrentHashMap(8, hash_function_2)
+
+    def worker(first: int) -> None:
+        # Each thread puts its own keys, removes half and reads the rest
+        for i in range(first, first + 2000):
+            m.put('key' + str(i), i)
+        for i in range(first, first + 2000, 2):
+            m.remove('key' + str(i))
+        for i in range(first + 1, first + 2000, 2):
+            assert m.get('key' + str(i)) == i
+
+    threads = [threading.Thread(target=worker, args=(n * 2000,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    keys = m.get_keys()
+    print(m.size, keys.length(), m.capacity, m.resizes > 0,
+          all(m.get('key' + str(i)) == (i if i % 2 else None) for i in range(16000)))
+
+    print("\nshrink example 1")
+    print("----------------------")
+    from hash_functions import murmur
+    m = ConcurrentHashMap(16, murmur, stripes=16, min_load=0.25, max_load=1.0)
+    m.resize_table(48)
+    for i in range(20):
+        m.put('key' + str(i), i)
+    for i in range(15):
+        m.remove('key' + str(i))
+    empty = sum(1 for i in range(m.capacity) if m.buckets.get_at_index(i).length() == 0)
+    print(m.capacity, m.capacity % m.stripes == 0, m.empty_buckets() == empty, m.size,
+          all(m.get('key' + str(i)) == (i if i >= 15 else None) for i in range(20)))
@@ -12,16 +12,23 @@
 
 
 from include_file import *
+from hash_batch import hash_many, hash_many_1, hash_many_2
+from probing import QuadraticProbing, LinearProbing, DoubleHashing, RobinHood
+from capacity import DoublingCapacity
+import snapshot
+import streaming
 
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object):
+    def __init__(self, key: str, value: object, hash: int = None):
         """
-        Initializes an entry for use in a hash map
+        Initializes an entry for use in a hash map. hash is the full hash
+        of the key, cached so rehashing never calls the hash function again.
         """
         self.key = key
         self.value = value
+        self.hash = hash
         self.is_tombstone = False
 
     def __str__(self):
@@ -54,11 +61,59 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+# Batch versions used by put_many
+hash_function_1.hash_many = hash_many_1
+hash_function_2.hash_many = hash_many_2
+
+
+# Placeholder left in the old bucket array for an entry an incremental resize
+# has already moved. It is a tombstone so probes of the old array pass over it.
+_MOVED = HashEntry(None, None)
+_MOVED.is_tombstone = True
+
+
 class HashMap:
-    def __init__(self, capacity: int, function) -> None:
+    def __init__(self, capacity: int, function, incremental_step: int = None,
+                 max_occupancy: float = 0.5, probing=None, max_load: float = 0.5, capacity_policy=None) -> None:
         """
         Initialize new HashMap that uses Quadratic Probing for collision resolution
+
+        probing is the probing strategy from the probing module, for example
+        LinearProbing(), DoubleHashing() or RobinHood(). It is
+        the capacity policy's strategy by default.
+
+        capacity_policy is a policy from the capacity module that rounds the
+        capacity and picks the next one when the table grows: PrimeCapacity()
+        or PowerOfTwoCapacity(). DoublingCapacity() (the default) uses the
+        capacity as given and doubles it.
+
+        max_load is the load factor at which put doubles the table (0.5 by
+        default). Quadratic probing only promises to find an open bucket
+        below 0.5, the other strategies can run fuller. max_occupancy can't
+        be lower than max_load.
+
+        If incremental_step is given, the resize done by put when the load
+        factor reaches 0.5 is incremental: the old and new bucket arrays are
+        kept side by side and every get, put, remove and contains_key moves
+        at most that many old buckets into the new array until the migration
+        is done.
+
+        max_occupancy bounds live entries plus tombstones as a fraction of
+        the capacity. When a put finds the table at or over it, the table is
+        rehashed to drop the tombstones: in place at the same capacity if
+        tombstones outnumber live entries, otherwise at twice the capacity.
+        None turns this off, leaving tombstones until the next resize.
         """
+        if incremental_step is not None and incremental_step < 1:
+            raise ValueError("incremental_step must be at least 1")
+        if not 0 < max_load < 1:
+            raise ValueError("max_load must be between 0 and 1")
+        if max_occupancy is not None and not max_load <= max_occupancy < 1:
+            raise ValueError("max_occupancy must be at least max_load and less than 1")
+
+        self.capacity_policy = capacity_policy if capacity_policy is not None else DoublingCapacity()
+        capacity = self.capacity_policy.round(capacity)
+
         self.buckets = DynamicArray()
 
         for _ in range(capacity):
@@ -66,13 +121,38 @@ class HashMap:
 
         self.capacity = capacity
         self.hash_function = function
+        # Hash used for probing, the hash function's result mixed by the capacity policy
+        if self.capacity_policy.mixes is True:
+            mix = self.capacity_policy.mix
+            self._hash = lambda key: mix(function(key))
+        else:
+            self._hash = function
         self.size = 0
+        # Bumped by every change that adds, removes or moves an entry, so the
+        # iterators can tell the hash map changed under them
+        self._version = 0
+        self.incremental_step = incremental_step
+        self.max_occupancy = max_occupancy
+        self.max_load = max_load
+        self.probing = probing if probing is not None else self.capacity_policy.probing()
+        self.tombstones = 0
+        # Longest probe of the current bucket array seen since it was made
+        self.max_probe = 0
+        self.resizes = 0
+        self.compactions = 0
+
+        # Old bucket array while an incremental resize is in progress. Old
+        # buckets below _migrate_index have already been moved.
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._migrate_index = 0
 
     def __str__(self) -> str:
         """
         Overrides object's string method
         Return content of hash map in human-readable form
         """
+        self._finish_migration()
         out = ''
         for i in range(self.buckets.length()):
             out += str(i) + ': ' + str(self.buckets[i]) + '\n'
@@ -87,7 +167,44 @@ class HashMap:
         self.buckets = DynamicArray()
         for i in range(self.capacity):
             self.buckets.append(None)
+        self._old_buckets = None
         self.size = 0
+        self.tombstones = 0
+        self.max_probe = 0
+        self._version += 1
+
+    def _probe(self, key: str, hash: int, old: bool = False) -> tuple:
+        """
+        Takes a key string and its hash and probes the hash map once with
+        the probing strategy. Returns a tuple (index, free, probes) where
+        index is the bucket holding the key (-1 if the key isn't in the hash
+        map), free is the bucket where the key would be inserted (-1 if the
+        probe never reached one) and probes is the number of buckets looked
+        at. If old is True the old bucket array of an incremental resize is
+        probed.
+        """
+        if old is True:
+            return self.probing.probe(self._old_buckets, self._old_capacity, key, hash)
+        result = self.probing.probe(self.buckets, self.capacity, key, hash)
+        if result[2] > self.max_probe:
+            self.max_probe = result[2]
+        return result
+
+    def _find(self, key: str, hash: int) -> HashEntry:
+        """
+        Takes a key string and its hash and returns the live hash entry
+        holding the key, or None if the key isn't in the hash map. While an
+        incremental resize is in progress the old bucket array is searched
+        when the key isn't found in the new one.
+        """
+        index, _, _ = self._probe(key, hash)
+        if index != -1:
+            return self.buckets.get_at_index(index)
+        if self._old_buckets is not None:
+            index, _, _ = self._probe(key, hash, old=True)
+            if index != -1:
+                return self._old_buckets.get_at_index(index)
+        return None
 
     def get(self, key: str) -> object:
         """
@@ -96,22 +213,14 @@ class HashMap:
         exit, None is returned. Uses quadratic probing open-addressing
         scheme for collisions in the table.
         """
-        # Check if key is in table
-        if self.contains_key(key) is False:
+        if self.size == 0:
             return None
+        if self._old_buckets is not None:
+            self._migrate(self.incremental_step)
 
-        # Find initial index and initial hash entry
-        hash = self.hash_function(key)
-        index_initial = hash % self.capacity
-        hash_entry = self.buckets.get_at_index(index_initial)
-
-        # Use quadratic probing to find hash entry with key
-        j = 1
-        while hash_entry.key != key:
-            index = (index_initial + (j ** 2)) % self.capacity
-            j += 1
-            hash_entry = self.buckets.get_at_index(index)
-
+        hash_entry = self._find(key, self._hash(key))
+        if hash_entry is None:
+            return None
         return hash_entry.value
 
     def put(self, key: str, value: object) -> None:
@@ -123,51 +232,81 @@ class HashMap:
         find the next open spot to insert the key/value pair at. This
         method will first take into account the load factor of the hash
         map before inserting a new key/value pair. If the load factor is
-        greater than or equal to 0.5, the hash map is resized to twice
-        its current capacity.
+        greater than or equal to max_load (0.5 by default), the hash map is
+        resized to twice its current capacity.
         """
-        # remember, if the load factor is greater than or equal to 0.5,
-        # resize the table before putting the new key/value pair
+        self._put(key, value, self._hash(key))
 
+    def _put(self, key: str, value: object, hash: int) -> None:
+        """
+        Takes a key string, a value object and the key's probing hash and
+        does the work of put
+        """
         # Resize hash table if needed
-        if self.table_load() >= 0.5:
-            self.put_resize_helper(2 * self.capacity)
-
-        # Check if the key exists in table using quadratic probing
-        hash = self.hash_function(key)
-        index_initial = hash % self.capacity
-        hash_entry = self.buckets.get_at_index(index_initial)
-        j = 1
-        while hash_entry is not None:
-            if hash_entry.is_tombstone is True:
-                index = (index_initial + (j ** 2)) % self.capacity
-                j += 1
-                hash_entry = self.buckets.get_at_index(index)
-            elif hash_entry.key != key:
-                index = (index_initial + (j ** 2)) % self.capacity
-                j += 1
-                hash_entry = self.buckets.get_at_index(index)
-            # Key is found so set new value and return
-            elif hash_entry.key == key:
-                hash_entry.value = value
-                return
+        if self.table_load() >= self.max_load:
+            self._resize(self.capacity_policy.grow(self.capacity))
+        # Too many tombstones, so rehash to drop them. Rehash in place when
+        # they outnumber live entries, otherwise grow.
+        elif (self.max_occupancy is not None
+              and (self.size + self.tombstones) / self.capacity >= self.max_occupancy):
+            if self.tombstones >= self.size:
+                self.compactions += 1
+                self._resize(self.capacity)
+            else:
+                self._resize(self.capacity_policy.grow(self.capacity))
+        elif self._old_buckets is not None:
+            self._migrate(self.incremental_step)
+
+        # Single probe finds either the key or the first open spot for it
+        index, free, _ = self._probe(key, hash)
+        while index == -1 and free == -1:
+            # Probe sequence never reached an open spot, so grow and probe again
+            self.put_resize_helper(self.capacity_policy.grow(self.capacity))
+            index, free, _ = self._probe(key, hash)
+
+        # Key is found so set new value
+        if index != -1:
+            self.buckets.get_at_index(index).value = value
+            return
 
-        # Key doesn't exist so find next open spot using quadratic probing and insert put key/value pair
-        hash_entry = self.buckets.get_at_index(index_initial)
-        new_hash_entry = HashEntry(key, value)
-        index = index_initial
-        j = 1
-        while hash_entry is not None:
-            if hash_entry.is_tombstone is True:
-                self.buckets.set_at_index(index, new_hash_entry)
-                self.size += 1
+        # Key may still be waiting in the old bucket array of a resize
+        if self._old_buckets is not None:
+            old_index, _, _ = self._probe(key, hash, old=True)
+            if old_index != -1:
+                self._old_buckets.get_at_index(old_index).value = value
                 return
-            else:
-                index = (index_initial + (j ** 2)) % self.capacity
-                j += 1
-                hash_entry = self.buckets.get_at_index(index)
-        self.buckets.set_at_index(index, new_hash_entry)
+
+        # Key doesn't exist so insert at the open spot, reusing a tombstone if it is one
+        slot = self.buckets.get_at_index(free)
+        if slot is not None and slot.is_tombstone is True:
+            self.tombstones -= 1
+        self.probing.insert(self.buckets, self.capacity, HashEntry(key, value, hash), free)
         self.size += 1
+        self._version += 1
+
+    def put_many(self, pairs) -> None:
+        """
+        Takes an iterable of (key, value) pairs and puts every pair in the
+        hash map, with the same result as calling put on each pair in order.
+        Keys are hashed in one batch.
+        """
+        pairs = list(pairs)
+        hashes = hash_many(self.hash_function, [pair[0] for pair in pairs])
+        if self.capacity_policy.mixes is True:
+            mix = self.capacity_policy.mix
+            hashes = [mix(hash) for hash in hashes]
+        for (key, value), hash in zip(pairs, hashes):
+            self._put(key, value, hash)
+
+    def _resize(self, new_capacity: int) -> None:
+        """
+        Takes a new capacity integer and rehashes the hash map to it, as an
+        incremental resize if incremental_step is set
+        """
+        if self.incremental_step is None:
+            self.put_resize_helper(new_capacity)
+        else:
+            self._start_resize(new_capacity)
 
     def put_resize_helper(self, new_capacity: int) -> None:
         """
@@ -181,34 +320,99 @@ class HashMap:
         # Don't resize if new capacity less than 1 or less than current size
         if new_capacity < 1 or new_capacity < self.size:
             return
+        new_capacity = self.capacity_policy.round(new_capacity)
 
-        # Create new buckets DynamicArray to new capacity and populate with None
-        new_buckets = DynamicArray()
-        for i in range(new_capacity):
-            new_buckets.append(None)
-
-        # Iterate through hash map until a non-deleted value and isn't None is reached
+        # Collect hash entries that aren't None and aren't deleted, including
+        # the ones an incremental resize hasn't moved yet
+        hash_entries = []
         for i in range(self.buckets.length()):
             hash_entry = self.buckets.get_at_index(i)
-            if hash_entry is not None:
-                if hash_entry.is_tombstone is True:
-                    continue
-                # Rehash value using quadratic probing and place in new buckets
-                else:
-                    hash = self.hash_function(hash_entry.key)
-                    index_initial = hash % new_capacity
-                    some_hash = new_buckets.get_at_index(index_initial)
-                    index = index_initial
-                    j = 1
-                    while some_hash is not None:
-                        index = (index_initial + (j ** 2)) % new_capacity
-                        j += 1
-                        some_hash = new_buckets.get_at_index(index)
-                    new_buckets.set_at_index(index, hash_entry)
+            if hash_entry is not None and hash_entry.is_tombstone is False:
+                hash_entries.append(hash_entry)
+        if self._old_buckets is not None:
+            for i in range(self._migrate_index, self._old_capacity):
+                hash_entry = self._old_buckets.get_at_index(i)
+                if hash_entry is not None and hash_entry.is_tombstone is False:
+                    hash_entries.append(hash_entry)
+            self._old_buckets = None
+
+        # Place entries in new buckets using the probing strategy and their
+        # cached hashes. If an entry's probe sequence is full the capacity is
+        # grown and placing restarts.
+        placed = False
+        while placed is False:
+            new_buckets = DynamicArray([None] * new_capacity)
+
+            placed = True
+            for hash_entry in hash_entries:
+                if self.probing.place(new_buckets, new_capacity, hash_entry) is False:
+                    placed = False
+                    new_capacity = self.capacity_policy.grow(new_capacity)
+                    break
 
         # Set current buckets to new buckets and current capacity to new capacity
         self.buckets = new_buckets
         self.capacity = new_capacity
+        self.tombstones = 0
+        self.max_probe = 0
+        self.resizes += 1
+        self._version += 1
+
+    def _start_resize(self, new_capacity: int) -> None:
+        """
+        Takes an integer for a new capacity and starts an incremental resize.
+        The current buckets become the old buckets and an empty bucket array
+        of the new capacity takes their place. Entries are moved later by
+        _migrate, a few buckets at a time.
+        """
+        self._finish_migration()
+
+        new_buckets = DynamicArray([None] * new_capacity)
+
+        self._old_buckets = self.buckets
+        self._old_capacity = self.capacity
+        self._migrate_index = 0
+        self.buckets = new_buckets
+        self.capacity = new_capacity
+        self.tombstones = 0
+        self.max_probe = 0
+        self.resizes += 1
+        self._version += 1
+
+    def _migrate(self, steps: int) -> None:
+        """
+        Takes an integer number of steps and moves the entries of that many
+        buckets from the old bucket array into the new one. A moved entry is
+        replaced by a tombstone so probing the old array still works. Once
+        every old bucket has been moved the old bucket array is dropped.
+        """
+        stop = min(self._migrate_index + steps, self._old_capacity)
+        for i in range(self._migrate_index, stop):
+            hash_entry = self._old_buckets.get_at_index(i)
+            if hash_entry is None or hash_entry.is_tombstone is True:
+                continue
+            _, free, _ = self._probe(hash_entry.key, hash_entry.hash)
+            if free == -1:
+                # New array can't take the entry, so finish with a full resize
+                self.put_resize_helper(self.capacity_policy.grow(self.capacity))
+                return
+            slot = self.buckets.get_at_index(free)
+            if slot is not None and slot.is_tombstone is True:
+                self.tombstones -= 1
+            self.probing.insert(self.buckets, self.capacity, hash_entry, free)
+            self._old_buckets.set_at_index(i, _MOVED)
+
+        self._migrate_index = stop
+        if stop == self._old_capacity:
+            self._old_buckets = None
+
+    def _finish_migration(self) -> None:
+        """
+        Takes no parameters and moves every remaining old bucket into the
+        new bucket array if an incremental resize is in progress
+        """
+        if self._old_buckets is not None:
+            self._migrate(self._old_capacity)
 
     def remove(self, key: str) -> None:
         """
@@ -221,28 +425,30 @@ class HashMap:
         anything. Quadratic probing open-addressing scheme is used to
         remove any key/value pairs from the hash map.
         """
-        # Check if key exists in table
-        if self.contains_key(key) is False:
+        if self.size == 0:
+            return
+        if self._old_buckets is not None:
+            self._migrate(self.incremental_step)
+
+        hash = self._hash(key)
+        index, _, _ = self._probe(key, hash)
+        if index != -1:
+            # Once key is found, delete it with the probing strategy, which
+            # either leaves a tombstone (counted) or shifts entries back
+            if self.probing.delete(self.buckets, self.capacity, index) is True:
+                self.tombstones += 1
+        elif self._old_buckets is not None:
+            # Key may still be in the old bucket array, which is dropped once
+            # the migration is done, so its tombstones aren't counted
+            index, _, _ = self._probe(key, hash, old=True)
+            if index == -1:
+                return
+            self._old_buckets.get_at_index(index).is_tombstone = True
+        else:
             return
 
-        # Find initial key index and retrieve initial hash entry
-        hash = self.hash_function(key)
-        index_initial = hash % self.capacity
-        hash_entry = self.buckets.get_at_index(index_initial)
-
-        # Find hash entry that matches key using quadratic probing
-        j = 1
-        while hash_entry is not None:
-            if hash_entry.is_tombstone is True or hash_entry.key != key:
-                index = (index_initial + (j ** 2)) % self.capacity
-                j += 1
-                hash_entry = self.buckets.get_at_index(index)
-            else:
-                break
-
-        # Once key is found, set hash entry to tombstone and decrement size
-        hash_entry.is_tombstone = True
         self.size -= 1
+        self._version += 1
 
     def contains_key(self, key: str) -> bool:
         """
@@ -251,65 +457,57 @@ class HashMap:
         open-addressing scheme is used to resolve collisions and search
         for the key in the hash map.
         """
-        # Check if the hash table is empty
-        flag = 0
-        for i in range(self.buckets.length()):
-            hash_entry = self.buckets.get_at_index(i)
-            if hash_entry is not None:
-                if hash_entry.is_tombstone is True:
-                    continue
-                else:
-                    flag = 1
-                    break
-        if flag == 0:
+        if self.size == 0:
             return False
+        if self._old_buckets is not None:
+            self._migrate(self.incremental_step)
 
-        # Find initial index of key in table and retrieve the hash entry
-        hash = self.hash_function(key)
-        index_initial = hash % self.capacity
-        hash_entry = self.buckets.get_at_index(index_initial)
-
-        # Check if hash entry key matches key, if not go to next hash entry (uses quadratic probing)
-        flag = 0
-        j = 1
-        while hash_entry is not None:
-            if hash_entry.is_tombstone is True:
-                index = (index_initial + (j ** 2)) % self.capacity
-                j += 1
-                hash_entry = self.buckets.get_at_index(index)
-            else:
-                if hash_entry.key == key:
-                    flag = 1
-                    break
-                else:
-                    index = (index_initial + (j ** 2)) % self.capacity
-                    j += 1
-                    hash_entry = self.buckets.get_at_index(index)
-
-        # Flag is set if key was found so return True, otherwise False
-        if flag == 1:
-            return True
-        else:
-            return False
+        return self._find(key, self._hash(key)) is not None
+
+    def probe_length(self, key: str) -> int:
+        """
+        Takes a key string as a parameter and returns the number of buckets
+        a lookup of that key looks at before it finds the key or an empty
+        bucket. Used to measure how long probe sequences are.
+        """
+        _, _, probes = self._probe(key, self._hash(key))
+        return probes
+
+    def stats(self) -> dict:
+        """
+        Takes no parameters and returns a dict describing the hash map:
+        its size, capacity, load factor, empty buckets, tombstone count,
+        occupancy (live entries plus tombstones over capacity), the longest
+        probe seen since the last resize, the number of rehashes and how
+        many of those were in-place compactions. Every value is kept up to
+        date as the hash map changes, so this doesn't walk the buckets.
+        max_probe_length is approximate: it only covers probes that were
+        done, and a resize starts it again from 0.
+        """
+        return {
+            'size': self.size,
+            'capacity': self.capacity,
+            'table_load': self.table_load(),
+            'empty_buckets': self.capacity - self.size,
+            'tombstones': self.tombstones,
+            'occupancy': (self.size + self.tombstones) / self.capacity,
+            'max_load': self.max_load,
+            'max_occupancy': self.max_occupancy,
+            'max_probe_length': self.max_probe,
+            'resizes': self.resizes,
+            'compactions': self.compactions,
+        }
 
     def empty_buckets(self) -> int:
         """
         Takes no parameters and returns an integer value that is equal
         to the number of empty buckets in the hash map. A bucket is
-        considered empty if the hash entry is None or is a tombstone.
+        considered empty if the hash entry is None or is a tombstone, so
+        every bucket without a live entry is empty and no bucket needs to
+        be walked.
         """
-        empty_bucket_count = 0
-
-        # Iterate through hash map and increment count only if value is None or entry is tombstone
-        for i in range(self.buckets.length()):
-            hash_entry = self.buckets.get_at_index(i)
-            if hash_entry is None:
-                empty_bucket_count += 1
-            else:
-                if hash_entry.is_tombstone is True:
-                    empty_bucket_count += 1
-
-        return empty_bucket_count
+        self._finish_migration()
+        return self.capacity - self.size
 
     def table_load(self) -> float:
         """
@@ -336,26 +534,23 @@ class HashMap:
         if new_capacity < 1 or new_capacity < self.size:
             return
 
-        new_hash_map = HashMap(new_capacity, self.hash_function)
-
-        # Iterate through hash map and rehash non-deleted values into new hash map
-        for i in range(self.buckets.length()):
-            hash_entry = self.buckets.get_at_index(i)
-            if hash_entry is not None:
-                if hash_entry.is_tombstone is True:
-                    continue
-                else:
-                    new_hash_map.put(hash_entry.key, hash_entry.value)
+        # Putting the entries one by one into a table of new_capacity would
+        # double it whenever the load reached max_load before an insert, so
+        # find that final capacity up front
+        new_capacity = self.capacity_policy.round(new_capacity)
+        if self.size > 0:
+            while (self.size - 1) / new_capacity >= self.max_load:
+                new_capacity = self.capacity_policy.grow(new_capacity)
 
-        # Set current hash map buckets and capacity to new hash map buckets and capacity
-        self.buckets = new_hash_map.buckets
-        self.capacity = new_hash_map.capacity
+        # Rehash non-deleted entries into the new table using their cached hashes
+        self.put_resize_helper(new_capacity)
 
     def get_keys(self) -> DynamicArray:
         """
         Takes no parameters and returns a DynamicArray which includes
         all of the keys from the hash map appended to it.
         """
+        self._finish_migration()
         keys_da = DynamicArray()
 
         # Append keys from hash entries that aren't None or tombstones into keys DA
@@ -366,6 +561,95 @@ class HashMap:
 
         return keys_da
 
+    def _live_entries(self):
+        """
+        Takes no parameters and yields every live hash entry in the hash
+        map, straight from the buckets. Raises RuntimeError if the hash map
+        gains, loses or moves an entry before the iteration is done, which
+        includes a put that resizes the table.
+        """
+        self._finish_migration()
+        version = self._version
+        for hash_entry in self.buckets:
+            if hash_entry is not None and hash_entry.is_tombstone is False:
+                yield hash_entry
+                if self._version != version:
+                    raise RuntimeError("HashMap changed during iteration")
+
+    def keys(self):
+        """
+        Takes no parameters and returns a generator over the keys in the
+        hash map, in bucket order, without copying them
+        """
+        return (hash_entry.key for hash_entry in self._live_entries())
+
+    def values(self):
+        """
+        Takes no parameters and returns a generator over the values in the
+        hash map, in bucket order, without copying them
+        """
+        return (hash_entry.value for hash_entry in self._live_entries())
+
+    def items(self):
+        """
+        Takes no parameters and returns a generator over the (key, value)
+        pairs in the hash map, in bucket order, without copying them
+        """
+        return ((hash_entry.key, hash_entry.value) for hash_entry in self._live_entries())
+
+    def __iter__(self):
+        """ Iterate over the keys, the same as keys() """
+        return self.keys()
+
+    def chunks(self, size: int):
+        """
+        Takes a page size and yields lists of up to that many (key, value)
+        pairs until every pair in the hash map has been yielded
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        chunk = []
+        for hash_entry in self._live_entries():
+            chunk.append((hash_entry.key, hash_entry.value))
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _entries(self):
+        """
+        Takes no parameters and yields a (key, value, hash) tuple for every
+        live entry in the hash map, where hash is the hash function's result
+        before any mixing by the capacity policy
+        """
+        mixes = self.capacity_policy.mixes
+        for hash_entry in self._live_entries():
+            hash = self.hash_function(hash_entry.key) if mixes is True else hash_entry.hash
+            yield hash_entry.key, hash_entry.value, hash
+
+    def save(self, path: str) -> None:
+        """
+        Takes a file path and writes a snapshot of the hash map there, which
+        snapshot.load(path, function) maps back as a read-only map
+        """
+        snapshot.save(self._entries(), path)
+
+    def reserve(self, count: int) -> None:
+        """
+        Takes an expected number of entries and resizes the table once, if
+        needed, so that many entries can be put without another resize. The
+        table never shrinks here.
+        """
+        new_capacity = self.capacity
+        while count > 0 and (count - 1) / new_capacity >= self.max_load:
+            new_capacity = self.capacity_policy.grow(new_capacity)
+        if new_capacity != self.capacity:
+            self._resize(new_capacity)
+
+    from_iterable = classmethod(streaming.from_iterable)
+    from_file = classmethod(streaming.from_file)
+
 
 if __name__ == "__main__":
 
@@ -548,3 +832,93 @@ if __name__ == "__main__":
     m.remove('100')
     m.resize_table(2)
     print(m.get_keys())
+
+    print("\nprobing strategies example 1")
+    print("----------------------------------")
+    for probing in (QuadraticProbing(), LinearProbing(), DoubleHashing(), RobinHood()):
+        m = HashMap(11, hash_function_1, probing=probing)
+        keys = [i for i in range(1, 1000, 13)]
+        for key in keys:
+            m.put(str(key), key * 42)
+        for key in keys[::3]:
+            m.remove(str(key))
+        result = True
+        for index, key in enumerate(keys):
+            result &= m.get(str(key)) == (None if index % 3 == 0 else key * 42)
+            result &= not m.contains_key(str(key + 1))
+        print(type(probing).__name__, result, m.size, m.capacity, m.tombstones)
+
+    calls = []
+
+    def counted_hash(key: str) -> int:
+        calls.append(key)
+        return hash_function_2(key)
+
+    m = HashMap(11, counted_hash, probing=DoubleHashing())
+    for i in range(200):
+        m.put(str(i), i)
+    hashed = len(calls)
+    m.resize_table(1000)
+    # Resizes place entries by their cached hashes, the step included
+    print(hashed, len(calls) == hashed, m.capacity, all(m.get(str(i)) == i for i in range(200)))
+
+    print("\nput_many example 1")
+    print("------------------------")
+    from capacity import PowerOfTwoCapacity
+
+    pairs = [('key' + str(i % 700), i) for i in range(1000)]
+    for options in {}, {'capacity_policy': PowerOfTwoCapacity()}, {'incremental_step': 4}:
+        m = HashMap(8, hash_function_2, **options)
+        m.put_many(pairs)
+        expected = HashMap(8, hash_function_2, **options)
+        for key, value in pairs:
+            expected.put(key, value)
+        print(m.size, sorted(m.items()) == sorted(expected.items()), m.capacity == expected.capacity)
+
+    print("\nkeys / values / items / chunks example 1")
+    print("----------------------------------------------")
+    m = HashMap(20, hash_function_2)
+    for i in range(25):
+        m.put('key' + str(i), i)
+    print(sorted(m.keys()) == sorted(m.get_keys()), sum(m.values()), len(list(m.items())), 'key7' in list(m))
+    print([len(chunk) for chunk in m.chunks(10)])
+    try:
+        for key in m:
+            m.remove(key)
+    except RuntimeError as error:
+        print(error, m.size)
+
+    print("\noccupancy recount example 1")
+    print("---------------------------------")
+
+    def recount(m) -> tuple:
+        # Walk every bucket, the way empty_buckets used to
+        entries = [m.buckets.get_at_index(i) for i in range(m.buckets.length())]
+        tombstones = sum(1 for entry in entries if entry is not None and entry.is_tombstone is True)
+        live = [entry.key for entry in entries if entry is not None and entry.is_tombstone is False]
+        return len(entries) - len(live), tombstones, max([m.probe_length(key) for key in live], default=0)
+
+    import random
+    rng = random.Random(21)
+    result = True
+    for options in ({}, {'incremental_step': 2}, {'probing': RobinHood(), 'max_load': 0.8, 'max_occupancy': 0.9}):
+        m = HashMap(7, hash_function_2, **options)
+        for step in range(3000):
+            key = 'key' + str(rng.randrange(300))
+            roll = rng.random()
+            if roll < 0.5:
+                m.put(key, step)
+            elif roll < 0.99:
+                m.remove(key)
+            elif roll < 0.997:
+                m.resize_table(rng.randrange(1, 200))
+            else:
+                m.clear()
+            if step % 50 == 0:
+                empty = m.empty_buckets()
+                stats = m.stats()
+                empty_count, tombstones, max_probe = recount(m)
+                result &= (empty, stats['tombstones']) == (empty_count, tombstones)
+                # Looking every key up sets max_probe_length to at least the true maximum
+                result &= m.stats()['max_probe_length'] >= max_probe
+    print(result)
@@ -1,11 +1,17 @@
+import bisect
+
+
 class SLNode:
-    def __init__(self, key: str, value: object) -> None:
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
         """
         Singly Linked List Node class
+        hash is the full hash of the key, cached so it never has to be
+        computed again (None if the list is used without hashes)
         """
         self.next = None
         self.key = key
         self.value = value
+        self.hash = hash
 
     def __str__(self):
         """ Return content of the node in human-readable form """
@@ -34,21 +40,25 @@ class LinkedList:
                 cur = cur.next
         return 'SLL [' + content + ']'
 
-    def insert(self, key: str, value: object) -> None:
+    def insert(self, key: str, value: object, hash: int = None) -> None:
         """ Insert new node at the beginning of the list """
-        new_node = SLNode(key, value)
+        self.insert_node(SLNode(key, value, hash))
+
+    def insert_node(self, new_node: SLNode) -> None:
+        """ Insert an existing node at the beginning of the list """
         new_node.next = self.head
         self.head = new_node
         self.size = self.size + 1
 
-    def remove(self, key: str) -> bool:
+    def remove(self, key: str, hash: int = None) -> bool:
         """
         Remove first node with matching key
+        If hash is given, cached node hashes are compared before keys
         Return True is some node was removed, False otherwise
         """
         prev, cur = None, self.head
         while cur is not None:
-            if cur.key == key:
+            if (hash is None or cur.hash == hash) and cur.key == key:
                 if prev:
                     prev.next = cur.next
                 else:
@@ -58,12 +68,39 @@ class LinkedList:
             prev, cur = cur, cur.next
         return False
 
-    def contains(self, key: str) -> SLNode:
+    def remove_keys(self, keys: set) -> set:
+        """
+        Remove every node whose key is in the given set in a single pass
+        Return the set of keys that were removed
+        """
+        removed = set()
+        prev, cur = None, self.head
+        while cur is not None:
+            if cur.key in keys and cur.key not in removed:
+                if prev:
+                    prev.next = cur.next
+                else:
+                    self.head = cur.next
+                self.size -= 1
+                removed.add(cur.key)
+            else:
+                prev = cur
+            cur = cur.next
+        return removed
+
+    def contains(self, key: str, hash: int = None) -> SLNode:
         """
         If node with matching key in the list -> return pointer
         to that node (SLNode), otherwise return None
+        If hash is given, cached node hashes are compared before keys
         """
         cur = self.head
+        if hash is not None:
+            while cur is not None:
+                if cur.hash == hash and cur.key == key:
+                    return cur
+                cur = cur.next
+            return cur
         while cur is not None:
             if cur.key == key:
                 return cur
@@ -88,6 +125,110 @@ class LinkedList:
             cur = cur.next
 
 
+class SortedChain:
+    """
+    Class implementing a bucket chain kept sorted by (hash, key)
+    Same methods as LinkedList, but contains and remove find a node
+    with a binary search, so a long chain costs O(log k) per lookup
+    Nodes must have hashes and keys of one comparable type
+    """
+
+    def __init__(self, nodes=()) -> None:
+        """ Init new chain holding the given nodes """
+        nodes = sorted(nodes, key=lambda node: (node.hash, node.key))
+        for node in nodes:
+            node.next = None
+        self._keys = [(node.hash, node.key) for node in nodes]
+        self._nodes = nodes
+        self.size = len(nodes)
+
+    def __str__(self) -> str:
+        """ Return content of the chain in human-readable form """
+        return 'SortedChain [' + ' -> '.join(str(node) for node in self._nodes) + ']'
+
+    def to_linked_list(self) -> LinkedList:
+        """ Return a LinkedList holding the same nodes in the same order """
+        linked_list = LinkedList()
+        for node in reversed(self._nodes):
+            linked_list.insert_node(node)
+        return linked_list
+
+    def insert(self, key: str, value: object, hash: int) -> None:
+        """ Insert new node in sorted position """
+        self.insert_node(SLNode(key, value, hash))
+
+    def insert_node(self, new_node: SLNode) -> None:
+        """ Insert an existing node in sorted position """
+        sort_key = (new_node.hash, new_node.key)
+        index = bisect.bisect_left(self._keys, sort_key)
+        new_node.next = None
+        self._keys.insert(index, sort_key)
+        self._nodes.insert(index, new_node)
+        self.size += 1
+
+    def _index(self, key: str, hash: int) -> int:
+        """ Return the position of the node with matching key or -1 """
+        if hash is None:
+            for index, node in enumerate(self._nodes):
+                if node.key == key:
+                    return index
+            return -1
+        sort_key = (hash, key)
+        index = bisect.bisect_left(self._keys, sort_key)
+        if index < self.size and self._keys[index] == sort_key:
+            return index
+        return -1
+
+    def remove(self, key: str, hash: int = None) -> bool:
+        """
+        Remove node with matching key
+        Return True is some node was removed, False otherwise
+        """
+        index = self._index(key, hash)
+        if index == -1:
+            return False
+        del self._keys[index]
+        del self._nodes[index]
+        self.size -= 1
+        return True
+
+    def remove_keys(self, keys: set) -> set:
+        """
+        Remove every node whose key is in the given set in a single pass
+        Return the set of keys that were removed
+        """
+        removed = set()
+        kept = []
+        for node in self._nodes:
+            if node.key in keys and node.key not in removed:
+                removed.add(node.key)
+            else:
+                kept.append(node)
+        if removed:
+            self._keys = [(node.hash, node.key) for node in kept]
+            self._nodes = kept
+            self.size = len(kept)
+        return removed
+
+    def contains(self, key: str, hash: int = None) -> SLNode:
+        """
+        If node with matching key in the chain -> return pointer
+        to that node (SLNode), otherwise return None
+        """
+        index = self._index(key, hash)
+        if index == -1:
+            return None
+        return self._nodes[index]
+
+    def length(self) -> int:
+        """ Return the length of the chain """
+        return self.size
+
+    def __iter__(self) -> SLNode:
+        """ Iterate over the nodes in sorted order """
+        return iter(self._nodes)
+
+
 class DynamicArrayException(Exception):
     pass
 
@@ -105,17 +246,12 @@ class DynamicArray:
 
     def __iter__(self):
         """
-        Disable iterator capability for DynamicArray class
-        This means loops and aggregate functions like
-        those shown below won't work:
-
-        arr = StaticArray()
-        for value in arr:     # will not work
-        min(arr)              # will not work
-        max(arr)              # will not work
-        sort(arr)             # will not work
+        Iterate over the elements in index order, without copying them
+        EXAMPLE:
+            for value in arr:
+                print(value)
         """
-        return None
+        return iter(self.data)
 
     def __str__(self) -> str:
         """ Return content of dynamic array in human-readable form """
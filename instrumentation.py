@@ -0,0 +1,368 @@
+# Description: Optional instrumentation for the chaining and open addressing HashMaps. enable(m) switches the map
+#              to an instrumented subclass of its own class that counts every operation, records the chain length
+#              (chaining) or probe length (open addressing) of every lookup in a histogram, counts the tombstones
+#              probes pass over and times every resize along with how many entries it moved. disable(m) switches
+#              the map back. The plain HashMap classes are never changed, so a map that isn't instrumented pays
+#              nothing. m.instrumentation.snapshot() returns the numbers as a dict, and hooks registered with
+#              add_hook are called as events happen, to forward them to a metrics system. Counting isn't locked,
+#              so on a ConcurrentHashMap used by several threads the numbers are approximate.
+
+
+import collections
+import threading
+import time
+
+import hash_map_chaining
+import hash_map_open_addressing
+
+
+# Resize events kept for the snapshot, the oldest are dropped first
+RESIZE_HISTORY = 100
+
+
+class Histogram:
+    """
+    Histogram of non-negative integers, with the count of every value seen
+    """
+
+    def __init__(self) -> None:
+        self.counts = collections.Counter()
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        """
+        Takes an integer and adds it to the histogram
+        """
+        self.counts[value] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> int:
+        """
+        Takes a percentile between 0 and 100 and returns the smallest value
+        that at least that share of the recorded values are at or under, or
+        0 if nothing was recorded
+        """
+        target = q / 100 * self.count
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if seen >= target:
+                return value
+        return 0
+
+    def snapshot(self) -> dict:
+        """
+        Takes no parameters and returns a dict with the count, mean, p50,
+        p99 and max of the values, and the count of every value
+        """
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self.max,
+            'counts': dict(sorted(self.counts.items())),
+        }
+
+
+class Instrumentation:
+    """
+    Counters and histograms of an instrumented HashMap, and the hooks to
+    call as events happen. The events are 'operation', called with the
+    operation's name, 'lookup', called with the chain or probe length of a
+    lookup, and 'resize', called with a dict describing the resize.
+    """
+
+    EVENTS = ('operation', 'lookup', 'resize')
+
+    def __init__(self) -> None:
+        self.hooks = {event: [] for event in self.EVENTS}
+        # Depth of nested operations on each thread, only the outermost is measured
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Takes no parameters and sets every counter back to zero. Hooks are
+        kept.
+        """
+        self.operations = collections.Counter()
+        self.lookups = Histogram()
+        self.tombstones_seen = 0
+        self.resize_count = 0
+        self.resize_seconds = 0.0
+        self.max_resize_seconds = 0.0
+        self.items_moved = 0
+        self.resize_events = collections.deque(maxlen=RESIZE_HISTORY)
+
+    def add_hook(self, event: str, callback) -> None:
+        """
+        Takes an event name and a function and calls the function with the
+        event's value every time the event happens
+        """
+        if event not in self.hooks:
+            raise ValueError("event must be one of " + ', '.join(self.EVENTS))
+        self.hooks[event].append(callback)
+
+    def remove_hook(self, event: str, callback) -> None:
+        """
+        Takes an event name and a function added with add_hook and stops
+        calling it
+        """
+        self.hooks[event].remove(callback)
+
+    def _operation(self, name: str) -> None:
+        self.operations[name] += 1
+        for callback in self.hooks['operation']:
+            callback(name)
+
+    def _lookup(self, length: int) -> None:
+        self.lookups.record(length)
+        for callback in self.hooks['lookup']:
+            callback(length)
+
+    def _resize(self, event: dict) -> None:
+        self.resize_count += 1
+        self.resize_seconds += event['seconds']
+        self.max_resize_seconds = max(self.max_resize_seconds, event['seconds'])
+        self.items_moved += event['items']
+        self.resize_events.append(event)
+        for callback in self.hooks['resize']:
+            callback(event)
+
+    def snapshot(self) -> dict:
+        """
+        Takes no parameters and returns a dict with every counter: the
+        number of each operation, the lookup length histogram, the
+        tombstones seen, the resize count, total and longest resize time,
+        the entries moved by resizes and the most recent resize events
+        """
+        return {
+            'operations': dict(self.operations),
+            'lookups': self.lookups.snapshot(),
+            'tombstones_seen': self.tombstones_seen,
+            'resizes': self.resize_count,
+            'resize_seconds': self.resize_seconds,
+            'max_resize_seconds': self.max_resize_seconds,
+            'items_moved': self.items_moved,
+            'resize_events': list(self.resize_events),
+        }
+
+
+class _InstrumentedOperations:
+    """
+    Placed in front of a HashMap class by enable. Counts the public
+    operations and times those that resize the table.
+    """
+
+    def _measure(self, name: str, method, *args):
+        """
+        Takes an operation name, a bound method of the HashMap class and
+        its arguments, calls the method and returns its result. A change in
+        the resize count means the call resized the table, so the call's
+        duration is recorded as the resize's. Operations called by another
+        operation, like the resize_table of a put's load policy, are part
+        of the outer one and aren't counted again.
+        """
+        instrumentation = self.instrumentation
+        local = instrumentation._local
+        depth = getattr(local, 'depth', 0)
+        if depth > 0:
+            return method(*args)
+        instrumentation._operation(name)
+        resizes, capacity, size = self.resizes, self.capacity, self.size
+        local.depth = 1
+        start = time.perf_counter()
+        try:
+            result = method(*args)
+        finally:
+            local.depth = 0
+        if self.resizes != resizes:
+            instrumentation._resize({
+                'operation': name,
+                'old_capacity': capacity,
+                'new_capacity': self.capacity,
+                'items': size,
+                'seconds': time.perf_counter() - start,
+                'incremental': self.incremental_step is not None and name != 'resize_table',
+            })
+        return result
+
+    def get(self, key: str) -> object:
+        return self._measure('get', super().get, key)
+
+    def put(self, key: str, value: object) -> None:
+        return self._measure('put', super().put, key, value)
+
+    def remove(self, key: str) -> None:
+        return self._measure('remove', super().remove, key)
+
+    def contains_key(self, key: str) -> bool:
+        return self._measure('contains_key', super().contains_key, key)
+
+    def resize_table(self, new_capacity: int) -> None:
+        return self._measure('resize_table', super().resize_table, new_capacity)
+
+    def clear(self) -> None:
+        return self._measure('clear', super().clear)
+
+
+class _InstrumentedChaining(_InstrumentedOperations):
+    """
+    Instrumentation of the chaining HashMap: every lookup records the
+    length of the chain it searched
+    """
+
+    def _find(self, key: str, hash: int) -> tuple:
+        linked_list, node = super()._find(key, hash)
+        self.instrumentation._lookup(linked_list.length())
+        return linked_list, node
+
+    def put_many(self, pairs) -> None:
+        return self._measure('put_many', super().put_many, pairs)
+
+    def get_many(self, keys) -> list:
+        return self._measure('get_many', super().get_many, keys)
+
+    def remove_many(self, keys) -> list:
+        return self._measure('remove_many', super().remove_many, keys)
+
+    def get_node(self, key: str):
+        return self._measure('get_node', super().get_node, key)
+
+    def put_node(self, node):
+        return self._measure('put_node', super().put_node, node)
+
+    def remove_node(self, node) -> bool:
+        return self._measure('remove_node', super().remove_node, node)
+
+
+class _InstrumentedOpenAddressing(_InstrumentedOperations):
+    """
+    Instrumentation of the open addressing HashMap: every probe records how
+    many buckets it looked at and counts the tombstones among them
+    """
+
+    def _probe(self, key: str, hash: int, old: bool = False) -> tuple:
+        index, free, probes = super()._probe(key, hash, old)
+        instrumentation = self.instrumentation
+        instrumentation._lookup(probes)
+        if self.tombstones > 0 and old is False and self.probing.uses_tombstones is True:
+            instrumentation.tombstones_seen += self._count_tombstones(key, hash, probes)
+        return index, free, probes
+
+    def put_many(self, pairs) -> None:
+        return self._measure('put_many', super().put_many, pairs)
+
+    def _count_tombstones(self, key: str, hash: int, probes: int) -> int:
+        """
+        Takes a key, its hash and a probe length and walks the key's probe
+        sequence again for that many buckets, returning the number of
+        tombstones on the way. Only done while the table has tombstones.
+        """
+        probing, buckets, capacity = self.probing, self.buckets, self.capacity
+        index_initial = probing.home(hash, capacity)
+        step = probing.step(hash, capacity)
+        index = index_initial
+        count = 0
+        for j in range(1, probes + 1):
+            hash_entry = buckets.get_at_index(index)
+            if hash_entry is not None and hash_entry.is_tombstone is True:
+                count += 1
+            index = probing.next_index(index_initial, j, step, capacity)
+        return count
+
+
+# Instrumented subclass of each HashMap class, made the first time it is needed
+_classes = {}
+
+
+def _instrumented_class(cls):
+    """
+    Takes a HashMap class and returns its instrumented subclass
+    """
+    if cls not in _classes:
+        if issubclass(cls, hash_map_chaining.HashMap):
+            mixin = _InstrumentedChaining
+        elif issubclass(cls, hash_map_open_addressing.HashMap):
+            mixin = _InstrumentedOpenAddressing
+        else:
+            raise TypeError("only the chaining and open addressing HashMaps can be instrumented")
+        _classes[cls] = type('Instrumented' + cls.__name__, (mixin, cls), {'_plain_class': cls})
+    return _classes[cls]
+
+
+def enable(m) -> Instrumentation:
+    """
+    Takes a chaining or open addressing HashMap (or a subclass of one),
+    starts instrumenting it and returns its Instrumentation, also kept in
+    m.instrumentation. Calling it again on an instrumented map returns the
+    existing Instrumentation.
+    """
+    if isinstance(m, _InstrumentedOperations):
+        return m.instrumentation
+    instrumented = _instrumented_class(m.__class__)
+    m.instrumentation = Instrumentation()
+    m.__class__ = instrumented
+    return m.instrumentation
+
+
+def disable(m) -> Instrumentation:
+    """
+    Takes an instrumented HashMap, stops instrumenting it and returns its
+    Instrumentation with the final numbers. Does nothing and returns None
+    for a map that isn't instrumented.
+    """
+    if not isinstance(m, _InstrumentedOperations):
+        return None
+    m.__class__ = m._plain_class
+    instrumentation = m.instrumentation
+    del m.instrumentation
+    return instrumentation
+
+
+if __name__ == "__main__":
+    from hash_map_concurrent import ConcurrentHashMap
+
+    print("\nchaining example 1")
+    print("------------------------")
+    m = hash_map_chaining.HashMap(8, hash_map_chaining.hash_function_1, max_load=1.0)
+    stats = enable(m)
+    events = []
+    stats.add_hook('resize', events.append)
+    for i in range(200):
+        m.put('key' + str(i), i)
+    m.get('key7')
+    m.remove('key8')
+    snapshot = stats.snapshot()
+    print(snapshot['operations'], snapshot['resizes'], snapshot['items_moved'], len(events))
+    print(snapshot['lookups']['count'], snapshot['lookups']['max'] >= snapshot['lookups']['p50'])
+    print(type(m).__name__, m.get('key9'), m.size)
+    disable(m)
+    print(type(m).__name__, hasattr(m, 'instrumentation'), m.get('key9'))
+
+    print("\nopen addressing example 1")
+    print("-------------------------------")
+    m = hash_map_open_addressing.HashMap(11, hash_map_open_addressing.hash_function_2)
+    stats = enable(m)
+    for i in range(100):
+        m.put('key' + str(i), i)
+    for i in range(0, 100, 2):
+        m.remove('key' + str(i))
+    for i in range(100):
+        m.contains_key('key' + str(i))
+    snapshot = stats.snapshot()
+    print(snapshot['operations'], snapshot['resizes'], snapshot['tombstones_seen'] > 0)
+    print(snapshot['lookups']['count'], snapshot['lookups']['max'], snapshot['resize_events'][-1]['new_capacity'])
+
+    print("\nconcurrent example 1")
+    print("--------------------------")
+    m = ConcurrentHashMap(8, hash_map_chaining.hash_function_2, stripes=4)
+    stats = enable(m)
+    m.put_many(('key' + str(i), i) for i in range(100))
+    print(stats.snapshot()['operations'], stats.resize_count, m.get('key42'), m.size)
@@ -0,0 +1,220 @@
+# Description: A memoize decorator that caches a function's results in an LRUCache or LFUCache, so the results live in
+#              a chaining HashMap hashed with one of this project's hash functions, can be instrumented and are
+#              evicted by the chosen policy. The cache key is built from the positional and keyword arguments like
+#              functools.lru_cache builds its own: a single string argument is its own key, hashed with the chosen
+#              hash function, and anything else is a sequence of the arguments whose Python hash is computed once
+#              when the key is built and run through fmix64. Arguments must be hashable, as with lru_cache, so a
+#              mutable argument raises TypeError instead of being stored in a key it could later change. The
+#              decorated function has cache_info and cache_clear like an lru_cache function, and its cache in the
+#              cache attribute for stats() and instrumentation.
+#              Like the HashMaps it isn't locked, so a memoized function shouldn't be called from several threads.
+
+
+import collections
+import functools
+
+from cache import LFUCache, LRUCache
+from hash_functions import fmix64, murmur
+
+
+CacheInfo = collections.namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+POLICIES = {
+    'lru': LRUCache,
+    'lfu': LFUCache,
+}
+
+# Separates the positional from the keyword arguments in a key
+_KEYWORD_MARK = object()
+
+# Returned by the cache for a key it doesn't have, results can be None
+_MISSING = object()
+
+
+class _HashedKey(list):
+    """
+    Arguments of a call as a cache key, with their hash computed once
+    """
+
+    __slots__ = 'hashvalue'
+
+    def __init__(self, items: tuple) -> None:
+        """
+        Takes a tuple of arguments and hashes it, raising TypeError if an
+        argument isn't hashable
+        """
+        super().__init__(items)
+        self.hashvalue = hash(items)
+
+    def __hash__(self) -> int:
+        return self.hashvalue
+
+
+def make_key(args: tuple, kwargs: dict, typed: bool = False) -> object:
+    """
+    Takes a call's positional arguments, its keyword arguments and whether
+    arguments of different types are cached apart and returns the call's
+    cache key: the argument itself for one positional string argument,
+    otherwise a hashed sequence of the arguments. Raises TypeError if an
+    argument isn't hashable.
+    """
+    if not kwargs and len(args) == 1 and type(args[0]) is str:
+        return args[0]
+    key = args
+    if kwargs:
+        key += (_KEYWORD_MARK,)
+        for item in kwargs.items():
+            key += item
+    if typed is True:
+        key += tuple(type(value) for value in args)
+        if kwargs:
+            key += tuple(type(value) for value in kwargs.values())
+    return _HashedKey(key)
+
+
+class KeyHash:
+    """
+    Hash function for cache keys that hashes a string key with the wrapped
+    hash function and any other key from its Python hash through fmix64, so
+    equal arguments like 1 and 1.0 share a key as they do in lru_cache
+    """
+
+    def __init__(self, function) -> None:
+        self.function = function
+
+    def __call__(self, key: object) -> int:
+        if type(key) is str:
+            return self.function(key)
+        return fmix64(hash(key))
+
+
+def memoize(function=None, *, maxsize: int = 128, policy: str = 'lru', typed: bool = False,
+            ttl: float = None, hash_function=murmur, capacity: int = 16):
+    """
+    Takes a function and returns it wrapped to cache its results, or takes
+    only the options and returns a decorator. maxsize is the most results
+    kept (None for no limit, 0 or less for none, so every call runs the
+    function and counts as a miss), policy is 'lru' or 'lfu', typed caches
+    arguments of different types apart, ttl is the time to live of a
+    result in seconds, and hash_function and capacity are the hash function
+    and initial capacity of the cache's HashMap.
+    """
+    if policy not in POLICIES:
+        raise ValueError("policy must be one of " + ', '.join(POLICIES))
+    if maxsize is not None and maxsize < 0:
+        maxsize = 0
+
+    def decorate(user_function):
+        # Keys of mixed types can't be sorted, so chains are never turned into sorted chains
+        cache = POLICIES[policy](capacity, KeyHash(hash_function), max_entries=maxsize or None, ttl=ttl,
+                                 treeify_threshold=None)
+
+        if maxsize == 0:
+            # Nothing is cached, as with lru_cache(maxsize=0), and every call is a miss
+            @functools.wraps(user_function)
+            def wrapper(*args, **kwargs):
+                cache.misses += 1
+                return user_function(*args, **kwargs)
+        else:
+            @functools.wraps(user_function)
+            def wrapper(*args, **kwargs):
+                key = make_key(args, kwargs, typed)
+                result = cache.get(key, _MISSING)
+                if result is _MISSING:
+                    result = user_function(*args, **kwargs)
+                    cache.put(key, result)
+                return result
+
+        def cache_info() -> CacheInfo:
+            """
+            Takes no parameters and returns the hits, misses, maximum size and
+            current size of the cache
+            """
+            return CacheInfo(cache.hits, cache.misses, maxsize, cache.size)
+
+        def cache_clear() -> None:
+            """
+            Takes no parameters and drops every cached result and the hit and
+            miss counts
+            """
+            cache.clear()
+            cache.hits = cache.misses = cache.evictions = cache.expirations = 0
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        wrapper.cache_parameters = lambda: {'maxsize': maxsize, 'policy': policy, 'typed': typed, 'ttl': ttl}
+        return wrapper
+
+    if function is not None:
+        return decorate(function)
+    return decorate
+
+
+if __name__ == "__main__":
+    import instrumentation
+
+    print("\nmemoize example 1")
+    print("-----------------------")
+
+    @memoize(maxsize=None)
+    def fibonacci(n: int) -> int:
+        return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+    print(fibonacci(100), fibonacci.cache_info())
+    fibonacci.cache_clear()
+    print(fibonacci.cache_info())
+
+    print("\nkeys example 1")
+    print("--------------------")
+    calls = []
+
+    @memoize
+    def describe(name, *args, sep=' ', **kwargs):
+        calls.append(name)
+        return sep.join([name, *map(str, args), *map(str, kwargs.values())])
+
+    print(describe('a'), describe('a'), describe('a', 1, 2), describe('a', 1, 2), describe('a', 1, 2, sep='-'))
+    print(describe('a', x=None), describe('a', y=None), describe('a', 1.0, 2), len(calls), describe.cache_info())
+
+    @memoize(typed=True)
+    def identity(value):
+        return value
+
+    print(identity(1), identity(1.0), identity(True), identity.cache_info().misses)
+
+    items = ['Aa']
+    print(describe('b', 1.0, 2) is describe('b', 1, 2), len(calls))
+    try:
+        describe('a', items)
+    except TypeError as error:
+        print(error, len(calls))
+
+    print("\nLRU / LFU example 1")
+    print("-------------------------")
+    for policy in 'lru', 'lfu':
+        @memoize(maxsize=3, policy=policy)
+        def square(n: int) -> int:
+            return n * n
+
+        for n in 1, 1, 1, 2, 3, 4, 1, 5, 1:
+            square(n)
+        print(policy, list(square.cache.keys()), square.cache_info(), square.cache.stats()['evictions'])
+
+    @memoize(maxsize=0)
+    def cube(n: int) -> int:
+        return n ** 3
+
+    print(cube(2), cube(2), cube(3), cube.cache_info(), cube.cache.size)
+
+    print("\ninstrumentation example 1")
+    print("-------------------------------")
+
+    @memoize(maxsize=1000)
+    def upper(text: str) -> str:
+        return text.upper()
+
+    stats = instrumentation.enable(upper.cache.map)
+    for i in range(3000):
+        upper('key' + str(i % 800))
+    print(upper.cache_info(), stats.snapshot()['operations'], stats.snapshot()['lookups']['max'])
@@ -0,0 +1,260 @@
+# Description: Builds a chaining or open addressing HashMap from a large list of key/value pairs with a pool of
+#              worker processes. The bucket array is split into one contiguous range of buckets per worker. In the
+#              first pass each worker hashes a slice of the input and sorts its pairs by the range their bucket
+#              falls in. In the second pass each worker builds the buckets of one range on its own, and the parent
+#              splices the finished ranges together into the HashMap's bucket array without putting any key again.
+#              For open addressing a probe sequence may leave its range, so the few entries whose probe would cross
+#              into another range are sent back and put by the parent once the ranges are spliced. The hash
+#              function must be picklable (a module level function or a SeededHash) and give the same hash in every
+#              process, so builtin_hash only works when the workers are forked. As with put, the last value of a
+#              repeated key wins.
+
+
+import multiprocessing
+import os
+
+from include_file import *
+import hash_map_chaining
+import hash_map_open_addressing
+from probing import QuadraticProbing
+from capacity import DoublingCapacity
+
+
+# Longest LinkedList sent back as is. Pickling follows the next links
+# recursively, so longer chains are sent as a SortedChain and turned back.
+MAX_PICKLED_CHAIN = 256
+
+
+def _range_starts(capacity: int, ranges: int) -> list:
+    """
+    Takes a capacity and a number of ranges and returns the first bucket
+    index of each range and the capacity at the end. Bucket index i is in
+    range i * ranges // capacity.
+    """
+    return [-(-r * capacity // ranges) for r in range(ranges)] + [capacity]
+
+
+def _partition(task: tuple) -> list:
+    """
+    First pass. Takes a tuple (pairs, hash function, capacity, number of
+    ranges), hashes every pair and returns one list per range of the
+    (key, value, hash) triples whose bucket is in that range, in input order
+    """
+    pairs, function, capacity, ranges = task
+    parts = [[] for _ in range(ranges)]
+    for key, value in pairs:
+        hash = function(key)
+        parts[(hash % capacity) * ranges // capacity].append((key, value, hash))
+    return parts
+
+
+def _build_chains(task: tuple) -> tuple:
+    """
+    Second pass for chaining. Takes a tuple (triples, capacity, first
+    bucket, end bucket, treeify threshold) and returns a tuple (chains,
+    count) where chains holds the chain of every bucket in the range (None
+    for empty buckets) and count is the number of distinct keys
+    """
+    triples, capacity, start, stop, treeify_at = task
+    chains = [None] * (stop - start)
+    nodes = {}
+    for key, value, hash in triples:
+        node = nodes.get(key)
+        if node is not None:
+            node.value = value
+            continue
+        node = SLNode(key, value, hash)
+        nodes[key] = node
+        offset = hash % capacity - start
+        chain = chains[offset]
+        if chain is None:
+            chain = chains[offset] = LinkedList()
+        chain.insert_node(node)
+
+    for offset, chain in enumerate(chains):
+        if chain is not None and (chain.size > treeify_at or chain.size > MAX_PICKLED_CHAIN):
+            chains[offset] = SortedChain(chain)
+    return chains, len(nodes)
+
+
+def _build_slots(task: tuple) -> tuple:
+    """
+    Second pass for open addressing with quadratic probing. Takes a tuple
+    (triples, capacity, first bucket, end bucket) and returns a tuple
+    (slots, spilled) where slots holds the hash entry of every bucket in
+    the range (None for empty buckets) and spilled lists the
+    (key, value, hash) triples whose probe sequence left the range before
+    reaching an open bucket
+    """
+    triples, capacity, start, stop = task
+    slots = [None] * (stop - start)
+
+    # Last value of each key wins, in order of first appearance
+    latest = {}
+    for key, value, hash in triples:
+        latest[key] = (value, hash)
+
+    spilled = []
+    for key, (value, hash) in latest.items():
+        index_initial = hash % capacity
+        index = index_initial
+        for j in range(1, capacity + 1):
+            if not start <= index < stop:
+                # Whether that bucket ends up empty depends on another range
+                spilled.append((key, value, hash))
+                break
+            if slots[index - start] is None:
+                slots[index - start] = hash_map_open_addressing.HashEntry(key, value, hash)
+                break
+            index = (index_initial + j * j) % capacity
+        else:
+            spilled.append((key, value, hash))
+    return slots, spilled
+
+
+def _run(tasks: list, function, pool) -> list:
+    """
+    Takes a list of tasks, a task function and a pool (or None) and
+    returns the results, in order
+    """
+    if pool is None:
+        return [function(task) for task in tasks]
+    return pool.map(function, tasks)
+
+
+def _partitioned(pairs: list, function, capacity: int, workers: int, pool) -> list:
+    """
+    Takes the pairs, the hash function, the capacity, the number of workers
+    and the pool and runs the first pass. Returns one list of triples per
+    bucket range, each in input order.
+    """
+    step = -(-len(pairs) // workers) or 1
+    tasks = [(pairs[i:i + step], function, capacity, workers) for i in range(0, len(pairs), step)]
+    parts = [[] for _ in range(workers)]
+    for result in _run(tasks, _partition, pool):
+        for r in range(workers):
+            parts[r].extend(result[r])
+    return parts
+
+
+def _pool(workers: int):
+    """
+    Takes a number of workers and returns a process pool of that size, or
+    None for a single worker, which then runs in this process
+    """
+    if workers <= 1:
+        return None
+    return multiprocessing.get_context().Pool(workers)
+
+
+def build_chaining_map(pairs, capacity: int, function, workers: int = None, **options) -> hash_map_chaining.HashMap:
+    """
+    Takes an iterable of (key, value) pairs, a capacity, a hash function,
+    the number of worker processes (one per CPU by default) and any other
+    chaining HashMap options, and returns a chaining HashMap holding the
+    pairs. With a max_load option the table is sized for the pairs up front,
+    as the load policy would have grown it.
+    """
+    pairs = list(pairs)
+    workers = workers or os.cpu_count() or 1
+    m = hash_map_chaining.HashMap(capacity, function, **options)
+    if m.max_load is not None:
+        capacity = m._policy_capacity(len(pairs))
+    workers = max(1, min(workers, capacity))
+    starts = _range_starts(capacity, workers)
+    treeify_at = m._treeify_at
+
+    pool = _pool(workers)
+    try:
+        parts = _partitioned(pairs, function, capacity, workers, pool)
+        tasks = [(parts[r], capacity, starts[r], starts[r + 1], treeify_at) for r in range(workers)]
+        results = _run(tasks, _build_chains, pool)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    # Splice the ranges into one bucket array
+    buckets = []
+    size = 0
+    for chains, count in results:
+        buckets.extend(chains)
+        size += count
+    for index, chain in enumerate(buckets):
+        if chain is None:
+            buckets[index] = LinkedList()
+        elif chain.size <= treeify_at and chain.__class__ is SortedChain:
+            buckets[index] = chain.to_linked_list()
+    m.buckets = DynamicArray()
+    m.buckets.data = buckets
+    m.capacity = capacity
+    m.size = size
+    m._recount_chain_lengths()
+    return m
+
+
+def build_open_addressing_map(pairs, capacity: int, function, workers: int = None,
+                              **options) -> hash_map_open_addressing.HashMap:
+    """
+    Takes an iterable of (key, value) pairs, a capacity, a hash function,
+    the number of worker processes (one per CPU by default) and any other
+    open addressing HashMap options, and returns an open addressing HashMap
+    holding the pairs. The table is sized for the pairs up front, as put
+    would have grown it. Only the default quadratic probing and capacity
+    policy are supported.
+    """
+    pairs = list(pairs)
+    workers = workers or os.cpu_count() or 1
+    m = hash_map_open_addressing.HashMap(capacity, function, **options)
+    if m.probing.__class__ is not QuadraticProbing or m.capacity_policy.__class__ is not DoublingCapacity:
+        raise ValueError("parallel build only supports quadratic probing with the default capacity policy")
+    if pairs:
+        while (len(pairs) - 1) / capacity >= m.max_load:
+            capacity *= 2
+    workers = max(1, min(workers, capacity))
+    starts = _range_starts(capacity, workers)
+
+    pool = _pool(workers)
+    try:
+        parts = _partitioned(pairs, function, capacity, workers, pool)
+        tasks = [(parts[r], capacity, starts[r], starts[r + 1]) for r in range(workers)]
+        results = _run(tasks, _build_slots, pool)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    # Splice the ranges into one bucket array, then put the spilled entries
+    buckets = []
+    spilled = []
+    for slots, range_spilled in results:
+        buckets.extend(slots)
+        spilled.extend(range_spilled)
+    m.buckets = DynamicArray()
+    m.buckets.data = buckets
+    m.capacity = capacity
+    m.size = len(buckets) - buckets.count(None)
+    for key, value, hash in spilled:
+        if m.probing.place(m.buckets, m.capacity, hash_map_open_addressing.HashEntry(key, value, hash)) is True:
+            m.size += 1
+        else:
+            m.put(key, value)
+    return m
+
+
+if __name__ == "__main__":
+
+    print("\nbuild_chaining_map example 1")
+    print("----------------------------------")
+    pairs = [('key' + str(i), i) for i in range(5000)] + [('key7', 'updated')]
+    for workers in (1, 3):
+        m = build_chaining_map(pairs, 100, hash_map_chaining.hash_function_2, workers=workers, max_load=1.0)
+        result = all(m.get('key' + str(i)) == i for i in range(5000) if i != 7)
+        print(workers, result, m.get('key7'), m.size, m.capacity, m.get_keys().length(), m.table_load() <= 1.0)
+
+    print("\nbuild_open_addressing_map example 1")
+    print("-----------------------------------------")
+    for workers in (1, 3):
+        m = build_open_addressing_map(pairs, 100, hash_map_open_addressing.hash_function_2, workers=workers)
+        result = all(m.get('key' + str(i)) == i for i in range(5000) if i != 7)
+        print(workers, result, m.get('key7'), m.size, m.capacity, m.get_keys().length(), m.table_load() < 0.5)
@@ -0,0 +1,255 @@
+# Description: Probing strategies for the open addressing HashMap. A strategy decides the probe sequence used to
+#              find a key, how a new entry is inserted and how an entry is deleted. QuadraticProbing is the
+#              original scheme (i = i_initial + j^2) and deletes with tombstones. LinearProbing deletes with
+#              backward shifting so it never leaves tombstones. DoubleHashing steps through the table by an amount
+#              taken from the key's cached hash run through fmix64. RobinHood uses linear probing, but an entry that is further from
+#              its initial bucket takes the place of one that is closer, which keeps probe lengths even and lets a
+#              miss stop early. TriangularProbing steps by 1, 2, 3, ... and masks instead of taking a remainder, for
+#              power of two tables. Every strategy works on a bucket DynamicArray whose entries have key, hash and
+#              is_tombstone attributes, and finds a hash's initial bucket with its home method and its step with its step
+#              method. Both read only the hash, so a resize moves entries without hashing a key again.
+
+
+from hash_functions import fmix64
+
+
+class QuadraticProbing:
+    """
+    Quadratic probing, i = i_initial + j^2 (where j = 1, 2, 3, ...)
+    Deleted entries are left as tombstones.
+    """
+
+    uses_tombstones = True
+
+    def home(self, hash: int, capacity: int) -> int:
+        """
+        Takes a hash and the capacity and returns the hash's initial bucket
+        """
+        return hash % capacity
+
+    def step(self, hash: int, capacity: int) -> int:
+        """
+        Takes a key's hash and the capacity and returns the per-key value
+        passed to next_index. Quadratic probing doesn't need one.
+        """
+        return 0
+
+    def next_index(self, index_initial: int, j: int, step: int, capacity: int) -> int:
+        """
+        Takes the initial index, the probe number j, the key's step and the
+        capacity and returns the index of the j-th bucket in the sequence
+        """
+        return (index_initial + j * j) % capacity
+
+    def probe(self, buckets, capacity: int, key: str, hash: int) -> tuple:
+        """
+        Takes a bucket array, its capacity, a key and the key's hash and
+        probes for the key once. Returns a tuple (index, free, probes) where
+        index is the bucket holding the key (-1 if it isn't there), free is
+        the first tombstone or empty bucket passed where the key could be
+        inserted (-1 if the probe never passed one) and probes is the number
+        of buckets looked at. Tombstones never end the probe.
+        """
+        index_initial = self.home(hash, capacity)
+        index = index_initial
+        step = self.step(hash, capacity)
+        free = -1
+
+        # Any probe sequence revisits buckets after capacity steps
+        for j in range(1, capacity + 1):
+            hash_entry = buckets.get_at_index(index)
+            # Empty bucket ends the probe, the key isn't in the table
+            if hash_entry is None:
+                if free == -1:
+                    free = index
+                return -1, free, j
+            # Remember the first tombstone so put can reuse it
+            if hash_entry.is_tombstone is True:
+                if free == -1:
+                    free = index
+            elif hash_entry.hash == hash and hash_entry.key == key:
+                return index, free, j
+            index = self.next_index(index_initial, j, step, capacity)
+
+        return -1, free, capacity
+
+    def insert(self, buckets, capacity: int, hash_entry, free: int) -> None:
+        """
+        Takes a bucket array, its capacity, a new hash entry and the free
+        index returned by probe, and stores the entry there
+        """
+        buckets.set_at_index(free, hash_entry)
+
+    def place(self, buckets, capacity: int, hash_entry) -> bool:
+        """
+        Takes a bucket array, its capacity and a hash entry whose key isn't
+        in the array, and inserts the entry. Returns False if the probe
+        sequence never reached an open bucket.
+        """
+        _, free, _ = self.probe(buckets, capacity, hash_entry.key, hash_entry.hash)
+        if free == -1:
+            return False
+        self.insert(buckets, capacity, hash_entry, free)
+        return True
+
+    def delete(self, buckets, capacity: int, index: int) -> bool:
+        """
+        Takes a bucket array, its capacity and the index of a live entry and
+        deletes the entry. Returns True if a tombstone was left behind.
+        """
+        buckets.get_at_index(index).is_tombstone = True
+        return True
+
+
+class DoubleHashing(QuadraticProbing):
+    """
+    Double hashing, i = i_initial + j * step, where the step comes from the
+    key's hash scrambled by fmix64, so keys sharing an initial bucket
+    usually take different steps. Deleted entries are left as tombstones.
+    """
+
+    def step(self, hash: int, capacity: int) -> int:
+        """
+        Takes a key's hash and the capacity and returns the key's step,
+        between 1 and capacity - 1 so the sequence always moves
+        """
+        if capacity < 2:
+            return 1
+        return 1 + fmix64(hash) % (capacity - 1)
+
+    def next_index(self, index_initial: int, j: int, step: int, capacity: int) -> int:
+        return (index_initial + j * step) % capacity
+
+
+class TriangularProbing(QuadraticProbing):
+    """
+    Triangular probing, i = i_initial + j(j + 1)/2, with every index masked
+    by capacity - 1 instead of taken modulo the capacity. On a power of two
+    capacity the sequence visits every bucket exactly once, so a probe
+    always reaches an open bucket while one exists. Only use it with power
+    of two capacities (see capacity.PowerOfTwoCapacity). Deleted entries
+    are left as tombstones.
+    """
+
+    def home(self, hash: int, capacity: int) -> int:
+        return hash & (capacity - 1)
+
+    def next_index(self, index_initial: int, j: int, step: int, capacity: int) -> int:
+        return (index_initial + (j * (j + 1) >> 1)) & (capacity - 1)
+
+
+class LinearProbing(QuadraticProbing):
+    """
+    Linear probing, i = i_initial + j. Deleting an entry shifts the entries
+    after it back into place, so no tombstones are ever left behind.
+    """
+
+    uses_tombstones = False
+
+    def next_index(self, index_initial: int, j: int, step: int, capacity: int) -> int:
+        return (index_initial + j) % capacity
+
+    def delete(self, buckets, capacity: int, index: int) -> bool:
+        """
+        Takes a bucket array, its capacity and the index of a live entry and
+        deletes the entry with backward shifting: every later entry of the
+        run that may move closer to its initial bucket is moved into the
+        hole. Returns False since no tombstone is left.
+        """
+        buckets.set_at_index(index, None)
+        hole = index
+        j = index
+        while True:
+            j = (j + 1) % capacity
+            hash_entry = buckets.get_at_index(j)
+            if hash_entry is None:
+                return False
+            home = self.home(hash_entry.hash, capacity)
+            # Entry stays if its initial bucket lies cyclically in (hole, j]
+            if hole <= j:
+                stays = hole < home <= j
+            else:
+                stays = home > hole or home <= j
+            if stays:
+                continue
+            buckets.set_at_index(hole, hash_entry)
+            buckets.set_at_index(j, None)
+            hole = j
+
+
+class RobinHood(LinearProbing):
+    """
+    Robin Hood hashing on top of linear probing. An entry being inserted
+    takes the bucket of any entry that is closer to its initial bucket than
+    the new entry is, and that entry moves on instead. A lookup can stop as
+    soon as it reaches an entry closer to home than the key would be.
+    Deletion uses backward shifting, so there are no tombstones.
+    """
+
+    def probe(self, buckets, capacity: int, key: str, hash: int) -> tuple:
+        """
+        Same as QuadraticProbing.probe, but the probe also ends at the first
+        entry whose distance from its initial bucket is shorter than the
+        distance probed so far. That bucket is returned as free, since the
+        key would take it on insert.
+        """
+        home = self.home
+        index = home(hash, capacity)
+        free = -1
+
+        for distance in range(capacity):
+            hash_entry = buckets.get_at_index(index)
+            if hash_entry is None:
+                if free == -1:
+                    free = index
+                return -1, free, distance + 1
+            if hash_entry.is_tombstone is True:
+                # Only an old array of an incremental resize has tombstones
+                # and they can't be reused, so just probe past them
+                pass
+            elif hash_entry.hash == hash and hash_entry.key == key:
+                return index, free, distance + 1
+            elif (index - home(hash_entry.hash, capacity)) % capacity < distance:
+                if free == -1:
+                    free = index
+                return -1, free, distance + 1
+            index = (index + 1) % capacity
+
+        return -1, free, capacity
+
+    def insert(self, buckets, capacity: int, hash_entry, free: int) -> None:
+        """
+        Takes a bucket array, its capacity, a new hash entry and the free
+        index returned by probe. The entry goes into that bucket and any
+        entry it displaces moves further along, displacing entries closer
+        to home, until an empty bucket is reached.
+        """
+        index = free
+        while True:
+            displaced = buckets.get_at_index(index)
+            if displaced is None or displaced.is_tombstone is True:
+                buckets.set_at_index(index, hash_entry)
+                return
+            # Only displace entries that are closer to home than this one
+            entry_distance = (index - self.home(hash_entry.hash, capacity)) % capacity
+            displaced_distance = (index - self.home(displaced.hash, capacity)) % capacity
+            if displaced_distance < entry_distance:
+                buckets.set_at_index(index, hash_entry)
+                hash_entry = displaced
+            index = (index + 1) % capacity
+
+    def delete(self, buckets, capacity: int, index: int) -> bool:
+        """
+        Takes a bucket array, its capacity and the index of a live entry and
+        deletes it by shifting the following entries back one bucket until
+        an empty bucket or an entry already in its initial bucket is found.
+        Returns False since no tombstone is left.
+        """
+        while True:
+            next_index = (index + 1) % capacity
+            hash_entry = buckets.get_at_index(next_index)
+            if hash_entry is None or self.home(hash_entry.hash, capacity) == next_index:
+                buckets.set_at_index(index, None)
+                return False
+            buckets.set_at_index(index, hash_entry)
+            index = next_index
@@ -0,0 +1,257 @@
+# Description: A binary snapshot format for the HashMaps and a read-only map that serves lookups straight from a
+#              memory-mapped snapshot file. save writes a header, an index and a blob. The index is a power of two
+#              linear probing table of 24 byte slots holding each entry's cached hash, the file offset of its key
+#              and the lengths of its key and value. The blob holds every key as UTF-8 followed by its pickled value.
+#              SnapshotMap maps the file and answers get and contains_key by probing the index in place, so opening
+#              a snapshot costs the same however many entries it holds and a value is only unpickled when it is
+#              read. The hash function used to open a snapshot must give the same hashes as the one it was saved
+#              with, which SnapshotMap checks against one stored entry.
+
+
+import mmap
+import pickle
+import struct
+
+from include_file import DynamicArray
+
+
+MAGIC = b'HMSNAP01'
+VERSION = 1
+
+# magic, version, flags, entry count, index capacity, index offset, blob offset
+HEADER = struct.Struct('<8sIIQQQQ')
+# hash, key offset (0 for an empty slot), key length, value length
+SLOT = struct.Struct('<QQII')
+
+HASH_MASK = (1 << 64) - 1
+
+# 2^64 divided by the golden ratio, for Fibonacci hashing
+FIBONACCI = 0x9E3779B97F4A7C15
+
+
+def _home(hash: int, shift: int) -> int:
+    """
+    Takes a hash and 64 minus the number of index bits and returns the
+    hash's initial slot: the top bits of the hash times 2^64 / golden ratio,
+    which spreads even badly clustered hashes over the index
+    """
+    return ((hash * FIBONACCI) & HASH_MASK) >> shift
+
+
+def _index_bits(count: int) -> int:
+    """
+    Takes an entry count and returns the number of index bits that keeps
+    the index at most half full
+    """
+    return max(1, (2 * count - 1).bit_length())
+
+
+def save(entries, path: str) -> int:
+    """
+    Takes an iterable of (key, value, hash) triples with distinct str keys
+    and a file path and writes a snapshot of the entries there. Returns the
+    number of entries written. Raises TypeError, before the file is
+    opened, if a key isn't a str.
+    """
+    entries = list(entries)
+    bits = _index_bits(len(entries))
+    capacity = 1 << bits
+    shift = 64 - bits
+    index_offset = HEADER.size
+    blob_offset = index_offset + capacity * SLOT.size
+
+    index = bytearray(capacity * SLOT.size)
+    blob = []
+    offset = blob_offset
+    for key, value, hash in entries:
+        if type(key) is not str:
+            raise TypeError("save needs str keys")
+        key_bytes = key.encode('utf-8', 'surrogatepass')
+        value_bytes = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        hash &= HASH_MASK
+        slot = _home(hash, shift)
+        while SLOT.unpack_from(index, slot * SLOT.size)[1] != 0:
+            slot = (slot + 1) & (capacity - 1)
+        SLOT.pack_into(index, slot * SLOT.size, hash, offset, len(key_bytes), len(value_bytes))
+        blob.append(key_bytes)
+        blob.append(value_bytes)
+        offset += len(key_bytes) + len(value_bytes)
+
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, len(entries), capacity, index_offset, blob_offset))
+        file.write(index)
+        file.writelines(blob)
+    return len(entries)
+
+
+class SnapshotMap:
+    """
+    Read-only map over a memory-mapped snapshot file
+    Supports get, contains_key, get_keys, table_load and close, and can be
+    used in a with statement to close it
+    """
+
+    def __init__(self, path: str, function) -> None:
+        """
+        Takes a snapshot file path and the hash function the snapshot was
+        saved with and maps the file. Raises ValueError if the file isn't a
+        snapshot or the hash function doesn't match.
+        """
+        self.hash_function = function
+        with open(path, 'rb') as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+        try:
+            if len(self._mm) < HEADER.size:
+                raise ValueError(path + " is not a HashMap snapshot")
+            magic, version, _, size, capacity, index_offset, _ = HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(path + " is not a HashMap snapshot")
+            self.size = size
+            self.capacity = capacity
+            self._index_offset = index_offset
+            self._shift = 64 - (capacity.bit_length() - 1)
+            self._check_function()
+        except BaseException:
+            self.close()
+            raise
+
+    def _check_function(self) -> None:
+        """
+        Takes no parameters and hashes the key of the first stored entry
+        with the hash function, raising ValueError if the hash differs from
+        the one saved with it
+        """
+        for slot in range(self.capacity):
+            hash, offset, key_length, _ = SLOT.unpack_from(self._mm, self._index_offset + slot * SLOT.size)
+            if offset != 0:
+                key = str(self._mm[offset:offset + key_length], 'utf-8', 'surrogatepass')
+                if self.hash_function(key) & HASH_MASK != hash:
+                    raise ValueError("the hash function doesn't match the one the snapshot was saved with")
+                return
+
+    def _lookup(self, key: str) -> tuple:
+        """
+        Takes a key string and returns the tuple (offset, key length, value
+        length) of its entry, or None if the key isn't in the snapshot
+        """
+        if type(key) is not str:
+            raise TypeError("a snapshot only holds str keys")
+        hash = self.hash_function(key) & HASH_MASK
+        key_bytes = key.encode('utf-8', 'surrogatepass')
+        mm, unpack_from, index_offset = self._mm, SLOT.unpack_from, self._index_offset
+        mask = self.capacity - 1
+        slot = _home(hash, self._shift)
+        while True:
+            slot_hash, offset, key_length, value_length = unpack_from(mm, index_offset + slot * SLOT.size)
+            if offset == 0:
+                return None
+            if slot_hash == hash and key_length == len(key_bytes) and mm[offset:offset + key_length] == key_bytes:
+                return offset, key_length, value_length
+            slot = (slot + 1) & mask
+
+    def get(self, key: str) -> object:
+        """
+        Takes a key string as a parameter and returns the value paired
+        with that key, unpickled from the file. If the key doesn't exist,
+        None is returned.
+        """
+        if self.size == 0:
+            return None
+        found = self._lookup(key)
+        if found is None:
+            return None
+        offset, key_length, value_length = found
+        start = offset + key_length
+        return pickle.loads(self._view[start:start + value_length])
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Takes a key string as a parameter and returns True if the key is in
+        the snapshot, False otherwise. The value isn't unpickled.
+        """
+        if self.size == 0:
+            return False
+        return self._lookup(key) is not None
+
+    def put(self, key: str, value: object) -> None:
+        raise TypeError("SnapshotMap is read-only")
+
+    def remove(self, key: str) -> None:
+        raise TypeError("SnapshotMap is read-only")
+
+    def table_load(self) -> float:
+        """
+        Takes no parameters and returns the load factor of the index
+        """
+        return self.size / self.capacity
+
+    def get_keys(self) -> DynamicArray:
+        """
+        Takes no parameters and returns a DynamicArray with every key in the
+        snapshot, in index order
+        """
+        keys_da = DynamicArray()
+        for slot in range(self.capacity):
+            _, offset, key_length, _ = SLOT.unpack_from(self._mm, self._index_offset + slot * SLOT.size)
+            if offset != 0:
+                keys_da.append(str(self._mm[offset:offset + key_length], 'utf-8', 'surrogatepass'))
+        return keys_da
+
+    def close(self) -> None:
+        """
+        Takes no parameters and unmaps the file
+        """
+        self._view.release()
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load(path: str, function) -> SnapshotMap:
+    """
+    Takes a snapshot file path and the hash function the snapshot was saved
+    with and returns a read-only SnapshotMap over the file
+    """
+    return SnapshotMap(path, function)
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    import hash_map_chaining
+    import hash_map_compact
+    import hash_map_open_addressing
+
+    print("\nsave / load example 1")
+    print("---------------------------")
+    path = os.path.join(tempfile.mkdtemp(), 'map.snapshot')
+    for module in hash_map_chaining, hash_map_open_addressing, hash_map_compact:
+        m = module.HashMap(10, module.hash_function_2)
+        for i in range(500):
+            m.put('key' + str(i), [i, 'value' + str(i)])
+        m.remove('key3')
+        m.save(path)
+        with load(path, module.hash_function_2) as loaded:
+            result = all(loaded.get('key' + str(i)) == m.get('key' + str(i)) for i in range(600))
+            print(module.__name__, result, loaded.size, loaded.capacity, loaded.contains_key('key3'),
+                  loaded.get('key42'), loaded.get_keys().length())
+
+    try:
+        load(path, module.hash_function_1)
+    except ValueError as error:
+        print(error)
+
+    from typed_maps import BytesHashMap, IntHashMap
+    for m, key in (IntHashMap(10), 7), (BytesHashMap(10), b'key7'):
+        m.put(key, 7)
+        try:
+            m.save(path)
+        except TypeError as error:
+            print(type(m).__name__, error, os.path.getsize(path) > 0)
+    os.remove(path)
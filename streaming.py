@@ -0,0 +1,312 @@
+# Description: Builds a HashMap from a stream of key/value pairs without holding the stream in memory. Pairs are read
+#              in chunks, so only one chunk is alive at a time on top of the map itself. A HyperLogLog sketch
+#              estimates the number of distinct keys as they go by in a fixed amount of memory, and the table is
+#              sized from the estimate with HashMap.reserve instead of doubling its way up. When the source can be
+#              read twice, like a list or a DelimitedFile, a first pass only feeds the sketch and the table is
+#              sized once before the second pass puts the pairs. A one-shot iterator is read once, and before each
+#              chunk is put the table is grown to fit the estimated distinct keys seen so far, this chunk's
+#              included. The estimate can come in low, and then a put in the chunk still triggers the map's normal
+#              resize. from_iterable and from_file are the HashMap classmethods built on load. Every load records a
+#              report in the map's load_report: records read, estimated distinct keys, resizes and the peak memory
+#              traced while loading. Tracing memory with tracemalloc slows the load down several times,
+#              trace_memory=False skips it.
+
+
+import itertools
+import math
+import time
+import tracemalloc
+
+from hash_batch import fmix64
+
+
+DEFAULT_CHUNK_SIZE = 10_000
+DEFAULT_PRECISION = 14
+
+HASH_MASK = (1 << 64) - 1
+
+
+class HyperLogLog:
+    """
+    HyperLogLog sketch of the number of distinct 64-bit hashes added to it.
+    It keeps 2^precision one byte registers and its estimates have a
+    relative standard error of about 1.04 / sqrt(2^precision), 0.8% for the
+    default precision of 14.
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION) -> None:
+        """
+        Takes the number of index bits, between 4 and 18
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    @property
+    def error(self) -> float:
+        """ Relative standard error of the estimate """
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, hash: int) -> None:
+        """
+        Takes a 64-bit hash and records it
+        """
+        self.add_many((hash,))
+
+    def add_many(self, hashes) -> None:
+        """
+        Takes an iterable of 64-bit hashes and records them. The top
+        precision bits pick a register, which keeps the longest run of
+        leading zeros seen in the remaining bits, plus one.
+        """
+        registers = self.registers
+        rest = 64 - self.precision
+        rest_mask = (1 << rest) - 1
+        for hash in hashes:
+            hash &= HASH_MASK
+            index = hash >> rest
+            rank = rest - (hash & rest_mask).bit_length() + 1
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def estimate(self) -> int:
+        """
+        Takes no parameters and returns the estimated number of distinct
+        hashes added. Small counts use linear counting over the empty
+        registers, which is more accurate there.
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -rank for rank in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros != 0:
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+
+def key_hash(key: str) -> int:
+    """
+    Hash of a key for the sketch. It is independent of the map's hash
+    function, which may spread keys badly: Python's own hash of the key run
+    through fmix64, since hash is the identity for small integers and the
+    sketch reads the top bits.
+    """
+    return fmix64(hash(key) & HASH_MASK)
+
+
+def chunked(iterable, size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Takes an iterable and a chunk size and yields lists of up to that many
+    items, in order
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class DelimitedFile:
+    """
+    A text file of one key/value pair per line, the key and the value split
+    at the first delimiter. Iterating over it opens the file and yields
+    (key, value) pairs, so it can be read any number of times. Blank lines
+    are skipped, and a line without the delimiter raises ValueError.
+    """
+
+    def __init__(self, path: str, delimiter: str = '\t', convert=None, encoding: str = 'utf-8') -> None:
+        """
+        Takes the file path, the delimiter, an optional function applied to
+        every value string (int, for example) and the file encoding
+        """
+        self.path = path
+        self.delimiter = delimiter
+        self.convert = convert
+        self.encoding = encoding
+
+    def __iter__(self):
+        delimiter, convert = self.delimiter, self.convert
+        with open(self.path, encoding=self.encoding, newline='') as file:
+            for number, line in enumerate(file, 1):
+                line = line.rstrip('\r\n')
+                if not line:
+                    continue
+                key, found, value = line.partition(delimiter)
+                if not found:
+                    raise ValueError(f"{self.path}:{number}: no {delimiter!r} delimiter")
+                yield key, value if convert is None else convert(value)
+
+
+def read_delimited(path: str, delimiter: str = '\t', convert=None, encoding: str = 'utf-8') -> DelimitedFile:
+    """
+    Takes a file path, a delimiter, an optional value conversion function
+    and an encoding and returns a DelimitedFile that yields the file's
+    (key, value) pairs
+    """
+    return DelimitedFile(path, delimiter, convert, encoding)
+
+
+def _put_chunk(m, chunk: list) -> None:
+    """
+    Takes a map and a list of pairs and puts the pairs in the map, in one
+    batch if the map has put_many
+    """
+    put_many = getattr(m, 'put_many', None)
+    if put_many is not None:
+        put_many(chunk)
+    else:
+        for key, value in chunk:
+            m.put(key, value)
+
+
+def load(m, pairs, chunk_size: int = DEFAULT_CHUNK_SIZE, precision: int = DEFAULT_PRECISION,
+         expected: int = None, trace_memory: bool = True) -> dict:
+    """
+    Takes a map, an iterable of (key, value) pairs, a chunk size, the
+    sketch precision, an optional expected number of distinct keys and
+    whether to trace memory, puts every pair in the map and returns the
+    load report, which is also stored in m.load_report. With expected the
+    table is sized for that many keys up front and the pairs are read once.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    started_tracing = False
+    if trace_memory is True:
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+            started_tracing = True
+        traced_before = tracemalloc.get_traced_memory()[0]
+    resizes_before = m.resizes
+    start = time.perf_counter()
+
+    sketch = HyperLogLog(precision)
+    records = 0
+    # A list or a DelimitedFile can be read again, an iterator can't
+    two_pass = expected is None and iter(pairs) is not pairs
+    try:
+        if expected is not None:
+            m.reserve(expected)
+        elif two_pass is True:
+            for chunk in chunked(pairs, chunk_size):
+                sketch.add_many(key_hash(key) for key, _ in chunk)
+            # Leave room for an estimate three standard errors too low
+            m.reserve(math.ceil(sketch.estimate() * (1 + 3 * sketch.error)))
+
+        for chunk in chunked(pairs, chunk_size):
+            records += len(chunk)
+            if two_pass is False:
+                sketch.add_many(key_hash(key) for key, _ in chunk)
+                if expected is None:
+                    # Room for the estimated distinct keys so far, so the chunk's puts rarely resize
+                    m.reserve(sketch.estimate())
+            _put_chunk(m, chunk)
+    finally:
+        if started_tracing is True:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        elif trace_memory is True:
+            current, peak = tracemalloc.get_traced_memory()
+
+    m.load_report = {
+        'records': records,
+        'distinct_estimate': sketch.estimate(),
+        'size': m.size,
+        'capacity': m.capacity,
+        'resizes': m.resizes - resizes_before,
+        'passes': 2 if two_pass is True else 1,
+        'seconds': time.perf_counter() - start,
+        # Bytes allocated while loading at the highest point, and still held at the end
+        'peak_memory': peak - traced_before if trace_memory is True else None,
+        'retained_memory': current - traced_before if trace_memory is True else None,
+    }
+    return m.load_report
+
+
+def build(cls, pairs, function, capacity: int = 16, chunk_size: int = DEFAULT_CHUNK_SIZE,
+          precision: int = DEFAULT_PRECISION, expected: int = None, trace_memory: bool = True, **options):
+    """
+    Takes a HashMap class, an iterable of (key, value) pairs, a hash
+    function, an initial capacity, the load options described in load and
+    any options of the class, and returns a map of that class holding the
+    pairs, with its load report in load_report
+    """
+    m = cls(capacity, function, **options)
+    load(m, pairs, chunk_size, precision, expected, trace_memory)
+    return m
+
+
+def from_iterable(cls, pairs, function, capacity: int = 16, **options):
+    """
+    Takes a HashMap class, an iterable of (key, value) pairs, a hash
+    function, an initial capacity and any load or HashMap options, and
+    returns a map of that class holding the pairs. The pairs are read in
+    chunks and the table is sized from an estimate of the number of
+    distinct keys. The load report is kept in load_report. The HashMap
+    classes have it as the classmethod from_iterable.
+    """
+    return build(cls, pairs, function, capacity, **options)
+
+
+def from_file(cls, path: str, function, delimiter: str = '\t', convert=None, capacity: int = 16, **options):
+    """
+    Takes a HashMap class, the path of a text file with one key/value pair
+    per line, a hash function, the delimiter between key and value, an
+    optional function applied to every value, an initial capacity and any
+    load or HashMap options, and returns a map of that class holding the
+    file's pairs. The file is read twice, once to size the table and once
+    to fill it. The HashMap classes have it as the classmethod from_file.
+    """
+    return build(cls, read_delimited(path, delimiter, convert), function, capacity, **options)
+
+
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+
+    import hash_map_chaining
+    import hash_map_compact
+    import hash_map_open_addressing
+    from hash_functions import int_hash
+    from typed_maps import IntHashMap
+
+    print("\nHyperLogLog example 1")
+    print("---------------------------")
+    for count in 10, 1000, 100_000:
+        sketch = HyperLogLog()
+        sketch.add_many(key_hash('key' + str(i % count)) for i in range(2 * count))
+        print(count, abs(sketch.estimate() - count) / count < 0.03)
+
+    print("\nfrom_iterable / from_file example 1")
+    print("-----------------------------------------")
+    rng = random.Random(7)
+    path = os.path.join(tempfile.mkdtemp(), 'pairs.tsv')
+    with open(path, 'w', encoding='utf-8') as file:
+        for _ in range(30_000):
+            i = rng.randrange(20_000)
+            file.write('key' + str(i) + '\t' + str(i) + '\n')
+    expected = {key: value for key, value in read_delimited(path, convert=int)}
+
+    for module, options in ((hash_map_chaining, {'max_load': 1.0}), (hash_map_open_addressing, {}),
+                            (hash_map_compact, {})):
+        loaded = [
+            module.HashMap.from_file(path, module.hash_function_2, convert=int, **options),
+            module.HashMap.from_iterable(iter(read_delimited(path, convert=int)), module.hash_function_2,
+                                         **options),
+        ]
+        for m in loaded:
+            report = m.load_report
+            result = m.size == len(expected) and all(m.get(key) == value for key, value in expected.items())
+            print(module.__name__, report['passes'], result, report['records'], report['resizes'],
+                  abs(report['distinct_estimate'] - len(expected)) / len(expected) < 0.03,
+                  report['peak_memory'] > 0)
+    os.remove(path)
+
+    # Small integers are their own Python hash, which fmix64 spreads over the sketch's registers
+    m = IntHashMap.from_iterable([(i, i) for i in range(100_000)], int_hash, trace_memory=False, max_load=1.0)
+    report = m.load_report
+    print('int keys', m.size, abs(report['distinct_estimate'] - m.size) / m.size < 0.03, report['resizes'])
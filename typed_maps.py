@@ -0,0 +1,181 @@
+# Description: HashMaps specialized for integer and bytes keys. The sample hash functions read a key's characters, so
+#              integer IDs and bytes would otherwise be turned into strings before every put and get. The maps here
+#              are the chaining and open addressing HashMaps with a hash function for their key type as the default:
+#              int_hash runs an integer through the MurmurHash3 fmix64 finalizer and bytes_hash is 64-bit BLAKE2b of
+#              the bytes, so neither allocates a string. The bytes maps also take memoryview and bytearray keys and
+#              store them as bytes, because a view can change after it is stored and can't be compared with <.
+#              The engines are unchanged, so resizing, incremental migration, probing strategies, iteration and
+#              instrumentation all work as they do with string keys. save needs string keys and so doesn't work on
+#              these maps.
+
+
+import hash_map_chaining
+import hash_map_open_addressing
+from hash_functions import bytes_hash, int_hash
+
+
+class IntHashMap(hash_map_chaining.HashMap):
+    """
+    Chaining HashMap for integer keys, hashed with int_hash by default
+    """
+
+    def __init__(self, capacity: int, function=int_hash, **options) -> None:
+        """
+        Takes the initial capacity, an optional hash function of integer
+        keys and any option of the chaining HashMap
+        """
+        super().__init__(capacity, function, **options)
+
+
+class IntOpenAddressingHashMap(hash_map_open_addressing.HashMap):
+    """
+    Open addressing HashMap for integer keys, hashed with int_hash by
+    default
+    """
+
+    def __init__(self, capacity: int, function=int_hash, **options) -> None:
+        """
+        Takes the initial capacity, an optional hash function of integer
+        keys and any option of the open addressing HashMap
+        """
+        super().__init__(capacity, function, **options)
+
+
+class _BytesKeys:
+    """
+    Placed in front of a HashMap class to turn memoryview and bytearray
+    keys into bytes before they are hashed or stored
+    """
+
+    def __init__(self, capacity: int, function=bytes_hash, **options) -> None:
+        """
+        Takes the initial capacity, an optional hash function of bytes keys
+        and any option of the HashMap
+        """
+        super().__init__(capacity, function, **options)
+
+    def get(self, key: bytes) -> object:
+        if type(key) is not bytes:
+            key = bytes(key)
+        return super().get(key)
+
+    def put(self, key: bytes, value: object) -> None:
+        if type(key) is not bytes:
+            key = bytes(key)
+        return super().put(key, value)
+
+    def remove(self, key: bytes) -> None:
+        if type(key) is not bytes:
+            key = bytes(key)
+        return super().remove(key)
+
+    def contains_key(self, key: bytes) -> bool:
+        if type(key) is not bytes:
+            key = bytes(key)
+        return super().contains_key(key)
+
+
+class BytesHashMap(_BytesKeys, hash_map_chaining.HashMap):
+    """
+    Chaining HashMap for bytes keys, hashed with bytes_hash by default.
+    memoryview and bytearray keys are stored as bytes.
+    """
+
+    def get_node(self, key: bytes):
+        if type(key) is not bytes:
+            key = bytes(key)
+        return super().get_node(key)
+
+    def put_node(self, node):
+        if type(node.key) is not bytes:
+            node.key = bytes(node.key)
+        return super().put_node(node)
+
+    def put_many(self, pairs) -> None:
+        return super().put_many((key if type(key) is bytes else bytes(key), value) for key, value in pairs)
+
+    def get_many(self, keys) -> list:
+        return super().get_many(key if type(key) is bytes else bytes(key) for key in keys)
+
+    def remove_many(self, keys) -> list:
+        return super().remove_many(key if type(key) is bytes else bytes(key) for key in keys)
+
+
+class BytesOpenAddressingHashMap(_BytesKeys, hash_map_open_addressing.HashMap):
+    """
+    Open addressing HashMap for bytes keys, hashed with bytes_hash by
+    default. memoryview and bytearray keys are stored as bytes.
+    """
+
+    def probe_length(self, key: bytes) -> int:
+        if type(key) is not bytes:
+            key = bytes(key)
+        return super().probe_length(key)
+
+    def put_many(self, pairs) -> None:
+        return super().put_many((key if type(key) is bytes else bytes(key), value) for key, value in pairs)
+
+
+if __name__ == "__main__":
+    import random
+
+    import instrumentation
+    from capacity import PowerOfTwoCapacity
+    from include_file import SLNode
+    from probing import LinearProbing, RobinHood
+
+    print("\nint keys example 1")
+    print("------------------------")
+    rng = random.Random(4)
+    ids = rng.sample(range(-10**6, 10**12), 5000)
+    for m in (IntHashMap(16, max_load=1.0), IntHashMap(16, incremental_step=4, max_load=1.0),
+              IntOpenAddressingHashMap(16), IntOpenAddressingHashMap(16, probing=RobinHood()),
+              IntOpenAddressingHashMap(16, capacity_policy=PowerOfTwoCapacity())):
+        for i in ids:
+            m.put(i, i * 2)
+        for i in ids[::2]:
+            m.remove(i)
+        result = all(m.get(i) == (None if n % 2 == 0 else i * 2) for n, i in enumerate(ids))
+        print(type(m).__name__, result, m.size, m.contains_key(ids[1]), m.contains_key(ids[0]),
+              sorted(m.keys()) == sorted(ids[1::2]))
+
+    m = IntHashMap(16, max_load=1.0)
+    m.put_many((i, str(i)) for i in range(1000))
+    print(m.get_many([0, 999, 1000]), m.stats()['max_chain_length'] <= 8)
+
+    print("\nbytes keys example 1")
+    print("--------------------------")
+    keys = [b'key' + str(i).encode() for i in range(2000)]
+    buffer = bytearray(b''.join(keys))
+    for m in BytesHashMap(16, max_load=1.0), BytesOpenAddressingHashMap(16, probing=LinearProbing()):
+        offset = 0
+        view = memoryview(buffer)
+        for key in keys:
+            # Keys put as views of one shared buffer
+            m.put(view[offset:offset + len(key)], len(key))
+            offset += len(key)
+        buffer_copy = bytes(buffer)
+        buffer[:3] = b'xxx'
+        result = all(m.get(key) == len(key) for key in keys)
+        print(type(m).__name__, result, m.size, type(next(iter(m))).__name__,
+              m.contains_key(memoryview(b'key7')), m.contains_key(bytearray(b'key7')), m.get(b'nope'))
+        buffer[:] = buffer_copy
+        m.remove(memoryview(b'key7'))
+        print(m.contains_key(b'key7'), m.size)
+
+    m = BytesHashMap(16)
+    m.put_many((bytearray(key), 1) for key in keys[:100])
+    print(m.get_many([memoryview(keys[0]), keys[99]]), m.remove_many([bytearray(keys[0])]), m.size)
+    node = SLNode(bytearray(b'node'), 1, bytes_hash(b'node'))
+    print(m.put_node(node) is node, type(node.key).__name__, m.get_node(memoryview(b'node')) is node)
+    m = BytesOpenAddressingHashMap(16)
+    m.put_many((bytearray(key), 1) for key in keys[:100])
+    print(m.get(memoryview(keys[0])), type(next(iter(m))).__name__, m.size)
+
+    print("\ninstrumentation example 1")
+    print("-------------------------------")
+    m = IntOpenAddressingHashMap(16)
+    stats = instrumentation.enable(m)
+    for i in range(1000):
+        m.put(i, i)
+    print(type(m).__name__, stats.snapshot()['operations'], stats.snapshot()['lookups']['p99'])